@@ -28,15 +28,21 @@ from fastapi.responses import FileResponse, JSONResponse, Response, RedirectResp
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
-from datetime import datetime, timedelta, timezone
+from starlette.convertors import Convertor, register_url_convertor
+from datetime import date, datetime, timedelta, timezone
 import os
 import json
 import re
 import uuid
+import functools
+import itertools
+from collections import Counter
+from operator import itemgetter
 import hashlib
+import hmac
 import jwt
 import base64
-from typing import Optional, Any, Dict, List, Tuple
+from typing import Optional, Any, Callable, Dict, Iterator, List, Tuple
 import logging
 import pathlib
 import queue
@@ -46,7 +52,9 @@ import threading
 import time
 import socket
 import ssl
+import stat
 import asyncio
+import anyio.to_thread
 import sys
 import xml.sax.saxutils as _sax_utils
 import requests
@@ -58,6 +66,15 @@ import warnings
 # on shutdown. Use SelectorEventLoop on Windows instead.
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+elif sys.version_info < (3, 14):
+    # Elsewhere use uvloop (libuv) for every loop created through the default
+    # policy, not only the one uvicorn builds from __main__ (loop="uvloop").
+    # Event loop policies are deprecated from Python 3.14 on.
+    try:
+        import uvloop  # type: ignore
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
 
 # -------------------------
 # Logging setup - MUST come first before any code that uses logger
@@ -71,7 +88,7 @@ _MAIN_EVENT_LOOP = None
 _SHUTDOWN_IN_PROGRESS = threading.Event()
 
 # Database imports
-from database import Base, SessionLocal, engine, get_db
+from database import Base, SessionLocal, engine, get_db, DB_POOL_SIZE, DB_MAX_OVERFLOW
 from models import User, Unit, MapMarker, Mission, MeshtasticNode, AutonomousRule, Geofence, ChatMessage, ChatChannel, AuditLog, Drawing, Overlay, APISession, UserGroup, QRCode, PendingRegistration, DeletedMarker, FederatedServer, FederationChallenge
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
@@ -81,7 +98,8 @@ from fastapi import Depends
 Base.metadata.create_all(bind=engine)
 
 # Migrate existing tables: add missing columns that create_all() won't add to existing tables
-from sqlalchemy import text as sa_text, inspect as sa_inspect
+from sqlalchemy import text as sa_text, inspect as sa_inspect, func as sa_func, event as sa_event, literal_column, select, bindparam, update as sa_update, case as sa_case
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 _inspector = sa_inspect(engine)
 if "chat_messages" in _inspector.get_table_names():
     _existing_cols = {c["name"] for c in _inspector.get_columns("chat_messages")}
@@ -107,6 +125,56 @@ if "units" in _inspector.get_table_names() and "users" in _inspector.get_table_n
         if "tak_display_type" not in _user_cols:
             _conn.execute(sa_text("ALTER TABLE users ADD COLUMN tak_display_type VARCHAR DEFAULT 'General Ground Unit'"))
 
+# Migrate map_markers table: add the indexed external_id column and backfill it
+# from data.unit_id for markers created by the Meshtastic import/sync paths
+if "map_markers" in _inspector.get_table_names():
+    _marker_cols = {c["name"] for c in _inspector.get_columns("map_markers")}
+    if "external_id" not in _marker_cols:
+        with engine.begin() as _conn:
+            _conn.execute(sa_text("ALTER TABLE map_markers ADD COLUMN external_id VARCHAR"))
+            _conn.execute(sa_text("CREATE INDEX IF NOT EXISTS ix_map_markers_external_id ON map_markers (external_id)"))
+            _conn.execute(sa_text(
+                "UPDATE map_markers SET external_id = json_extract(data, '$.unit_id') "
+                "WHERE created_by IN ('import_meshtastic', 'meshtastic_sync', 'ingest_node') "
+                "AND json_valid(data) AND json_type(data, '$.unit_id') IS NOT NULL"
+            ))
+
+# Migrate api_sessions: save_session upserts on username, which needs a unique
+# index; drop all but the newest session per user before creating it
+if "api_sessions" in _inspector.get_table_names():
+    _session_indexes = {ix["name"] for ix in _inspector.get_indexes("api_sessions")}
+    if "ix_api_sessions_username" not in _session_indexes:
+        with engine.begin() as _conn:
+            _conn.execute(sa_text(
+                "DELETE FROM api_sessions WHERE username IS NOT NULL AND rowid NOT IN "
+                "(SELECT MAX(rowid) FROM api_sessions WHERE username IS NOT NULL GROUP BY username)"
+            ))
+            _conn.execute(sa_text("CREATE UNIQUE INDEX IF NOT EXISTS ix_api_sessions_username ON api_sessions (username)"))
+
+# Indexes for hot lookups that create_all() will not add to existing tables.
+# ix_map_markers_created_by_unit_id is an SQLite expression index; queries must
+# use the literal json_extract(data, '$.unit_id') expression to hit it.
+_HOT_INDEXES = {
+    "users": (("ix_users_device", "CREATE INDEX IF NOT EXISTS ix_users_device ON users (device)"),),
+    "map_markers": (
+        ("ix_map_markers_created_by", "CREATE INDEX IF NOT EXISTS ix_map_markers_created_by ON map_markers (created_by)"),
+        ("ix_map_markers_created_by_unit_id",
+         "CREATE INDEX IF NOT EXISTS ix_map_markers_created_by_unit_id "
+         "ON map_markers (created_by, json_extract(data, '$.unit_id'))"),
+        ("ix_map_markers_type_created_by",
+         "CREATE INDEX IF NOT EXISTS ix_map_markers_type_created_by ON map_markers (type, created_by)"),
+    ),
+}
+for _table, _indexes in _HOT_INDEXES.items():
+    if _table not in _inspector.get_table_names():
+        continue
+    _present = {ix["name"] for ix in _inspector.get_indexes(_table)}
+    _missing = [ddl for name, ddl in _indexes if name not in _present]
+    if _missing:
+        with engine.begin() as _conn:
+            for _ddl in _missing:
+                _conn.execute(sa_text(_ddl))
+
 # Import new autonomous modules
 try:
     from websocket_manager import ConnectionManager, WebSocketEventHandler, Channels
@@ -130,6 +198,96 @@ try:
 except Exception:
     qrcode = None  # type: ignore
 
+# Optional orjson import — faster JSON encoding (incl. numpy arrays); stdlib json otherwise
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # type: ignore
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode *obj* as UTF-8 JSON bytes — orjson when installed, stdlib json otherwise.
+
+    datetime values are written as ISO-8601 strings either way.
+    *indent* pretty-prints (2 spaces with orjson, 4 with the stdlib fallback).
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=4 if indent else None, ensure_ascii=False,
+                      default=_json_default).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    """Decode JSON *raw* bytes (orjson when installed); tolerates a UTF-8 BOM."""
+    if orjson is not None:
+        if raw.startswith(b"\xef\xbb\xbf"):
+            raw = raw[3:]
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _json_default(obj: Any) -> Any:
+    """stdlib ``json`` fallback for values orjson handles natively (numpy arrays, datetimes)."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available.
+
+    numpy arrays are serialised straight from their typed buffer by orjson;
+    without orjson they are converted via ``tolist()`` and encoded by the stdlib.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, indent=None,
+            separators=(",", ":"), default=_json_default,
+        ).encode("utf-8")
+
+def _success_response(key: str, encoded: bytes) -> Response:
+    """``{"status": "success", key: ...}`` wrapped around an already-encoded JSON value."""
+    return Response(b'{"status":"success","' + key.encode() + b'":' + encoded + b"}",
+                    media_type="application/json")
+
+_STREAM_BATCH_ROWS = 500
+
+def _stream_json_array(db: Session, rows, build) -> Iterator[bytes]:
+    """Yield ``[build(row), ...]`` as JSON in batches, closing *db* once drained."""
+    try:
+        yield b"["
+        sep = b""
+        for batch in rows.partitions(_STREAM_BATCH_ROWS):
+            yield sep + b",".join(_json_dumps(build(row)) for row in batch)
+            sep = b","
+        yield b"]"
+    finally:
+        db.close()
+
+def _json_array_response(stmt, build) -> StreamingResponse:
+    """Stream the rows of *stmt* as a JSON array without building a list first.
+
+    The query runs before the response starts, so DB errors still surface as a
+    500.  The rows are fetched with ``yield_per`` on a session owned by the
+    stream, because request-scoped ``get_db`` sessions may close before a
+    streaming body is sent.
+    """
+    db = SessionLocal()
+    try:
+        rows = db.execute(stmt.execution_options(yield_per=_STREAM_BATCH_ROWS))
+    except Exception:
+        db.close()
+        raise
+    return StreamingResponse(_stream_json_array(db, rows, build), media_type="application/json")
+
 # Optional meshtastic import (if installed on the server)
 try:
     import meshtastic  # type: ignore
@@ -142,14 +300,33 @@ try:
 except Exception:
     serial_list_ports = None  # type: ignore
 
+# comports() can take hundreds of ms on Windows (SetupAPI enumeration), and the
+# UI polls the port lists; share one enumeration per _PORTS_CACHE_TTL seconds.
+_PORTS_CACHE_TTL = 2.0
+_PORTS_CACHE: Tuple[float, list] = (0.0, [])
+_ports_cache_lock = threading.Lock()
+
+def cached_comports() -> list:
+    """Return serial_list_ports.comports(), cached for _PORTS_CACHE_TTL seconds."""
+    global _PORTS_CACHE
+    if serial_list_ports is None:
+        return []
+    with _ports_cache_lock:
+        now = time.monotonic()
+        stamp, ports = _PORTS_CACHE
+        if stamp and now - stamp < _PORTS_CACHE_TTL:
+            return ports
+        ports = list(serial_list_ports.comports())
+        _PORTS_CACHE = (now, ports)
+        return ports
+
 # Import gateway service
 try:
-    from meshtastic_gateway_service import MeshtasticGatewayService, list_serial_ports as gateway_list_ports
+    from meshtastic_gateway_service import MeshtasticGatewayService
     GATEWAY_SERVICE_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Gateway service not available: {e}")
     MeshtasticGatewayService = None
-    gateway_list_ports = None
     GATEWAY_SERVICE_AVAILABLE = False
 
 # Import CoT listener service
@@ -195,7 +372,48 @@ except Exception as _fed_err:
     FEDERATION_AVAILABLE = False
 
 # Helper function to detect local network IP
+# Detection costs a UDP connect plus hostname lookups, so the result is cached
+# for a short TTL; get_local_ip.cache_clear() forces a fresh detection.
+_LOCAL_IP_CACHE_TTL = 60.0  # seconds
+_LOCAL_IP_CACHE: Optional[Tuple[str, Tuple[str, ...]]] = None
+_LOCAL_IP_CACHE_EXPIRES = 0.0
+
 def get_local_ip():
+    """
+    Detects the local network IP address (cached for _LOCAL_IP_CACHE_TTL seconds).
+    Returns tuple: (primary_ip, all_detected_ips)
+    """
+    global _LOCAL_IP_CACHE, _LOCAL_IP_CACHE_EXPIRES
+    now = time.monotonic()
+    if _LOCAL_IP_CACHE is None or now >= _LOCAL_IP_CACHE_EXPIRES:
+        primary_ip, detected_ips = _detect_local_ip()
+        _LOCAL_IP_CACHE = (primary_ip, tuple(detected_ips))
+        _LOCAL_IP_CACHE_EXPIRES = now + _LOCAL_IP_CACHE_TTL
+    primary_ip, detected_ips = _LOCAL_IP_CACHE
+    return primary_ip, list(detected_ips)
+
+def _clear_local_ip_cache():
+    global _LOCAL_IP_CACHE
+    _LOCAL_IP_CACHE = None
+
+get_local_ip.cache_clear = _clear_local_ip_cache
+
+# Primary-IP preference, highest score wins:
+# 192.168.8.x WLAN subnet (mobile device access) > other 192.168.x.x > 10.x.x.x > 172.16-31.x.x
+_IP_PRIORITY_PATTERNS = (
+    (re.compile(r"192\.168\.8\."), 4),
+    (re.compile(r"192\.168\."), 3),
+    (re.compile(r"10\."), 2),
+    (re.compile(r"172\.(?:1[6-9]|2[0-9]|3[01])\."), 1),
+)
+
+def _ip_priority(ip: str) -> int:
+    for pattern, score in _IP_PRIORITY_PATTERNS:
+        if pattern.match(ip):
+            return score
+    return 0
+
+def _detect_local_ip():
     """
     Detects the local network IP address.
     Prioritizes physical network adapters over virtual ones.
@@ -241,56 +459,38 @@ def get_local_ip():
     except Exception as e:
         logger.warning(f"Hostname IP detection failed: {e}")
     
-    # Filter and prioritize IPs with specific preference for 192.168.8.x WLAN subnet
-    primary_ip = "127.0.0.1"
-    
+    # Pick the highest-priority IP in a single pass; ties keep detection order,
+    # and an IP matching no pattern scores 0 (first detected IP as last resort).
     if detected_ips:
-        # HIGHEST PRIORITY: 192.168.8.x subnet (WLAN for mobile device access)
-        wlan_ips = [ip for ip in detected_ips if ip.startswith("192.168.8.")]
-        if wlan_ips:
-            primary_ip = wlan_ips[0]
-            return primary_ip, detected_ips
-        
-        # SECOND PRIORITY: Other 192.168.x.x addresses (common home/office networks)
-        preferred = [ip for ip in detected_ips if ip.startswith("192.168.")]
-        if preferred:
-            primary_ip = preferred[0]
-            return primary_ip, detected_ips
-        
-        # THIRD PRIORITY: 10.x.x.x (another common private range)
-        preferred = [ip for ip in detected_ips if ip.startswith("10.")]
-        if preferred:
-            primary_ip = preferred[0]
-            return primary_ip, detected_ips
-        
-        # FOURTH PRIORITY: 172.16-31.x.x
-        preferred = []
-        for ip in detected_ips:
-            parts = ip.split('.')
-            if len(parts) == 4 and parts[0] == "172":
-                try:
-                    second_octet = int(parts[1])
-                    if 16 <= second_octet <= 31:
-                        preferred.append(ip)
-                except (ValueError, IndexError):
-                    pass
-        if preferred:
-            primary_ip = preferred[0]
-            return primary_ip, detected_ips
-        
-        # Return first detected IP as last resort
-        primary_ip = detected_ips[0]
+        primary_ip = max(detected_ips, key=_ip_priority)
         return primary_ip, detected_ips
     
     # Last resort: return localhost
     logger.warning("Could not detect local network IP, falling back to 127.0.0.1")
-    return primary_ip, []
+    return "127.0.0.1", []
+
+# Whether the running server serves HTTPS.  Set by the __main__ block once the
+# certificates have actually loaded (worker processes inherit it through
+# LPU5_SERVER_SSL); None when started another way, e.g. by an external
+# uvicorn, where the presence of cert.pem/key.pem is the best guess.
+_SERVER_SSL: Optional[bool] = {"1": True, "0": False}.get(os.environ.get("LPU5_SERVER_SSL", ""))
+
+def _server_protocol() -> str:
+    """Protocol ("https" or "http") the server is reachable with on port 8101."""
+    use_ssl = _SERVER_SSL
+    if use_ssl is None:
+        use_ssl = (os.path.exists(os.path.join(base_path, "cert.pem"))
+                   and os.path.exists(os.path.join(base_path, "key.pem")))
+    return "https" if use_ssl else "http"
 
 # JWT settings (development use only)
 JWT_SECRET = "LPU5-TACTICAL-SECRET-KEY-2024"
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Worker threads for sync endpoints (defaults to the DB pool's capacity)
+THREADPOOL_SIZE = int(os.environ.get("LPU5_THREADPOOL_SIZE", DB_POOL_SIZE + DB_MAX_OVERFLOW))
+
 # Sync constants
 MAX_STORED_MESSAGES = 1000  # Maximum messages to keep in database
 MAX_RETURNED_MESSAGES = 100  # Maximum messages to return in sync/download
@@ -299,15 +499,25 @@ MAX_RETURNED_MESSAGES = 100  # Maximum messages to return in sync/download
 async def lifespan(application):
     # ---- Startup logic ----
     global _MAIN_EVENT_LOOP
+    # lifespan always runs on the server's loop, so this is the loop that
+    # run_coroutine_threadsafe must target from worker threads.
+    _MAIN_EVENT_LOOP = asyncio.get_running_loop()
+    logger.info("✅ Main event loop captured for thread-safe broadcasts")
+
+    # Sync endpoints run on AnyIO's worker threadpool (40 threads by default);
+    # size it to the DB connection pool so DB-bound requests are not capped below it.
     try:
-        _MAIN_EVENT_LOOP = asyncio.get_running_loop()
-        logger.info("✅ Main event loop captured for thread-safe broadcasts")
-    except RuntimeError:
-        try:
-            _MAIN_EVENT_LOOP = asyncio.get_event_loop()
-            logger.info("✅ Fallback event loop captured for thread-safe broadcasts")
-        except Exception as e:
-            logger.warning(f"Could not capture event loop: {e}")
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        logger.info("✅ Worker threadpool size set to %d", THREADPOOL_SIZE)
+    except Exception as e:
+        logger.warning(f"Could not resize worker threadpool: {e}")
+
+    # Start the batched audit log writer
+    global _AUDIT_FLUSH_THREAD
+    if _AUDIT_FLUSH_THREAD is None or not _AUDIT_FLUSH_THREAD.is_alive():
+        _AUDIT_FLUSH_STOP_EVENT.clear()
+        _AUDIT_FLUSH_THREAD = threading.Thread(target=_audit_flush_worker, daemon=True, name="audit-flush")
+        _AUDIT_FLUSH_THREAD.start()
 
     ensure_db_files()
     ensure_default_admin()
@@ -332,44 +542,43 @@ async def lifespan(application):
         except Exception as e:
             logger.error(f"Error starting data server: {e}")
 
-    # Start background sync thread if enabled
+    # config.json is read once for all the startup switches below
+    cfg = load_json("config")
+    if not isinstance(cfg, dict):
+        cfg = {}
+
+    # Start background sync task if enabled
     try:
-        cfg = load_json("config") or {}
         enabled = cfg.get("meshtastic_auto_sync", True)
         interval = int(cfg.get("meshtastic_sync_interval_seconds", 60))
     except Exception:
         enabled = True
         interval = 60
-    global _MESHTASTIC_SYNC_THREAD
-    if enabled and (_MESHTASTIC_SYNC_THREAD is None or not _MESHTASTIC_SYNC_THREAD.is_alive()):
-        _MESHTASTIC_SYNC_STOP_EVENT.clear()
-        _MESHTASTIC_SYNC_THREAD = threading.Thread(target=_meshtastic_sync_worker, args=(interval,), daemon=True, name="meshtastic-sync")
-        _MESHTASTIC_SYNC_THREAD.start()
+    global _MESHTASTIC_SYNC_TASK, _MESHTASTIC_SYNC_STOP_EVENT
+    if enabled and (_MESHTASTIC_SYNC_TASK is None or _MESHTASTIC_SYNC_TASK.done()):
+        _MESHTASTIC_SYNC_STOP_EVENT = asyncio.Event()
+        _MESHTASTIC_SYNC_TASK = asyncio.create_task(
+            _meshtastic_sync_loop(interval, _MESHTASTIC_SYNC_STOP_EVENT), name="meshtastic-sync")
         logger.info("✅ Meshtastic sync worker started (interval=%ss)", interval)
 
-    # Start periodic marker broadcast thread for real-time sync
+    # Start periodic marker broadcast task for real-time sync
     try:
-        cfg = load_json("config") or {}
         broadcast_enabled = cfg.get("marker_broadcast_enabled", True)
         broadcast_interval = int(cfg.get("marker_broadcast_interval_seconds", 60))
     except Exception:
         broadcast_enabled = True
         broadcast_interval = 60
-    global _MARKER_BROADCAST_THREAD
-    if broadcast_enabled and (_MARKER_BROADCAST_THREAD is None or not _MARKER_BROADCAST_THREAD.is_alive()):
-        _MARKER_BROADCAST_STOP_EVENT.clear()
-        _MARKER_BROADCAST_THREAD = threading.Thread(target=_marker_broadcast_worker, args=(broadcast_interval,), daemon=True, name="marker-broadcast")
-        _MARKER_BROADCAST_THREAD.start()
+    global _MARKER_BROADCAST_TASK, _MARKER_BROADCAST_STOP_EVENT
+    if broadcast_enabled and (_MARKER_BROADCAST_TASK is None or _MARKER_BROADCAST_TASK.done()):
+        _MARKER_BROADCAST_STOP_EVENT = asyncio.Event()
+        _MARKER_BROADCAST_TASK = asyncio.create_task(
+            _marker_broadcast_loop(broadcast_interval, _MARKER_BROADCAST_STOP_EVENT), name="marker-broadcast")
         logger.info("✅ Marker broadcast worker started (interval=%ss)", broadcast_interval)
 
     # Start CoT listener service if enabled in config
-    try:
-        cfg = load_json("config") or {}
-        # Default to False – the CoT/ATAK listener only starts when
-        # explicitly enabled via "cot_listener_enabled": true in config.json.
-        cot_listener_enabled = cfg.get("cot_listener_enabled", False)
-    except Exception:
-        cot_listener_enabled = False
+    # Default to False – the CoT/ATAK listener only starts when
+    # explicitly enabled via "cot_listener_enabled": true in config.json.
+    cot_listener_enabled = cfg.get("cot_listener_enabled", False)
     if cot_listener_enabled and COT_LISTENER_AVAILABLE:
         try:
             if _start_cot_listener():
@@ -380,11 +589,7 @@ async def lifespan(application):
             logger.error("Error starting CoT listener service: %s", e)
 
     # Auto-start iTAK CoT bridge (SSL on 127.0.0.1:8089) when enabled
-    try:
-        cfg = load_json("config") or {}
-        itak_bridge_enabled = cfg.get("itak_bridge_enabled", False)
-    except Exception:
-        itak_bridge_enabled = False
+    itak_bridge_enabled = cfg.get("itak_bridge_enabled", False)
     if itak_bridge_enabled and COT_LISTENER_AVAILABLE and iTAKBridgeServer is not None:
         try:
             if _start_itak_bridge():
@@ -432,7 +637,6 @@ async def lifespan(application):
 
     # Start automatic federation sync worker if enabled
     try:
-        cfg = load_json("config") or {}
         fed_sync_enabled = cfg.get("federation_auto_sync", True)
         fed_sync_interval = int(cfg.get("federation_sync_interval_seconds", 300))
     except Exception:
@@ -487,17 +691,19 @@ async def lifespan(application):
     _gateway_services.clear()
     _gateway_threads.clear()
 
-    # Stop meshtastic sync thread
-    try:
-        _MESHTASTIC_SYNC_STOP_EVENT.set()
-    except Exception:
-        pass
-
-    # Stop marker broadcast thread
-    try:
-        _MARKER_BROADCAST_STOP_EVENT.set()
-    except Exception:
-        pass
+    # Stop meshtastic sync and marker broadcast tasks; a cycle already running
+    # in the executor is given a few seconds to finish.
+    for _stop_event, _task in ((_MESHTASTIC_SYNC_STOP_EVENT, _MESHTASTIC_SYNC_TASK),
+                               (_MARKER_BROADCAST_STOP_EVENT, _MARKER_BROADCAST_TASK)):
+        if _stop_event is not None:
+            _stop_event.set()
+        if _task is not None and not _task.done():
+            try:
+                await asyncio.wait_for(_task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            except Exception as e:
+                logger.error("Error stopping %s task: %s", _task.get_name(), e)
 
     # Stop TAK periodic sync thread
     try:
@@ -528,7 +734,13 @@ async def lifespan(application):
         except Exception as e:
             logger.error(f"Error stopping data server: {e}")
 
-app = FastAPI(title="LPU5 Tactical Tracker API", version="2.1.0", lifespan=lifespan)
+    # Stop the audit log writer last so events logged during shutdown are flushed
+    _AUDIT_FLUSH_STOP_EVENT.set()
+    if _AUDIT_FLUSH_THREAD is not None:
+        _AUDIT_FLUSH_THREAD.join(timeout=5)
+
+app = FastAPI(title="LPU5 Tactical Tracker API", version="2.1.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -655,25 +867,123 @@ DEFAULT_DB_CONTENTS: Dict[str, Any] = {
 # -------------------------
 
 # In-memory cache for JSON files (especially config) to avoid repeated disk I/O.
-# _json_cache maps key -> (mtime, data).  On load we stat the file and skip
-# re-reading if mtime has not changed.
-_json_cache: Dict[str, Tuple[float, Any]] = {}
+# _json_cache maps key -> ((st_mtime_ns, st_size), data).  On load we stat the
+# file once and skip re-reading while the stamp is unchanged; save_json stores
+# the freshly written data under the new stamp so the next load is a hit.
+_json_cache: Dict[str, Tuple[Any, Any]] = {}
 _json_cache_lock = threading.Lock()
 
+# DB files are machine-read, so they are written compact.  LPU5_JSON_PRETTY=1
+# restores indented output for debugging; config.json is always indented
+# because it is edited by hand.
+JSON_PRETTY = os.environ.get("LPU5_JSON_PRETTY", "0") == "1"
+_JSON_PRETTY_KEYS = frozenset({"config"})
+
+def _json_indent(key: str) -> bool:
+    return JSON_PRETTY or key in _JSON_PRETTY_KEYS
+
+# Append-only sidecar logs for list-backed JSON DBs that mostly grow.
+# append_json writes one JSON line per entry to "<path>.log" instead of
+# rewriting the whole file; load_json replays the log on top of the base file,
+# and the log is folded back into the base file (compact_json) once it passes
+# _JSON_LOG_COMPACT_BYTES.  Values are the per-key item cap (None = unbounded).
+# Only for files no other process writes: meshtastic_messages_db.json is also
+# rewritten whole by the gateway service (which may run standalone), and
+# neither the log lock nor compaction would see those writes.
+_JSON_LOG_KEYS: Dict[str, Optional[int]] = {}
+_JSON_LOG_COMPACT_BYTES = 256 * 1024
+_JSON_LOG_FSYNC_EVERY = 32  # fsync the log after this many unsynced entries
+_json_log_lock = threading.Lock()
+_json_log_unsynced: Dict[str, int] = {}
+_json_log_compacting: set = set()  # keys with a background compaction running
+
+def _json_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Return the (mtime_ns, size) validity token for *path*, or None if it is missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+# In-process write versions of the JSON DBs, bumped by save_json, append_json
+# and compact_json.  Versions start at the process's start time, and a key not
+# written yet reports that epoch, so no version carries over a restart (they
+# end up in sync/download ETags, and files may change while the server is down).
+_json_write_epoch = time.time_ns()
+_json_write_counter = itertools.count(_json_write_epoch + 1)
+_json_write_versions: Dict[str, int] = {}
+
+def _bump_json_version(key: str) -> None:
+    _json_write_versions[key] = next(_json_write_counter)
+
+def _json_db_stamp(key: str, path: str) -> Any:
+    """Cache validity token for a JSON DB; log-backed keys pair it with the log's stamp."""
+    stamp = _json_stamp(path)
+    if key in _JSON_LOG_KEYS:
+        return stamp, _json_stamp(path + ".log")
+    return stamp
+
+def _folded_log_prefix(base: List[Any], entries: List[Any]) -> int:
+    """Number of leading log *entries* already at the end of *base*.
+
+    Compaction replaces the base file before it removes the log, so a crash in
+    between leaves a log whose entries are also the tail of the base file
+    (possibly followed by later appends).  Replay skips that prefix.
+    """
+    if not base or not entries:
+        return 0
+    last = base[-1]
+    for n in range(min(len(entries), len(base)), 0, -1):
+        if entries[n - 1] == last and base[-n:] == entries[:n]:
+            return n
+    return 0
+
+def _read_json_with_log(key: str, path: str) -> List[Any]:
+    """Read a log-backed JSON DB: the base list plus every entry in its sidecar log."""
+    data: List[Any] = []
+    if os.path.exists(path):
+        with open(path, "rb", buffering=65536) as f:
+            base = _json_loads(f.read())
+        if isinstance(base, list):
+            data = base
+    log_path = path + ".log"
+    if os.path.exists(log_path):
+        entries: List[Any] = []
+        with open(log_path, "rb", buffering=65536) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entries.append(_json_loads(line))
+                except ValueError:
+                    # A torn last line after a crash; skip it.
+                    logger.warning("Skipping invalid line in %s", log_path)
+        folded = _folded_log_prefix(data, entries)
+        if folded:
+            logger.warning("Skipping %d entries of %s already compacted into %s", folded, log_path, path)
+        data.extend(entries[folded:])
+    cap = _JSON_LOG_KEYS.get(key)
+    if cap is not None and len(data) > cap:
+        data = data[-cap:]
+    return data
+
 def load_json(key: str) -> Any:
     path = DB_PATHS.get(key)
-    if not path or not os.path.exists(path):
+    stamp = _json_db_stamp(key, path) if path else None
+    if stamp is None or stamp == (None, None):
         return DEFAULT_DB_CONTENTS.get(key, {})
     try:
-        mtime = os.path.getmtime(path)
         with _json_cache_lock:
             cached = _json_cache.get(key)
-            if cached and cached[0] == mtime:
+            if cached and cached[0] == stamp:
                 return cached[1]
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if key in _JSON_LOG_KEYS:
+            data = _read_json_with_log(key, path)
+        else:
+            with open(path, "rb", buffering=65536) as f:
+                data = _json_loads(f.read())
         with _json_cache_lock:
-            _json_cache[key] = (mtime, data)
+            _json_cache[key] = (stamp, data)
         return data
     except json.JSONDecodeError:
         logger.warning("Invalid JSON in %s at %s", key, path)
@@ -689,34 +999,245 @@ def save_json(key: str, data: Any) -> None:
     dirpath = os.path.dirname(path)
     if dirpath and not os.path.exists(dirpath):
         os.makedirs(dirpath, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
-    # Invalidate cache so the next load_json picks up the new data.
+    payload = _json_dumps(data, indent=_json_indent(key))
+    if key in _JSON_LOG_KEYS:
+        # The caller saved the full (log-replayed) list, so the log is now
+        # folded in.  Held under the log lock so no append lands in between.
+        with _json_log_lock:
+            with open(path, "wb", buffering=65536) as f:
+                f.write(payload)
+            try:
+                os.remove(path + ".log")
+            except FileNotFoundError:
+                pass
+            _json_log_unsynced.pop(key, None)
+    else:
+        with open(path, "wb", buffering=65536) as f:
+            f.write(payload)
+    _bump_json_version(key)
+    # Remember what we just wrote so the next load_json is a cache hit.  The
+    # cache gets its own copy decoded from the written bytes: the caller keeps
+    # *data* and may go on mutating it.
+    stamp = _json_db_stamp(key, path)
     with _json_cache_lock:
-        _json_cache.pop(key, None)
+        if stamp is None:
+            _json_cache.pop(key, None)
+        else:
+            _json_cache[key] = (stamp, _json_loads(payload))
     logger.debug("Saved %s -> %s", key, path)
 
+# Lookup indexes derived from list-backed JSON DBs, keyed (db key, index name)
+# -> (validity stamp, index).  Rebuilt only when the file's stamp changes.
+_json_index_cache: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+
+def _json_index(key: str, name: str, build: Callable[[List[Any]], Any]) -> Any:
+    """Return build(load_json(key)), cached until the JSON DB behind *key* changes."""
+    path = DB_PATHS.get(key)
+    stamp = _json_db_stamp(key, path) if path else None
+    cached = _json_index_cache.get((key, name))
+    if cached is not None and stamp is not None and cached[0] == stamp:
+        return cached[1]
+    data = load_json(key)
+    index = build(data if isinstance(data, list) else [])
+    _json_index_cache[(key, name)] = (stamp, index)
+    return index
+
+def _index_all_by(field: str) -> Callable[[List[Any]], Dict[Any, List[Any]]]:
+    """Index builder: field value -> every item carrying it, in file order."""
+    def build(items: List[Any]) -> Dict[Any, List[Any]]:
+        index: Dict[Any, List[Any]] = {}
+        for item in items:
+            if isinstance(item, dict):
+                index.setdefault(item.get(field), []).append(item)
+        return index
+    return build
+
+def extend_json(key: str, entries: List[Any], cap: Optional[int] = None) -> None:
+    """Add *entries* to the end of a list-backed JSON DB, keeping the newest *cap* items."""
+    if key in _JSON_LOG_KEYS:
+        append_json(key, entries)
+        return
+    existing = load_json(key)
+    data = (existing if isinstance(existing, list) else []) + list(entries)
+    if cap is not None and len(data) > cap:
+        data = data[-cap:]
+    save_json(key, data)
+
+def append_json(key: str, entries: List[Any]) -> None:
+    """
+    Append *entries* to a list-backed JSON DB listed in _JSON_LOG_KEYS.
+
+    Only the new entries are written (as JSON lines to the sidecar log), so an
+    append costs O(len(entries)) instead of a full rewrite of the file.
+    """
+    if key not in _JSON_LOG_KEYS:
+        raise ValueError(f"{key} is not an append-only JSON DB")
+    path = DB_PATHS.get(key)
+    if not path or not entries:
+        return
+    dirpath = os.path.dirname(path)
+    if dirpath and not os.path.exists(dirpath):
+        os.makedirs(dirpath, exist_ok=True)
+    log_path = path + ".log"
+    payload = b"".join(_json_dumps(entry) + b"\n" for entry in entries)
+    with _json_log_lock:
+        before = _json_db_stamp(key, path)
+        with open(log_path, "ab", buffering=65536) as f:
+            f.write(payload)
+            unsynced = _json_log_unsynced.get(key, 0) + len(entries)
+            if unsynced >= _JSON_LOG_FSYNC_EVERY:
+                f.flush()
+                os.fsync(f.fileno())
+                unsynced = 0
+            _json_log_unsynced[key] = unsynced
+        _bump_json_version(key)
+        after = _json_db_stamp(key, path)
+        # Keep a warm cache warm by applying the append in memory.  The cached
+        # list may already be held by load_json callers, so it is replaced,
+        # never mutated.
+        with _json_cache_lock:
+            cached = _json_cache.get(key)
+            if cached and cached[0] == before and isinstance(cached[1], list):
+                data = cached[1] + list(entries)
+                cap = _JSON_LOG_KEYS[key]
+                if cap is not None and len(data) > cap:
+                    data = data[-cap:]
+                _json_cache[key] = (after, data)
+            else:
+                _json_cache.pop(key, None)
+        # Compaction rewrites the whole file; keep it off the caller's thread
+        # (which may be the event loop)
+        if (after[1] is not None and after[1][1] >= _JSON_LOG_COMPACT_BYTES
+                and key not in _json_log_compacting):
+            _json_log_compacting.add(key)
+            threading.Thread(target=_compact_json_in_background, args=(key,),
+                             name=f"compact-{key}", daemon=True).start()
+
+def _compact_json_in_background(key: str) -> None:
+    try:
+        compact_json(key)
+    except Exception:
+        logger.exception("Compacting %s failed", key)
+    finally:
+        with _json_log_lock:
+            _json_log_compacting.discard(key)
+
+def compact_json(key: str) -> None:
+    """Fold the sidecar log of a log-backed JSON DB into its base file."""
+    path = DB_PATHS.get(key)
+    if key not in _JSON_LOG_KEYS or not path:
+        return
+    with _json_log_lock:
+        _compact_json_locked(key, path)
+
+def _compact_json_locked(key: str, path: str) -> None:
+    log_path = path + ".log"
+    if not os.path.exists(log_path):
+        return
+    data = load_json(key)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb", buffering=65536) as f:
+        f.write(_json_dumps(data, indent=_json_indent(key)))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    os.remove(log_path)
+    _bump_json_version(key)
+    _json_log_unsynced.pop(key, None)
+    stamp = _json_db_stamp(key, path)
+    with _json_cache_lock:
+        _json_cache[key] = (stamp, data)
+    logger.debug("Compacted %s log into %s", key, path)
+
 # -------------------------
 # Utility
 # -------------------------
+_NOW_ISO_CACHE: Tuple[float, str] = (0.0, "")
+
+def now_iso() -> str:
+    """Current UTC time as an ISO-8601 string, cached at 1 ms granularity for hot broadcast paths."""
+    global _NOW_ISO_CACHE
+    t = time.time()
+    cached_t, cached_iso = _NOW_ISO_CACHE
+    if 0.0 <= t - cached_t < 0.001:
+        return cached_iso
+    iso = datetime.fromtimestamp(t, timezone.utc).isoformat()
+    _NOW_ISO_CACHE = (t, iso)
+    return iso
+
+# Row ids for the user/session/registration create paths.  One os.urandom call
+# yields _UUID_POOL_REFILL random UUIDs, so bursts of logins and registrations
+# do not make one getrandom syscall per id.
+_UUID_POOL: "queue.SimpleQueue[str]" = queue.SimpleQueue()
+_UUID_POOL_REFILL = 1024
+
+def new_id() -> str:
+    """Return a random (version 4) UUID string, same format as str(uuid.uuid4())."""
+    try:
+        return _UUID_POOL.get_nowait()
+    except queue.Empty:
+        pass
+    raw = os.urandom(16 * _UUID_POOL_REFILL)
+    for i in range(16, len(raw), 16):
+        _UUID_POOL.put(str(uuid.UUID(bytes=raw[i:i + 16], version=4)))
+    return str(uuid.UUID(bytes=raw[:16], version=4))
+
 def hash_password(password: str) -> str:
     return hashlib.sha256(password.encode("utf-8")).hexdigest()
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return hash_password(password) == password_hash
+    # Constant-time comparison so the check does not leak how many leading characters matched
+    if not isinstance(password_hash, str):
+        return False
+    return hmac.compare_digest(hash_password(password).encode("ascii"), password_hash.encode("utf-8"))
+
+# HS256 fast path for our own tokens: the header never changes, so tokens are
+# built and checked with a single hashlib HMAC (OpenSSL) instead of going through
+# PyJWT on every request.  Tokens with any other header still use jwt.decode.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+_JWT_KEY = JWT_SECRET.encode("utf-8")
+
+def _b64url_encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+def _b64url_decode(part: bytes) -> bytes:
+    return base64.urlsafe_b64decode(part + b"=" * (-len(part) % 4))
 
 def generate_token(user_id: str, username: str) -> str:
+    now = int(time.time())
     payload = {
         "user_id": user_id,
         "username": username,
-        "exp": datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS),
-        "iat": datetime.now(timezone.utc)
+        "exp": now + JWT_EXPIRATION_HOURS * 3600,
+        "iat": now
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url_encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode("ascii")
 
 def verify_token(token: str) -> Optional[Dict]:
     try:
-        return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        header_b64, payload_b64, signature_b64 = token.encode("ascii").split(b".")
+        if header_b64 != _JWT_HEADER_B64:
+            return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        # Compared in encoded form: base64 decoding would silently drop stray
+        # characters appended to the signature
+        expected = _b64url_encode(hmac.new(_JWT_KEY, header_b64 + b"." + payload_b64, hashlib.sha256).digest())
+        if not hmac.compare_digest(expected, signature_b64):
+            return None
+        payload = json.loads(_b64url_decode(payload_b64))
+        if not isinstance(payload, dict):
+            return None
+        # Same registered-claim checks jwt.decode applies
+        now = time.time()
+        exp = payload.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp <= now):
+            return None
+        for claim in ("iat", "nbf"):
+            value = payload.get(claim)
+            if value is not None and (not isinstance(value, (int, float)) or value > now):
+                return None
+        return payload
     except Exception:
         return None
 
@@ -740,42 +1261,202 @@ def get_current_user(authorization: Optional[str] = Header(None)) -> dict:
     return payload
 
 
-def log_audit(action: str, user_id: str, details: Dict) -> None:
-    """Log an audit event to the database"""
+# Audit events are queued and written in batches by _audit_flush_worker (one
+# commit per batch instead of one per event).  Without a running flusher
+# (scripts importing api, or a full queue) log_audit writes directly.
+_AUDIT_QUEUE: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10_000)
+_AUDIT_BATCH_SIZE = 200
+_AUDIT_FLUSH_INTERVAL = 0.1  # seconds to let events accumulate between batches
+_AUDIT_FLUSH_THREAD = None
+_AUDIT_FLUSH_STOP_EVENT = threading.Event()
+# Counters reported by /api/system/health ("direct" = written on the request
+# thread because the flusher was not running or the queue was full).
+# Updated from request threads and the flusher, so always under the lock.
+_AUDIT_STATS = {"queued": 0, "direct": 0, "written": 0, "failed": 0, "batches": 0}
+_AUDIT_STATS_LOCK = threading.Lock()
+
+def _count_audit(**deltas: int) -> None:
+    with _AUDIT_STATS_LOCK:
+        for name, n in deltas.items():
+            _AUDIT_STATS[name] += n
+
+def _audit_stats_snapshot() -> Dict[str, int]:
+    with _AUDIT_STATS_LOCK:
+        return dict(_AUDIT_STATS)
+
+def _write_audit_rows(rows: List[Dict[str, Any]]) -> None:
     db = SessionLocal()
     try:
-        log_entry = AuditLog(
-            event_type=action,
-            user=user_id,
-            details=json.dumps(details),
-            timestamp=datetime.now(timezone.utc)
-        )
-        db.add(log_entry)
+        db.execute(AuditLog.__table__.insert(), rows)
         db.commit()
+        _count_audit(written=len(rows), batches=1)
     except Exception as e:
         db.rollback()
+        _count_audit(failed=len(rows))
         logger.error(f"Failed to log audit: {e}")
     finally:
         db.close()
 
+def _audit_flush_worker():
+    """Drain the audit queue into the database in batches; drains fully before stopping."""
+    while True:
+        try:
+            batch = [_AUDIT_QUEUE.get(timeout=_AUDIT_FLUSH_INTERVAL)]
+        except queue.Empty:
+            if _AUDIT_FLUSH_STOP_EVENT.is_set():
+                break
+            continue
+        while len(batch) < _AUDIT_BATCH_SIZE:
+            try:
+                batch.append(_AUDIT_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        _write_audit_rows(batch)
+        if len(batch) < _AUDIT_BATCH_SIZE:
+            _AUDIT_FLUSH_STOP_EVENT.wait(_AUDIT_FLUSH_INTERVAL)
+    logger.info("Audit flush worker stopped")
+
+def log_audit(action: str, user_id: str, details: Dict) -> None:
+    """Log an audit event to the database (batched via the audit queue when the flusher runs)"""
+    try:
+        row = {
+            "id": new_id(),
+            "event_type": action,
+            "user": user_id,
+            "details": _json_dumps(details).decode("utf-8"),
+            "timestamp": datetime.now(timezone.utc),
+        }
+    except Exception as e:
+        logger.error(f"Failed to log audit: {e}")
+        return
+    if (_AUDIT_FLUSH_THREAD is not None and _AUDIT_FLUSH_THREAD.is_alive()
+            and not _AUDIT_FLUSH_STOP_EVENT.is_set()):
+        try:
+            _AUDIT_QUEUE.put_nowait(row)
+            _count_audit(queued=1)
+            return
+        except queue.Full:
+            logger.warning("Audit queue full, writing audit event directly")
+    _count_audit(direct=1)
+    _write_audit_rows([row])
+
 # -------------------------
 # WebSocket broadcast helpers
 # -------------------------
-def broadcast_websocket_update(channel: str, event_type: str, data: Dict) -> None:
+# The event loop only keeps weak references to tasks, so fire-and-forget
+# broadcast tasks are held here until they finish.
+_BROADCAST_TASKS: set = set()
+
+def _spawn_broadcast(coro) -> "asyncio.Task":
+    """Schedule a broadcast coroutine on the running loop and keep it alive until done."""
+    task = asyncio.create_task(coro)
+    _BROADCAST_TASKS.add(task)
+    task.add_done_callback(_BROADCAST_TASKS.discard)
+    return task
+
+# Latest-state events (full snapshots of one item) are coalesced: within
+# _BROADCAST_COALESCE_SECONDS only the newest frame per (channel, event, id) is
+# sent, so a burst of position updates for one marker reaches clients once.
+# The first held update schedules one flush task on the main event loop; it
+# sends the whole window and the next held update schedules the next one.
+_COALESCED_BROADCAST_EVENTS = frozenset({"marker_updated", "tak_maker_update", "symbol_updated"})
+_BROADCAST_COALESCE_SECONDS = 0.05
+_PENDING_BROADCASTS: Dict[Tuple[str, str, Any], Tuple[Dict, bytes]] = {}
+_PENDING_BROADCASTS_LOCK = threading.Lock()
+_BROADCAST_FLUSH_SCHEDULED = False
+
+def _flush_pending_broadcasts() -> None:
+    global _PENDING_BROADCASTS, _BROADCAST_FLUSH_SCHEDULED
+    with _PENDING_BROADCASTS_LOCK:
+        pending, _PENDING_BROADCASTS = _PENDING_BROADCASTS, {}
+        _BROADCAST_FLUSH_SCHEDULED = False
+    for (channel, event_type, _item_id), (data, frame) in pending.items():
+        _dispatch_broadcast(channel, event_type, data, frame)
+
+async def _flush_pending_broadcasts_after_window() -> None:
+    await asyncio.sleep(_BROADCAST_COALESCE_SECONDS)
+    _flush_pending_broadcasts()
+
+def _schedule_broadcast_flush() -> bool:
+    """Start the window's flush task on the event loop; False if no loop is running."""
+    try:
+        asyncio.get_running_loop()
+        _spawn_broadcast(_flush_pending_broadcasts_after_window())
+        return True
+    except RuntimeError:
+        pass
+    # Called from a worker thread: hand the task to the main loop
+    if _MAIN_EVENT_LOOP and _MAIN_EVENT_LOOP.is_running():
+        _MAIN_EVENT_LOOP.call_soon_threadsafe(_spawn_broadcast, _flush_pending_broadcasts_after_window())
+        return True
+    return False
+
+def broadcast_websocket_update(channel: str, event_type: str, data: Dict,
+                               encoded_data: Optional[bytes] = None) -> None:
     """
     Broadcast an update to all WebSocket clients subscribed to a channel.
     Uses the separate data server process for data distribution.
     Falls back to direct WebSocket if data server is unavailable.
+
+    Events in _COALESCED_BROADCAST_EVENTS are held for up to
+    _BROADCAST_COALESCE_SECONDS and superseded by newer ones for the same item;
+    any other event for that item drops the held frame and is sent at once.
     
     Args:
         channel: WebSocket channel name (e.g., 'markers', 'drawings', 'overlays')
         event_type: Event type identifier (e.g., 'marker_created', 'drawing_updated')
         data: Event data dictionary to broadcast
-    """
+        encoded_data: *data* already encoded as JSON by the caller (e.g. shared
+            with its HTTP response); spliced into the frame as-is
+    """
+    global _BROADCAST_FLUSH_SCHEDULED
+    # Encode once here (off the event loop when called from a worker thread);
+    # the data server POST and every WebSocket subscriber reuse the same bytes.
+    try:
+        if encoded_data is not None:
+            frame = b"".join((
+                b'{"type":', _json_dumps(event_type),
+                b',"channel":', _json_dumps(channel),
+                b',"data":', encoded_data,
+                b',"timestamp":', _json_dumps(now_iso()), b"}",
+            ))
+        else:
+            frame = _json_dumps({
+                "type": event_type,
+                "channel": channel,
+                "data": data,
+                "timestamp": now_iso()
+            })
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Failed to encode {event_type} broadcast for {channel}: {e}")
+        return
+
+    item_id = data.get("id") if isinstance(data, dict) else None
+    if item_id is not None:
+        if event_type in _COALESCED_BROADCAST_EVENTS:
+            with _PENDING_BROADCASTS_LOCK:
+                _PENDING_BROADCASTS[(channel, event_type, item_id)] = (data, frame)
+                schedule = not _BROADCAST_FLUSH_SCHEDULED
+                _BROADCAST_FLUSH_SCHEDULED = True
+            if schedule and not _schedule_broadcast_flush():
+                # No event loop (scripts, shutdown): nothing to coalesce on
+                _flush_pending_broadcasts()
+            return
+        if _PENDING_BROADCASTS:
+            # A create/delete supersedes a held update; sending the update
+            # afterwards would resurrect a deleted item on the clients.
+            with _PENDING_BROADCASTS_LOCK:
+                for key in [k for k in _PENDING_BROADCASTS if k[0] == channel and k[2] == item_id]:
+                    del _PENDING_BROADCASTS[key]
+
+    _dispatch_broadcast(channel, event_type, data, frame)
+
+def _dispatch_broadcast(channel: str, event_type: str, data: Dict, frame: bytes) -> None:
+    """Send an encoded broadcast frame to the data server and WebSocket subscribers."""
     # Try to broadcast via data server (best-effort, non-blocking)
     if DATA_SERVER_AVAILABLE and data_server_manager and data_server_manager.is_running():
         try:
-            data_server_manager.broadcast(channel, event_type, data)
+            data_server_manager.broadcast(channel, event_type, data, encoded=frame)
         except Exception as e:
             logger.warning(f"Failed to broadcast via data server: {e}")
     
@@ -785,18 +1466,12 @@ def broadcast_websocket_update(channel: str, event_type: str, data: Dict) -> Non
         return
     
     try:
-        message = {
-            "type": event_type,
-            "channel": channel,
-            "data": data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        message = frame.decode("utf-8")
         # Schedule the broadcast in the event loop
-        import asyncio
         try:
             # Try to get the running loop (Python 3.10+)
-            loop = asyncio.get_running_loop()
-            asyncio.create_task(websocket_manager.publish_to_channel(channel, message))
+            asyncio.get_running_loop()
+            _spawn_broadcast(websocket_manager.publish_to_channel(channel, message))
             logger.debug(f"Created task for broadcast to {channel}")
         except RuntimeError:
             # No running loop - we're being called from a thread
@@ -821,29 +1496,35 @@ def broadcast_websocket_update(channel: str, event_type: str, data: Dict) -> Non
 def save_session(db: Session, session_obj: Dict) -> None:
     """
     Save session with simplified single-IP tracking per user in DB.
-    Removes old sessions for the same user to avoid VPN + WLAN conflicts.
+    Replaces any old session for the same user to avoid VPN + WLAN conflicts,
+    using a single UPSERT on the unique username.
     """
     username = session_obj.get("username")
-    if username:
-        db.query(APISession).filter(APISession.username == username).delete()
-    
+    now = datetime.now(timezone.utc)
+
     # Convert ISO strings to datetime objects
-    created_at = datetime.fromisoformat(session_obj["created_at"]) if isinstance(session_obj.get("created_at"), str) else datetime.now(timezone.utc)
-    expires_at = datetime.fromisoformat(session_obj["expires_at"]) if isinstance(session_obj.get("expires_at"), str) else (datetime.now(timezone.utc) + timedelta(hours=24))
-    last_seen = datetime.fromisoformat(session_obj["last_seen"]) if isinstance(session_obj.get("last_seen"), str) else datetime.now(timezone.utc)
-
-    new_session = APISession(
-        id=session_obj.get("id"),
-        token=session_obj.get("token"),
-        user_id=session_obj.get("user_id"),
-        username=username,
-        created_at=created_at,
-        expires_at=expires_at,
-        ip=session_obj.get("ip"),
-        last_seen=last_seen,
-        data={"language": session_obj.get("language", "de")}
+    def _when(field: str, default: datetime) -> datetime:
+        value = session_obj.get(field)
+        return datetime.fromisoformat(value) if isinstance(value, str) else default
+
+    row = {
+        "id": session_obj.get("id") or new_id(),
+        "token": session_obj.get("token"),
+        "user_id": session_obj.get("user_id"),
+        "username": username,
+        "created_at": _when("created_at", now),
+        "expires_at": _when("expires_at", now + timedelta(hours=24)),
+        "ip": session_obj.get("ip"),
+        "last_seen": _when("last_seen", now),
+        "data": {"language": session_obj.get("language", "de")},
+    }
+    table = APISession.__table__
+    stmt = sqlite_insert(table).values(**row)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.username],
+        set_={name: stmt.excluded[name] for name in row if name != "username"},
     )
-    db.add(new_session)
+    db.execute(stmt)
     db.commit()
     logger.info("Saved session for %s in DB", username)
 
@@ -894,11 +1575,32 @@ def list_active_sessions() -> List[Dict]:
 # -------------------------
 # HTML serving & PAGE_MAP
 # -------------------------
-def get_html_response(filename: str):
+@functools.lru_cache(maxsize=64)
+def _load_html(path: str, mtime_ns: int, size: int) -> Tuple[bytes, str]:
+    """Read an HTML page once per (mtime_ns, size) version and compute its ETag."""
+    with open(path, "rb") as f:
+        body = f.read()
+    return body, '"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def get_html_response(filename: str, request: Optional[Request] = None):
     path = os.path.join(base_path, filename)
-    if os.path.exists(path) and os.path.isfile(path):
-        return FileResponse(path, media_type="text/html")
-    raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=404, detail=f"File {filename} not found")
+    body, etag = _load_html(path, st.st_mtime_ns, st.st_size)
+    # no-cache: browsers revalidate every navigation and get a 304 while the page is unchanged
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request is not None:
+        if_none_match = request.headers.get("if-none-match")
+        # t[2:] strips a weak "W/" prefix (str.removeprefix needs Python 3.9)
+        if if_none_match and (if_none_match.strip() == "*" or etag in (
+                t[2:] if t.startswith("W/") else t
+                for t in (tag.strip() for tag in if_none_match.split(",")))):
+            return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="text/html", headers=headers)
 
 PAGE_MAP: Dict[str, str] = {
     "/": "landing.html",
@@ -926,12 +1628,26 @@ PAGE_MAP: Dict[str, str] = {
     "/register.html": "register.html",
 }
 
-for route, filename in PAGE_MAP.items():
-    def make_handler(fname: str):
-        def handler():
-            return get_html_response(fname)
-        return handler
-    app.add_api_route(route, make_handler(filename), methods=["GET"], include_in_schema=False)
+class _PageConvertor(Convertor):
+    """Path convertor matching only the page names in PAGE_MAP, so the single
+    page route below never shadows API or static routes registered after it."""
+    regex = "|".join(re.escape(route[1:]) for route in PAGE_MAP if route != "/")
+
+    def convert(self, value: str) -> str:
+        return value
+
+    def to_string(self, value: str) -> str:
+        return value
+
+register_url_convertor("page", _PageConvertor())
+
+@app.get("/", include_in_schema=False)
+def serve_root_page(request: Request):
+    return get_html_response(PAGE_MAP["/"], request)
+
+@app.get("/{page:page}", include_in_schema=False)
+def serve_page(page: str, request: Request):
+    return get_html_response(PAGE_MAP["/" + page], request)
 
 # -------------------------
 # Debug endpoints
@@ -2126,10 +2842,8 @@ def _tak_receiver_loop() -> None:
         try:
             tak_cfg = _get_tak_config()
             if not tak_cfg["tak_forward_enabled"] or not tak_cfg["tak_server_host"]:
-                for _ in range(10):
-                    if _TAK_RECEIVER_STOP.is_set():
-                        return
-                    time.sleep(1)
+                if _TAK_RECEIVER_STOP.wait(10):
+                    return
                 continue
 
             host = tak_cfg["tak_server_host"]
@@ -2138,10 +2852,8 @@ def _tak_receiver_loop() -> None:
 
             if conn_type not in ("tcp", "ssl"):
                 # UDP is send-only; no persistent receiver possible
-                for _ in range(10):
-                    if _TAK_RECEIVER_STOP.is_set():
-                        return
-                    time.sleep(1)
+                if _TAK_RECEIVER_STOP.wait(10):
+                    return
                 continue
 
             sock = None
@@ -2313,10 +3025,7 @@ def _tak_receiver_loop() -> None:
         delay = backoff_delays[min(attempt, len(backoff_delays) - 1)]
         attempt += 1
         logger.info("TAK receiver reconnecting in %ss (attempt %s)", delay, attempt)
-        for _ in range(delay):
-            if _TAK_RECEIVER_STOP.is_set():
-                break
-            time.sleep(1)
+        _TAK_RECEIVER_STOP.wait(delay)
 
     logger.info("TAK receiver thread stopped")
 
@@ -2437,12 +3146,12 @@ def _forward_all_lpu5_data_to_tak() -> dict:
 # -------------------------
 # Background meshtastic -> markers sync
 # -------------------------
-_MESHTASTIC_SYNC_THREAD = None
-_MESHTASTIC_SYNC_STOP_EVENT = threading.Event()
+_MESHTASTIC_SYNC_TASK: Optional["asyncio.Task"] = None
+_MESHTASTIC_SYNC_STOP_EVENT: Optional[asyncio.Event] = None  # created on the running loop in lifespan
 # created_by values used by meshtastic code paths — used to filter meshtastic markers from general endpoints
-_MESHTASTIC_CREATED_BY = {"import_meshtastic", "meshtastic_sync", "ingest_node"}
+_MESHTASTIC_CREATED_BY = frozenset({"import_meshtastic", "meshtastic_sync", "ingest_node"})
 # Meshtastic role values that indicate a node acts as a network gateway/router.
-_MESHTASTIC_GATEWAY_ROLES = {"ROUTER", "ROUTER_CLIENT"}
+_MESHTASTIC_GATEWAY_ROLES = frozenset({"ROUTER", "ROUTER_CLIENT"})
 
 def _forward_meshtastic_node_to_tak(node_id: str, name: str, lat: float, lng: float,
                                     is_gateway: bool = False) -> bool:
@@ -2515,15 +3224,26 @@ def sync_meshtastic_nodes_to_map_markers_once():
     db = SessionLocal()
     try:
         nodes = db.query(MeshtasticNode).all()
-        # Index existing markers created by meshtastic sync (all three
+        # Look up existing markers created by meshtastic sync (all three
         # creation sources so we never create a duplicate for a node that
-        # was first seen via the ingest_node endpoint).
-        existing_markers = db.query(MapMarker).filter(MapMarker.created_by.in_(list(_MESHTASTIC_CREATED_BY))).all()
-
-        by_unit = {str(m.data.get("unit_id") if isinstance(m.data, dict) else ""): m for m in existing_markers if m.data}
+        # was first seen via the ingest_node endpoint) through the indexed
+        # external_id column, fetching only (id, external_id) pairs.
+        node_ids = [str(n.id) for n in nodes]
+        by_unit = {}
+        if node_ids:
+            by_unit = {
+                ext_id: mid for mid, ext_id in db.query(MapMarker.id, MapMarker.external_id).filter(
+                    MapMarker.external_id.in_(node_ids),
+                    MapMarker.created_by.in_(_MESHTASTIC_CREATED_BY),
+                )
+            }
 
-        created = 0
-        updated = 0
+        # Markers without a unit_id (e.g. CoT-ingested) are matched by their
+        # stable mesh-<id> marker ID; look those up in one query.
+        fallback_ids = [f"mesh-{n.id}" for n in nodes if str(n.id) not in by_unit]
+        existing_ids = set(by_unit.values())
+        if fallback_ids:
+            existing_ids.update(mid for (mid,) in db.query(MapMarker.id).filter(MapMarker.id.in_(fallback_ids)))
 
         # Resolve the CoT listener endpoint once so it can be embedded in
         # every marker's data dict for the periodic broadcast worker.
@@ -2533,6 +3253,9 @@ def sync_meshtastic_nodes_to_map_markers_once():
         # in the TAK forwarding step without duplicating the detection logic.
         node_gateway_flags: Dict[str, bool] = {}
 
+        now = datetime.now(timezone.utc)
+        now_iso = now.isoformat()
+        rows: List[Dict[str, Any]] = []
         for n in nodes:
             mesh = n.id
             name = n.long_name or n.short_name or mesh or "node"
@@ -2546,51 +3269,53 @@ def sync_meshtastic_nodes_to_map_markers_once():
             node_gateway_flags[str(mesh)] = node_is_gateway
             marker_type = "gateway" if node_is_gateway else "node"
 
-            # find existing: first by unit_id in data, then by stable mesh-<id> marker ID
-            # (the latter covers CoT-ingested markers that lack a unit_id in their data).
-            stable_mesh_id = f"mesh-{mesh}"
-            marker = by_unit.get(str(mesh))
-            if marker is None:
-                marker = db.query(MapMarker).filter(MapMarker.id == stable_mesh_id).first()
-
-            if marker:
-                # update
-                marker.lat = float(lat)
-                marker.lng = float(lng)
-                marker.name = name
-                marker.type = marker_type
-                marker_data = marker.data if isinstance(marker.data, dict) else {}
-                marker_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-                marker_data["is_gateway"] = node_is_gateway
-                # Persist the endpoint so the periodic broadcast worker includes
-                # it when forwarding via SA Multicast / TCP CoT.
-                if cot_endpoint:
-                    marker_data["contact_endpoint"] = cot_endpoint
-                marker.data = marker_data
-                updated += 1
-            else:
-                # stable_mesh_id is already pre-computed above ("mesh-{mesh}").
-                # Use it so the periodic broadcast worker sends CoT events with
-                # the same UID as _forward_meshtastic_node_to_tak().  Without a
-                # stable ID, every broadcast cycle would produce a different CoT
-                # UID which causes ATAK/WinTAK to accumulate duplicate contacts.
-                marker_data: Dict[str, Any] = {"unit_id": mesh, "is_gateway": node_is_gateway}
-                if cot_endpoint:
-                    marker_data["contact_endpoint"] = cot_endpoint
-                new_marker = MapMarker(
-                    id=stable_mesh_id,
-                    lat=float(lat),
-                    lng=float(lng),
-                    name=name,
-                    type=marker_type,
-                    created_by="import_meshtastic",
-                    created_at=datetime.now(timezone.utc),
-                    data=marker_data
-                )
-                db.add(new_marker)
-                created += 1
+            # Target: first the marker whose data.unit_id matches, then the stable
+            # mesh-<id> marker ID.  New markers use the stable ID so the periodic
+            # broadcast worker sends CoT events with the same UID as
+            # _forward_meshtastic_node_to_tak().  Without a stable ID, every
+            # broadcast cycle would produce a different CoT UID which causes
+            # ATAK/WinTAK to accumulate duplicate contacts.
+            marker_data: Dict[str, Any] = {"unit_id": mesh, "is_gateway": node_is_gateway, "updated_at": now_iso}
+            # Persist the endpoint so the periodic broadcast worker includes
+            # it when forwarding via SA Multicast / TCP CoT.
+            if cot_endpoint:
+                marker_data["contact_endpoint"] = cot_endpoint
+            rows.append({
+                "id": by_unit.get(str(mesh), f"mesh-{mesh}"),
+                "lat": float(lat),
+                "lng": float(lng),
+                "name": name,
+                "type": marker_type,
+                "created_by": "import_meshtastic",
+                "created_at": now,
+                "data": marker_data,
+                "external_id": str(mesh),
+            })
 
+        created = sum(1 for r in rows if r["id"] not in existing_ids)
+        updated = len(rows) - created
+
+        # One batched SQLite UPSERT instead of per-row ORM changes.  Existing
+        # markers keep created_by/created_at and any extra data keys; the sync
+        # fields are merged into their data with json_patch.
+        if rows:
+            table = MapMarker.__table__
+            stmt = sqlite_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.id],
+                set_={
+                    "lat": stmt.excluded.lat,
+                    "lng": stmt.excluded.lng,
+                    "name": stmt.excluded.name,
+                    "type": stmt.excluded.type,
+                    "external_id": stmt.excluded.external_id,
+                    "data": sa_func.json_patch(sa_func.coalesce(table.c.data, "{}"), stmt.excluded.data),
+                },
+            )
+            db.execute(stmt, rows)
         db.commit()
+        if rows:
+            _mark_broadcast_dirty("marker", (r["id"] for r in rows))
         logger.info("sync_meshtastic_nodes_to_map_markers_once completed: created=%d updated=%d", created, updated)
 
         # Forward all nodes to the TAK server so TAK can distribute them globally.
@@ -2616,21 +3341,27 @@ def sync_meshtastic_nodes_to_map_markers_once():
     finally:
         db.close()
 
-def _meshtastic_sync_worker(interval_seconds: int = 60):
-    while not _MESHTASTIC_SYNC_STOP_EVENT.is_set():
+async def _wait_or_stop(stop_event: asyncio.Event, interval_seconds: float) -> None:
+    """Sleep for *interval_seconds*, returning early once *stop_event* is set."""
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout=max(1, interval_seconds))
+    except asyncio.TimeoutError:
+        pass
+
+async def _meshtastic_sync_loop(interval_seconds: int, stop_event: asyncio.Event):
+    """Run the meshtastic node sync periodically; the DB work runs in the default executor."""
+    loop = asyncio.get_running_loop()
+    while not stop_event.is_set():
         try:
-            sync_meshtastic_nodes_to_map_markers_once()
+            await loop.run_in_executor(None, sync_meshtastic_nodes_to_map_markers_once)
         except Exception as e:
             logger.exception("Error in meshtastic sync worker: %s", e)
-        for _ in range(max(1, int(interval_seconds))):
-            if _MESHTASTIC_SYNC_STOP_EVENT.is_set():
-                break
-            time.sleep(1)
+        await _wait_or_stop(stop_event, int(interval_seconds))
     logger.info("Meshtastic sync worker stopped")
 
 # Periodic marker broadcast for real-time sync
-_MARKER_BROADCAST_THREAD = None
-_MARKER_BROADCAST_STOP_EVENT = threading.Event()
+_MARKER_BROADCAST_TASK: Optional["asyncio.Task"] = None
+_MARKER_BROADCAST_STOP_EVENT: Optional[asyncio.Event] = None  # created on the running loop in lifespan
 
 # State hash caches for change-detection in the periodic broadcast worker.
 # Keyed by marker/overlay id → a tuple of the fields that trigger a re-broadcast.
@@ -2640,144 +3371,227 @@ _MARKER_BROADCAST_STOP_EVENT = threading.Event()
 _BROADCAST_MARKER_HASH: Dict[str, tuple] = {}
 _BROADCAST_OVERLAY_HASH: Dict[str, tuple] = {}
 
-def _marker_broadcast_worker(interval_seconds: int = 60):
+# The worker only reads these columns, so it loads plain Row tuples instead of
+# ORM instances (no identity map or instance state per row).
+_BROADCAST_MARKER_COLUMNS = (
+    MapMarker.id, MapMarker.lat, MapMarker.lng, MapMarker.name, MapMarker.type,
+    MapMarker.color, MapMarker.icon, MapMarker.created_by, MapMarker.data, MapMarker.created_at,
+)
+_BROADCAST_OVERLAY_COLUMNS = (Overlay.id, Overlay.name, Overlay.data, Overlay.created_by, Overlay.created_at)
+
+# Changefeed for the broadcast worker: ids of markers/overlays written since the
+# last cycle.  Committed ORM writes are recorded by the session hooks below, bulk
+# Core writes call _mark_broadcast_dirty directly.  Between full sweeps the worker
+# only fetches these rows instead of scanning both tables.
+_BROADCAST_DIRTY: Dict[str, set] = {"marker": set(), "overlay": set()}
+_BROADCAST_DIRTY_LOCK = threading.Lock()
+_BROADCAST_FULL_SYNC_SECONDS = 600  # safety-net full scan for writes that bypass the hooks
+
+def _mark_broadcast_dirty(kind: str, ids) -> None:
+    """Queue marker/overlay ids for the next broadcast cycle (thread-safe)."""
+    with _BROADCAST_DIRTY_LOCK:
+        _BROADCAST_DIRTY[kind].update(str(i) for i in ids if i is not None)
+
+def _drain_broadcast_dirty() -> Tuple[set, set]:
+    with _BROADCAST_DIRTY_LOCK:
+        markers, overlays = _BROADCAST_DIRTY["marker"], _BROADCAST_DIRTY["overlay"]
+        _BROADCAST_DIRTY["marker"], _BROADCAST_DIRTY["overlay"] = set(), set()
+    return markers, overlays
+
+@sa_event.listens_for(SessionLocal, "after_flush")
+def _collect_broadcast_dirty(session, flush_context):
+    pending = session.info.setdefault("broadcast_dirty", {"marker": set(), "overlay": set()})
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, MapMarker):
+            pending["marker"].add(obj.id)
+        elif isinstance(obj, Overlay):
+            pending["overlay"].add(obj.id)
+
+@sa_event.listens_for(SessionLocal, "after_commit")
+def _publish_broadcast_dirty(session):
+    pending = session.info.pop("broadcast_dirty", None)
+    if pending:
+        for kind, ids in pending.items():
+            if ids:
+                _mark_broadcast_dirty(kind, ids)
+
+@sa_event.listens_for(SessionLocal, "after_rollback")
+def _discard_broadcast_dirty(session):
+    session.info.pop("broadcast_dirty", None)
+
+async def _marker_broadcast_loop(interval_seconds: int, stop_event: asyncio.Event):
     """
-    Periodic marker broadcast worker for real-time sync.
+    Periodic marker broadcast task for real-time sync.
 
-    Only markers/overlays whose state has changed since the last broadcast cycle are
-    sent to WebSocket clients and the SA-Multicast / TCP-CoT channels.  A full-sync
-    payload (all current markers) is still sent once when the worker first starts so
-    that clients which connect while the server is idle receive the complete picture.
+    Each cycle runs _marker_broadcast_once in the default executor so the
+    database queries never block the event loop.
     """
+    loop = asyncio.get_running_loop()
     first_run = True
-    while not _MARKER_BROADCAST_STOP_EVENT.is_set():
-        db = SessionLocal()
+    last_full_sync = loop.time()
+    while not stop_event.is_set():
         try:
-            markers = db.query(MapMarker).all()
+            full_sync = first_run or loop.time() - last_full_sync >= _BROADCAST_FULL_SYNC_SECONDS
+            if await loop.run_in_executor(None, _marker_broadcast_once, first_run, full_sync):
+                first_run = False
+                if full_sync:
+                    last_full_sync = loop.time()
+        except Exception as e:
+            logger.exception("Error in marker broadcast worker: %s", e)
+        await _wait_or_stop(stop_event, interval_seconds)
+    logger.info("Marker broadcast worker stopped")
 
-            # Build per-marker state tuples for change detection.
-            changed_markers = []
-            current_marker_ids: set = set()
-            for m in markers:
-                mid = str(m.id)
-                current_marker_ids.add(mid)
-                state = (m.lat, m.lng, m.name, m.type, m.color, m.icon, hash(str(m.data)))
-                if first_run or _BROADCAST_MARKER_HASH.get(mid) != state:
-                    _BROADCAST_MARKER_HASH[mid] = state
-                    changed_markers.append(m)
-
-            # Evict deleted markers from the hash cache.
-            for stale_id in list(_BROADCAST_MARKER_HASH.keys()):
-                if stale_id not in current_marker_ids:
-                    del _BROADCAST_MARKER_HASH[stale_id]
-
-            if first_run:
-                # On first run broadcast the full state so new clients get everything.
-                marker_list = [
-                    {
-                        "id": m.id, "lat": m.lat, "lng": m.lng, "name": m.name,
-                        "type": m.type, "color": m.color, "icon": m.icon,
-                        "created_by": m.created_by, "data": m.data,
-                        "timestamp": m.created_at.isoformat() if m.created_at else datetime.now(timezone.utc).isoformat()
-                    } for m in markers
-                ]
-                if marker_list:
-                    broadcast_websocket_update("markers", "markers_sync", {"markers": marker_list, "sync_type": "initial"})
-                    logger.debug("Initial broadcast: %s markers", len(marker_list))
-            elif changed_markers:
-                marker_list = [
-                    {
-                        "id": m.id, "lat": m.lat, "lng": m.lng, "name": m.name,
-                        "type": m.type, "color": m.color, "icon": m.icon,
-                        "created_by": m.created_by, "data": m.data,
-                        "timestamp": m.created_at.isoformat() if m.created_at else datetime.now(timezone.utc).isoformat()
-                    } for m in changed_markers
-                ]
-                broadcast_websocket_update("markers", "markers_sync", {"markers": marker_list, "sync_type": "periodic"})
-                logger.debug("Periodic broadcast: %s/%s markers changed", len(changed_markers), len(markers))
-
-            # Forward changed LPU5-originated markers via SA Multicast / TCP CoT.
-            if AUTONOMOUS_MODULES_AVAILABLE and changed_markers:
-                mcast_sent = 0
-                tcp_sent = 0
-                for m in changed_markers:
-                    if m.created_by not in ("cot_ingest", "tak_server"):
-                        try:
-                            mdict = {
-                                "id": m.id, "lat": m.lat, "lng": m.lng,
-                                "name": m.name, "type": m.type,
-                                "created_by": m.created_by,
-                            }
-                            if isinstance(m.data, dict):
-                                for k, v in m.data.items():
-                                    if k not in mdict:
-                                        mdict[k] = v
-                            cot_evt = CoTProtocolHandler.marker_to_cot(mdict)
-                            if cot_evt:
-                                cot_xml = cot_evt.to_xml()
-                                if _forward_cot_multicast(cot_xml):
-                                    mcast_sent += 1
-                                if _forward_cot_to_tcp_clients(cot_xml):
-                                    tcp_sent += 1
-                                _forward_cot_to_itak_bridge(cot_xml)
-                        except Exception as _mc_err:
-                            logger.debug("SA Multicast send for marker %s failed: %s", m.id, _mc_err)
-                if mcast_sent:
-                    logger.debug("Sent %d markers via SA Multicast for periodic sync", mcast_sent)
-                if tcp_sent:
-                    logger.debug("Sent %d markers to TCP clients for periodic sync", tcp_sent)
-
-            # Broadcast overlays — only changed ones after the first run.
-            overlays = db.query(Overlay).all()
-            changed_overlays = []
-            current_overlay_ids: set = set()
-            for o in overlays:
-                oid = str(o.id)
-                current_overlay_ids.add(oid)
-                state = (o.name, hash(str(o.data)))
-                if first_run or _BROADCAST_OVERLAY_HASH.get(oid) != state:
-                    _BROADCAST_OVERLAY_HASH[oid] = state
-                    changed_overlays.append(o)
-
-            for stale_id in list(_BROADCAST_OVERLAY_HASH.keys()):
-                if stale_id not in current_overlay_ids:
-                    del _BROADCAST_OVERLAY_HASH[stale_id]
-
-            if first_run:
-                overlay_list = [
-                    {
-                        "id": o.id, "name": o.name, "data": o.data,
-                        "created_by": o.created_by,
-                        "timestamp": o.created_at.isoformat() if o.created_at else datetime.now(timezone.utc).isoformat()
-                    } for o in overlays
-                ]
-                if overlay_list:
-                    broadcast_websocket_update("overlays", "overlays_sync", {"overlays": overlay_list, "sync_type": "initial"})
-                    logger.debug("Initial broadcast: %s overlays", len(overlay_list))
-            elif changed_overlays:
-                overlay_list = [
-                    {
-                        "id": o.id, "name": o.name, "data": o.data,
-                        "created_by": o.created_by,
-                        "timestamp": o.created_at.isoformat() if o.created_at else datetime.now(timezone.utc).isoformat()
-                    } for o in changed_overlays
-                ]
-                broadcast_websocket_update("overlays", "overlays_sync", {"overlays": overlay_list, "sync_type": "periodic"})
-                logger.debug("Periodic broadcast: %s/%s overlays changed", len(changed_overlays), len(overlays))
+def _marker_broadcast_once(first_run: bool, full_sync: bool = True) -> bool:
+    """
+    Run one marker/overlay broadcast cycle.  Returns True when the cycle completed.
 
-            first_run = False
+    Only markers/overlays whose state has changed since the last broadcast cycle are
+    sent to WebSocket clients and the SA-Multicast / TCP-CoT channels.  A full-sync
+    payload (all current markers) is still sent on the first cycle so that clients
+    which connect while the server is idle receive the complete picture.
 
-        except Exception as e:
-            logger.exception("Error in marker broadcast worker: %s", e)
-        finally:
-            db.close()
+    Unless *full_sync* is set, only the rows queued in the changefeed are read.
+    """
+    dirty_markers, dirty_overlays = _drain_broadcast_dirty()
+    if not full_sync and not dirty_markers and not dirty_overlays:
+        return True
+    # One fallback timestamp per cycle for records without created_at.
+    cycle_ts = now_iso()
+    db = SessionLocal()
+    try:
+        if full_sync:
+            markers = db.query(*_BROADCAST_MARKER_COLUMNS).all()
+        elif dirty_markers:
+            markers = db.query(*_BROADCAST_MARKER_COLUMNS).filter(MapMarker.id.in_(dirty_markers)).all()
+        else:
+            markers = []
 
-        # Sleep in small intervals to allow for clean shutdown
-        for _ in range(max(1, interval_seconds)):
-            if _MARKER_BROADCAST_STOP_EVENT.is_set():
-                break
-            time.sleep(1)
-    logger.info("Marker broadcast worker stopped")
+        # Build per-marker state tuples for change detection.
+        changed_markers = []
+        current_marker_ids: set = set()
+        for m in markers:
+            mid = str(m.id)
+            current_marker_ids.add(mid)
+            state = (m.lat, m.lng, m.name, m.type, m.color, m.icon, hash(str(m.data)))
+            if first_run or _BROADCAST_MARKER_HASH.get(mid) != state:
+                _BROADCAST_MARKER_HASH[mid] = state
+                changed_markers.append(m)
+
+        # Evict deleted markers from the hash cache.
+        for stale_id in (list(_BROADCAST_MARKER_HASH.keys()) if full_sync else dirty_markers):
+            if stale_id not in current_marker_ids:
+                _BROADCAST_MARKER_HASH.pop(stale_id, None)
+
+        # created_at stays a datetime here; _json_dumps writes it as ISO-8601.
+        if first_run:
+            # On first run broadcast the full state so new clients get everything.
+            marker_list = [
+                {
+                    "id": m.id, "lat": m.lat, "lng": m.lng, "name": m.name,
+                    "type": m.type, "color": m.color, "icon": m.icon,
+                    "created_by": m.created_by, "data": m.data,
+                    "timestamp": m.created_at or cycle_ts
+                } for m in markers
+            ]
+            if marker_list:
+                broadcast_websocket_update("markers", "markers_sync", {"markers": marker_list, "sync_type": "initial"})
+                logger.debug("Initial broadcast: %s markers", len(marker_list))
+        elif changed_markers:
+            marker_list = [
+                {
+                    "id": m.id, "lat": m.lat, "lng": m.lng, "name": m.name,
+                    "type": m.type, "color": m.color, "icon": m.icon,
+                    "created_by": m.created_by, "data": m.data,
+                    "timestamp": m.created_at or cycle_ts
+                } for m in changed_markers
+            ]
+            broadcast_websocket_update("markers", "markers_sync", {"markers": marker_list, "sync_type": "periodic"})
+            logger.debug("Periodic broadcast: %s/%s markers changed", len(changed_markers), len(markers))
+
+        # Forward changed LPU5-originated markers via SA Multicast / TCP CoT.
+        if AUTONOMOUS_MODULES_AVAILABLE and changed_markers:
+            mcast_sent = 0
+            tcp_sent = 0
+            for m in changed_markers:
+                if m.created_by not in ("cot_ingest", "tak_server"):
+                    try:
+                        mdict = {
+                            "id": m.id, "lat": m.lat, "lng": m.lng,
+                            "name": m.name, "type": m.type,
+                            "created_by": m.created_by,
+                        }
+                        if isinstance(m.data, dict):
+                            for k, v in m.data.items():
+                                if k not in mdict:
+                                    mdict[k] = v
+                        cot_evt = CoTProtocolHandler.marker_to_cot(mdict)
+                        if cot_evt:
+                            cot_xml = cot_evt.to_xml()
+                            if _forward_cot_multicast(cot_xml):
+                                mcast_sent += 1
+                            if _forward_cot_to_tcp_clients(cot_xml):
+                                tcp_sent += 1
+                            _forward_cot_to_itak_bridge(cot_xml)
+                    except Exception as _mc_err:
+                        logger.debug("SA Multicast send for marker %s failed: %s", m.id, _mc_err)
+            if mcast_sent:
+                logger.debug("Sent %d markers via SA Multicast for periodic sync", mcast_sent)
+            if tcp_sent:
+                logger.debug("Sent %d markers to TCP clients for periodic sync", tcp_sent)
+
+        # Broadcast overlays — only changed ones after the first run.
+        if full_sync:
+            overlays = db.query(*_BROADCAST_OVERLAY_COLUMNS).all()
+        elif dirty_overlays:
+            overlays = db.query(*_BROADCAST_OVERLAY_COLUMNS).filter(Overlay.id.in_(dirty_overlays)).all()
+        else:
+            overlays = []
+        changed_overlays = []
+        current_overlay_ids: set = set()
+        for o in overlays:
+            oid = str(o.id)
+            current_overlay_ids.add(oid)
+            state = (o.name, hash(str(o.data)))
+            if first_run or _BROADCAST_OVERLAY_HASH.get(oid) != state:
+                _BROADCAST_OVERLAY_HASH[oid] = state
+                changed_overlays.append(o)
+
+        for stale_id in (list(_BROADCAST_OVERLAY_HASH.keys()) if full_sync else dirty_overlays):
+            if stale_id not in current_overlay_ids:
+                _BROADCAST_OVERLAY_HASH.pop(stale_id, None)
+
+        if first_run:
+            overlay_list = [
+                {
+                    "id": o.id, "name": o.name, "data": o.data,
+                    "created_by": o.created_by,
+                    "timestamp": o.created_at or cycle_ts
+                } for o in overlays
+            ]
+            if overlay_list:
+                broadcast_websocket_update("overlays", "overlays_sync", {"overlays": overlay_list, "sync_type": "initial"})
+                logger.debug("Initial broadcast: %s overlays", len(overlay_list))
+        elif changed_overlays:
+            overlay_list = [
+                {
+                    "id": o.id, "name": o.name, "data": o.data,
+                    "created_by": o.created_by,
+                    "timestamp": o.created_at or cycle_ts
+                } for o in changed_overlays
+            ]
+            broadcast_websocket_update("overlays", "overlays_sync", {"overlays": overlay_list, "sync_type": "periodic"})
+            logger.debug("Periodic broadcast: %s/%s overlays changed", len(changed_overlays), len(overlays))
+
+        return True
+
+    except Exception as e:
+        logger.exception("Error in marker broadcast worker: %s", e)
+        # Put the drained ids back so the next cycle retries them.
+        _mark_broadcast_dirty("marker", dirty_markers)
+        _mark_broadcast_dirty("overlay", dirty_overlays)
+        return False
+    finally:
+        db.close()
 
 
 # Periodic TAK sync worker
@@ -2792,11 +3606,8 @@ def _tak_periodic_sync_worker(interval_seconds: int = 60):
     """
     logger.info("TAK periodic sync worker started (interval=%s s)", interval_seconds)
     while not _TAK_PERIODIC_SYNC_STOP_EVENT.is_set():
-        for _ in range(max(1, interval_seconds)):
-            if _TAK_PERIODIC_SYNC_STOP_EVENT.is_set():
-                break
-            time.sleep(1)
-        if _TAK_PERIODIC_SYNC_STOP_EVENT.is_set():
+        # Event.wait returns True as soon as the stop event is set
+        if _TAK_PERIODIC_SYNC_STOP_EVENT.wait(max(1, interval_seconds)):
             break
         try:
             _forward_all_lpu5_data_to_tak()
@@ -2808,14 +3619,29 @@ def _tak_periodic_sync_worker(interval_seconds: int = 60):
 # -------------------------
 # Authentication endpoints
 # -------------------------
+# Statements for the per-request user/registration lookups, built once at import.
+# Bound parameters keep them identical across calls, so SQLAlchemy reuses the
+# cached compiled form instead of rebuilding a Query each time.  Callers take
+# .first(), so each stops at one row; an id match wins over a username match.
+_STMT_USER_BY_USERNAME = select(User).where(User.username == bindparam("username")).limit(1)
+_STMT_USER_BY_ID_OR_USERNAME = (
+    select(User)
+    .where((User.id == bindparam("key")) | (User.username == bindparam("key")))
+    .order_by((User.id == bindparam("key")).desc())
+    .limit(1)
+)
+_STMT_PENDING_BY_USERNAME = (
+    select(PendingRegistration).where(PendingRegistration.username == bindparam("username")).limit(1)
+)
+
 @app.post("/api/login_user")
-async def login_user(data: dict = Body(...), request: Request = None, db: Session = Depends(get_db)):
+def login_user(data: dict = Body(...), request: Request = None, db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     password = data.get("password") or ""
     if not username or not password:
         raise HTTPException(status_code=400, detail="Username and password required")
     
-    user = db.query(User).filter(User.username == username).first()
+    user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
     if not user or not verify_password(password, user.password_hash):
         log_audit("login_failed", "system", {"username": username})
         raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -2823,32 +3649,45 @@ async def login_user(data: dict = Body(...), request: Request = None, db: Sessio
     if not user.is_active:
         raise HTTPException(status_code=403, detail="User account is inactive")
     
-    # Update last login in data JSON
-    current_data = user.data if user.data else {}
-    current_data["last_login"] = datetime.now(timezone.utc).isoformat()
-    user.data = current_data
-    db.commit()
+    # Update last login in data JSON with json_set in SQL rather than rewriting
+    # the whole document; committed together with the session upsert in
+    # save_session below.
+    login_time = datetime.now(timezone.utc)
+    login_iso = login_time.isoformat()
+    user_data = dict(user.data or {})
+    user_data["last_login"] = login_iso
+    db.execute(
+        sa_update(User)
+        .where(User.id == user.id)
+        .values(data=sa_func.json_set(
+            # NULL or a JSON null (how the JSON type stores None) start from {}
+            sa_case((sa_func.json_type(User.data) == "object", User.data), else_=literal_column("'{}'")),
+            "$.last_login", login_iso,
+        ))
+        .execution_options(synchronize_session=False)
+    )
     
     log_audit("login_success", user.id, {"username": username})
 
     token = generate_token(user.id, user.username)
-    expires_at = (datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)).isoformat()
+    expires_at = (login_time + timedelta(hours=JWT_EXPIRATION_HOURS)).isoformat()
     client_ip = request.client.host if request and request.client else ""
     session_obj = {
-        "id": str(uuid.uuid4()),
+        "id": new_id(),
         "token": token,
         "user_id": user.id,
         "username": user.username,
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "created_at": login_iso,
         "expires_at": expires_at,
         "ip": client_ip,
         "ips": [client_ip],
         "last_ip": client_ip,
-        "last_seen": datetime.now(timezone.utc).isoformat(),
-        "language": (user.data or {}).get("language", "de")
+        "last_seen": login_iso,
+        "language": user_data.get("language", "de")
     }
-    save_session(db, session_obj)
 
+    # Built before the commit in save_session expires the instance, so the
+    # response does not trigger a reload SELECT.
     user_info = {
         "id": user.id,
         "username": user.username,
@@ -2861,53 +3700,42 @@ async def login_user(data: dict = Body(...), request: Request = None, db: Sessio
         "fullname": user.fullname,
         "callsign": user.callsign,
         "is_active": user.is_active,
-        "language": (user.data or {}).get("language", "en"),
-        "data": user.data
+        "language": user_data.get("language", "en"),
+        "data": user_data
     }
+    save_session(db, session_obj)
 
     return {"status": "success", "user": user_info, "token": token, "expires_at": expires_at}
 
 @app.post("/api/logout")
-async def logout(data: dict = Body(...)):
+def logout(data: dict = Body(...)):
     token = data.get("token")
     if not token:
         raise HTTPException(status_code=400, detail="token required")
     remove_session_by_token(token)
+    _invalidate_user_cache(token=token)
     log_audit("logout", "system", {"token": token})
     return {"status": "success", "message": "Logged out"}
 
-# New: /api/me endpoint - returns user info based on Authorization header token
-@app.get("/api/me")
-def api_me(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    """
-    Returns user info for current token.
-    Accepts Authorization: Bearer <token> header.
-    """
-    token = None
-    if authorization:
-        if authorization.lower().startswith("bearer "):
-            token = authorization[7:].strip()
-        else:
-            token = authorization.strip()
-    if not token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(status_code=401, detail="Invalid token")
-    
-    user = db.query(User).filter(User.id == payload.get("user_id")).first()
-    if not user:
-        user = db.query(User).filter(User.username == payload.get("username")).first()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+# User columns returned by the user endpoints (everything except the password hash)
+_USER_PUBLIC_COLUMNS = tuple(c.key for c in User.__table__.columns if c.key != "password_hash")
+
+def _user_public_dict(user: User) -> Dict:
+    return {key: getattr(user, key) for key in _USER_PUBLIC_COLUMNS}
+
+# Short-lived token -> user-info cache for /api/me and /api/permissions/user.
+# The token itself is still verified on every request; only the user lookup
+# is cached.  Entries are dropped on logout and when the user is changed.
+_USER_CACHE_TTL = 30.0
+_USER_CACHE_MAX = 10000
+_USER_CACHE: Dict[str, Tuple[float, Dict]] = {}
+_USER_CACHE_LOCK = threading.Lock()
 
+def _user_info(user: User, db: Session) -> Dict:
     unit_name = user.unit
     if user.unit_id:
         unit_obj = db.query(Unit).filter(Unit.id == user.unit_id).first()
         unit_name = unit_obj.name if unit_obj else user.unit
-
     return {
         "id": user.id,
         "username": user.username,
@@ -2928,6 +3756,63 @@ def api_me(authorization: Optional[str] = Header(None), db: Session = Depends(ge
         "data": user.data
     }
 
+def _cached_user_info(token: str, payload: Dict, db: Session) -> Optional[Dict]:
+    """Return the user-info dict for a verified *token*, cached for _USER_CACHE_TTL seconds."""
+    now = time.monotonic()
+    with _USER_CACHE_LOCK:
+        hit = _USER_CACHE.get(token)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    user = db.query(User).filter(User.id == payload.get("user_id")).first()
+    if not user:
+        user = db.query(User).filter(User.username == payload.get("username")).first()
+    if not user:
+        return None
+    info = _user_info(user, db)
+    with _USER_CACHE_LOCK:
+        if len(_USER_CACHE) >= _USER_CACHE_MAX:
+            for key in [k for k, (exp, _) in _USER_CACHE.items() if exp <= now]:
+                del _USER_CACHE[key]
+            if len(_USER_CACHE) >= _USER_CACHE_MAX:
+                _USER_CACHE.clear()
+        _USER_CACHE[token] = (now + _USER_CACHE_TTL, info)
+    return info
+
+def _invalidate_user_cache(user_id: Optional[str] = None, token: Optional[str] = None) -> None:
+    """Drop cached user info for *token* and/or every token belonging to *user_id*."""
+    with _USER_CACHE_LOCK:
+        if token:
+            _USER_CACHE.pop(token, None)
+        if user_id:
+            for key in [k for k, (_, info) in _USER_CACHE.items() if info["id"] == user_id]:
+                del _USER_CACHE[key]
+
+# New: /api/me endpoint - returns user info based on Authorization header token
+@app.get("/api/me")
+def api_me(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """
+    Returns user info for current token.
+    Accepts Authorization: Bearer <token> header.
+    """
+    token = None
+    if authorization:
+        if authorization.lower().startswith("bearer "):
+            token = authorization[7:].strip()
+        else:
+            token = authorization.strip()
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    payload = verify_token(token)
+    if not payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    info = _cached_user_info(token, payload, db)
+    if not info:
+        raise HTTPException(status_code=404, detail="User not found")
+    return info
+
 # -------------------------
 # Permission check endpoints
 # -------------------------
@@ -2943,7 +3828,7 @@ async def check_permission(data: dict = Body(...), authorization: Optional[str]
     return {"has_permission": True, "permission": data.get("permission", "")}
 
 @app.get("/api/permissions/user")
-async def get_user_permissions(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def get_user_permissions(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     """
     Get all permissions for the current user.
     """
@@ -2961,12 +3846,12 @@ async def get_user_permissions(authorization: Optional[str] = Header(None), db:
     if not payload:
         return {"permissions": ["*"], "role": "admin", "username": "unknown"}
         
-    user = db.query(User).filter(User.username == payload.get("username")).first()
+    user = _cached_user_info(token, payload, db)
     
     return {
         "permissions": ["*"],  # All permissions granted
-        "role": user.role if user else "admin",
-        "username": user.username if user else "unknown"
+        "role": user["role"] if user else "admin",
+        "username": user["username"] if user else "unknown"
     }
 
 @app.get("/api/permissions/list")
@@ -2999,12 +3884,12 @@ async def get_roles():
 # Units endpoints (CRUD)
 # -------------------------
 @app.get("/api/units")
-async def list_units(db: Session = Depends(get_db)):
+def list_units(db: Session = Depends(get_db)):
     units = db.query(Unit).order_by(Unit.name).all()
     return [{"id": u.id, "name": u.name, "description": u.description} for u in units]
 
 @app.post("/api/units")
-async def create_unit(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def create_unit(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     name = (data.get("name") or "").strip()
     if not name:
         raise HTTPException(status_code=400, detail="Unit name required")
@@ -3018,7 +3903,7 @@ async def create_unit(data: dict = Body(...), authorization: Optional[str] = Hea
     return {"id": unit.id, "name": unit.name, "description": unit.description}
 
 @app.delete("/api/units/{unit_id}")
-async def delete_unit(unit_id: str, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def delete_unit(unit_id: str, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     unit = db.query(Unit).filter((Unit.id == unit_id) | (Unit.name == unit_id)).first()
     if not unit:
         raise HTTPException(status_code=404, detail="Unit not found")
@@ -3037,7 +3922,7 @@ async def delete_unit(unit_id: str, authorization: Optional[str] = Header(None),
 # Users endpoints (create/update/list/delete)
 # -------------------------
 @app.get("/api/users")
-async def get_users(db: Session = Depends(get_db)):
+def get_users(db: Session = Depends(get_db)):
     users = db.query(User).all()
     # Build unit_id -> name map for efficient lookup
     unit_map = {u.id: u.name for u in db.query(Unit).all()}
@@ -3064,7 +3949,7 @@ async def get_users(db: Session = Depends(get_db)):
     ]
 
 @app.post("/api/users/create")
-async def create_user_with_password(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def create_user_with_password(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     password = data.get("password") or ""
     group_id = data.get("group_id", "users")
@@ -3077,11 +3962,11 @@ async def create_user_with_password(data: dict = Body(...), authorization: Optio
     if len(password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     
-    if db.query(User).filter(User.username == username).first():
+    if db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first():
         raise HTTPException(status_code=400, detail="Username already exists")
     
     new_user = User(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         username=username,
         email=data.get("email", ""),
         password_hash=hash_password(password),
@@ -3101,10 +3986,10 @@ async def create_user_with_password(data: dict = Body(...), authorization: Optio
     db.refresh(new_user)
     
     log_audit("create_user", "system", {"user_id": new_user.id, "role": role})
-    return {"status": "success", "user": {k: v for k, v in new_user.__dict__.items() if k != "password_hash" and not k.startswith("_")}}
+    return {"status": "success", "user": _user_public_dict(new_user)}
 
 @app.post("/api/users")
-async def create_user_legacy(data: dict = Body(...), db: Session = Depends(get_db)):
+def create_user_legacy(data: dict = Body(...), db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     email = data.get("email", "")
     group_id = data.get("group_id")
@@ -3113,7 +3998,7 @@ async def create_user_legacy(data: dict = Body(...), db: Session = Depends(get_d
     if not username:
         raise HTTPException(status_code=400, detail="Username required")
     
-    if db.query(User).filter(User.username == username).first():
+    if db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first():
         raise HTTPException(status_code=400, detail="Username already exists")
     
     temp_password = None
@@ -3124,7 +4009,7 @@ async def create_user_legacy(data: dict = Body(...), db: Session = Depends(get_d
         password_hash = hash_password(temp_password)
     
     new_user = User(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         username=username,
         email=email,
         password_hash=password_hash,
@@ -3138,18 +4023,18 @@ async def create_user_legacy(data: dict = Body(...), db: Session = Depends(get_d
     db.refresh(new_user)
     
     log_audit("create_user", "system", {"user_id": new_user.id})
-    user_info = {k: v for k, v in new_user.__dict__.items() if k != "password_hash" and not k.startswith("_")}
+    user_info = _user_public_dict(new_user)
     resp = {"status": "success", "user": user_info}
     if temp_password:
         resp["temp_password"] = temp_password
     return resp
 
 @app.get("/api/users/{user_id}")
-async def get_user(user_id: str, db: Session = Depends(get_db)):
-    user = db.query(User).filter((User.id == user_id) | (User.username == user_id)).first()
+def get_user(user_id: str, db: Session = Depends(get_db)):
+    user = db.execute(_STMT_USER_BY_ID_OR_USERNAME, {"key": user_id}).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    result = {k: v for k, v in user.__dict__.items() if k != "password_hash" and not k.startswith("_")}
+    result = _user_public_dict(user)
     # Include resolved unit name
     if user.unit_id:
         unit_obj = db.query(Unit).filter(Unit.id == user.unit_id).first()
@@ -3162,8 +4047,8 @@ async def get_user(user_id: str, db: Session = Depends(get_db)):
     return result
 
 @app.put("/api/users/{user_id}")
-async def update_user(user_id: str, data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    user = db.query(User).filter((User.id == user_id) | (User.username == user_id)).first()
+def update_user(user_id: str, data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    user = db.execute(_STMT_USER_BY_ID_OR_USERNAME, {"key": user_id}).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -3239,23 +4124,26 @@ async def update_user(user_id: str, data: dict = Body(...), authorization: Optio
 
     if "password" in data and data.get("password"):
         user.password_hash = hash_password(data.get("password"))
+
+    # Special handling for language in data (same commit as the other fields)
+    language = None
+    if "language" in data:
+        language = data["language"].strip().lower()
+        user_extra = dict(user.data or {})
+        user_extra["language"] = language
+        user.data = user_extra
     
     db.commit()
     db.refresh(user)
+    if language is not None:
+        update_session_language(user.id, language)
     
-    # Special handling for language in data
-    if "language" in data:
-        user_extra = user.data or {}
-        user_extra["language"] = data["language"].strip().lower()
-        user.data = user_extra
-        db.commit()
-        update_session_language(user.id, user_extra["language"])
-    
+    _invalidate_user_cache(user.id)
     log_audit("update_user", current_user_id, {"user_id": user.id})
-    return {"status": "success", "user": {k: v for k, v in user.__dict__.items() if k != "password_hash" and not k.startswith("_")}}
+    return {"status": "success", "user": _user_public_dict(user)}
 
 @app.put("/api/users/{user_id}/change-password")
-async def change_user_password_admin(user_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
+def change_user_password_admin(user_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
     new_password = data.get("new_password", "").strip()
     if not new_password or len(new_password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
@@ -3266,13 +4154,14 @@ async def change_user_password_admin(user_id: str, data: dict = Body(...), db: S
     
     user.password_hash = hash_password(new_password)
     db.commit()
+    _invalidate_user_cache(user.id)
     
     log_audit("admin_change_password", "system", {"user_id": user_id})
     return {"status": "success", "message": "Password changed"}
 
 @app.delete("/api/users/{user_id}")
-async def delete_user(user_id: str, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
-    user_to_delete = db.query(User).filter((User.id == user_id) | (User.username == user_id)).first()
+def delete_user(user_id: str, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    user_to_delete = db.execute(_STMT_USER_BY_ID_OR_USERNAME, {"key": user_id}).scalars().first()
     if not user_to_delete:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -3284,8 +4173,10 @@ async def delete_user(user_id: str, authorization: Optional[str] = Header(None),
     except:
         pass
 
+    deleted_id = user_to_delete.id
     db.delete(user_to_delete)
     db.commit()
+    _invalidate_user_cache(deleted_id)
     
     log_audit("delete_user", current_user_id, {"user_id": user_id})
     return {"status": "success", "message": "User deleted"}
@@ -3294,7 +4185,7 @@ async def delete_user(user_id: str, authorization: Optional[str] = Header(None),
 # Pending registration endpoints
 # -------------------------
 @app.post("/api/register_user")
-async def register_user(data: dict = Body(...), db: Session = Depends(get_db)):
+def register_user(data: dict = Body(...), db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     password = data.get("password")
     unit = data.get("unit") or data.get("device") or None
@@ -3324,15 +4215,15 @@ async def register_user(data: dict = Body(...), db: Session = Depends(get_db)):
         db.commit()
 
     # Check if user already exists
-    if db.query(User).filter(User.username == username).first():
+    if db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first():
         raise HTTPException(status_code=400, detail="Username already exists")
         
     # Check if registration already pending
-    if db.query(PendingRegistration).filter(PendingRegistration.username == username).first():
+    if db.execute(_STMT_PENDING_BY_USERNAME, {"username": username}).scalars().first():
         raise HTTPException(status_code=400, detail="Registration already pending")
 
     registration = PendingRegistration(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         token=str(uuid.uuid4()),
         username=username,
         password_hash=hash_password(password),
@@ -3359,28 +4250,31 @@ async def register_user(data: dict = Body(...), db: Session = Depends(get_db)):
 
 @app.get("/api/pending_registrations")
 def get_pending_registrations(db: Session = Depends(get_db)):
-    pending = db.query(PendingRegistration).all()
-    out = []
-    for p in pending:
-        d = dict(p.data or {})
-        d.update({
+    pending = db.query(
+        PendingRegistration.id, PendingRegistration.username, PendingRegistration.email,
+        PendingRegistration.fullname, PendingRegistration.callsign, PendingRegistration.data,
+        PendingRegistration.created_at,
+    ).all()
+    # One dict per row: extra data first, the column fields override it
+    return [
+        {
+            **(p.data or {}),
             "id": p.id,
             "username": p.username,
             "email": p.email,
             "fullname": p.fullname,
             "callsign": p.callsign,
             "created_at": p.created_at.isoformat()
-        })
-        out.append(d)
-    return out
+        } for p in pending
+    ]
 
 @app.post("/api/approve_registration")
-async def approve_registration(data: dict = Body(...), db: Session = Depends(get_db)):
+def approve_registration(data: dict = Body(...), db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     if not username:
         raise HTTPException(status_code=400, detail="username required")
     
-    reg = db.query(PendingRegistration).filter(PendingRegistration.username == username).first()
+    reg = db.execute(_STMT_PENDING_BY_USERNAME, {"username": username}).scalars().first()
     if not reg:
         raise HTTPException(status_code=404, detail="Registration not found")
     
@@ -3396,8 +4290,18 @@ async def approve_registration(data: dict = Body(...), db: Session = Depends(get
         general = db.query(Unit).filter(Unit.name == "General").first()
         unit_id = general.id if general else None
         unit_name = "General" if general else unit_name
+
+    # Auto-sync the new user to the OpenTAK management API if configured.
+    # A dedicated TAK password is generated and stored so the user can
+    # retrieve it later from the TAK login page.
+    # Always generate a TAK password so every user gets TAK credentials,
+    # regardless of whether the management API is configured.
+    tak_password = _generate_tak_password()
+    new_user_id = new_id()
+    new_username = reg.username
+    new_callsign = reg.callsign
     new_user = User(
-        id=str(uuid.uuid4()),
+        id=new_user_id,
         username=reg.username,
         password_hash=reg.password_hash,
         unit=unit_name,
@@ -3414,46 +4318,35 @@ async def approve_registration(data: dict = Body(...), db: Session = Depends(get
         tak_team=reg_data.get("tak_team") or "Cyan",
         tak_role=reg_data.get("tak_role") or "Team Member",
         tak_display_type=reg_data.get("tak_display_type") or "General Ground Unit",
-        data={"legacy_id": reg.id}
+        data={"legacy_id": reg.id, "tak_server_password": tak_password}
     )
+    # One INSERT + DELETE in a single commit; the response only needs values
+    # already known here, so the expired instance is never reloaded.
     db.add(new_user)
     db.delete(reg)
     db.commit()
-    db.refresh(new_user)
 
-    # Auto-sync the new user to the OpenTAK management API if configured.
-    # A dedicated TAK password is generated and stored so the user can
-    # retrieve it later from the TAK login page.
-    # Always generate a TAK password so every user gets TAK credentials,
-    # regardless of whether the management API is configured.
-    tak_password = _generate_tak_password()
-    user_data = dict(new_user.data or {})
-    user_data["tak_server_password"] = tak_password
-    new_user.data = user_data
-    flag_modified(new_user, "data")
-    db.commit()
-
-    tak_sync_result = _sync_user_to_tak_server(new_user.username, tak_password)
+    tak_sync_result = _sync_user_to_tak_server(new_username, tak_password)
 
     # Also add an entry to the tak_logins JSON list so the admin
     # TAK login panel displays the user alongside manual entries.
-    _add_tak_login_entry(new_user.username, tak_password, callsign=new_user.callsign, unit=new_user.unit)
+    _add_tak_login_entry(new_username, tak_password, callsign=new_callsign, unit=unit_name)
 
-    log_audit("approve_registration", "system", {"username": username, "user_id": new_user.id})
+    log_audit("approve_registration", "system", {"username": username, "user_id": new_user_id})
     return {
         "status": "success",
         "message": "User approved and created",
-        "user_id": new_user.id,
+        "user_id": new_user_id,
         "tak_sync": tak_sync_result,
     }
 
 @app.post("/api/reject_registration")
-async def reject_registration(data: dict = Body(...), db: Session = Depends(get_db)):
+def reject_registration(data: dict = Body(...), db: Session = Depends(get_db)):
     username = (data.get("username") or "").strip()
     if not username:
         raise HTTPException(status_code=400, detail="username required")
     
-    reg = db.query(PendingRegistration).filter(PendingRegistration.username == username).first()
+    reg = db.execute(_STMT_PENDING_BY_USERNAME, {"username": username}).scalars().first()
     if reg:
         db.delete(reg)
         db.commit()
@@ -3472,7 +4365,7 @@ def api_list_sessions():
 # Groups, QR, Missions, Map Markers, Meshtastic
 # -------------------------
 @app.get("/api/groups")
-async def get_groups(db: Session = Depends(get_db)):
+def get_groups(db: Session = Depends(get_db)):
     groups = db.query(UserGroup).all()
     return [
         {
@@ -3485,7 +4378,7 @@ async def get_groups(db: Session = Depends(get_db)):
     ]
 
 @app.post("/api/groups")
-async def create_group(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
+def create_group(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     # Get current user for audit logging
     username = "system"
     if authorization:
@@ -3506,7 +4399,7 @@ async def create_group(data: dict = Body(...), authorization: Optional[str] = He
         raise HTTPException(status_code=400, detail="Group name already exists")
 
     new_group = UserGroup(
-        id=str(uuid.uuid4()),
+        id=new_id(),
         name=name,
         description=description,
         data={
@@ -3530,7 +4423,7 @@ async def create_group(data: dict = Body(...), authorization: Optional[str] = He
     }
 
 @app.delete("/api/groups/{group_id}")
-async def delete_group(group_id: str, db: Session = Depends(get_db)):
+def delete_group(group_id: str, db: Session = Depends(get_db)):
     group = db.query(UserGroup).filter(UserGroup.id == group_id).first()
     if not group:
          raise HTTPException(status_code=404, detail="Group not found")
@@ -3551,10 +4444,12 @@ def update_unit_status(unit_id: str = Path(...), new_status: str = Path(...), au
     
     # Update status with history in the 'data' JSON field
     ts = datetime.now(timezone.utc).isoformat()
-    current_data = user.data if user.data else {}
+    # Copy dict and list so the JSON column sees a new value and is persisted
+    current_data = dict(user.data) if user.data else {}
     
     if "history" not in current_data or not isinstance(current_data["history"], list):
         current_data["history"] = []
+    current_data["history"] = list(current_data["history"])
     
     current_data["history"].append({
         "status": new_status,
@@ -3569,14 +4464,18 @@ def update_unit_status(unit_id: str = Path(...), new_status: str = Path(...), au
     
     # Also update map_marker if exists
     unit_identifier = user.device or user.callsign or user.username
-    markers = db.query(MapMarker).filter(MapMarker.created_by == "import_meshtastic").all()
-    marker = None
-    for m in markers:
-        if isinstance(m.data, dict) and str(m.data.get("unit_id", "")) == str(unit_identifier):
-            marker = m
-            break
+    # Matches ix_map_markers_created_by_unit_id; numeric node ids may be stored
+    # as JSON numbers, so compare against both forms.
+    unit_keys = [str(unit_identifier)]
+    if unit_keys[0].isdigit():
+        unit_keys.append(int(unit_keys[0]))
+    marker = db.query(MapMarker).filter(
+        MapMarker.created_by == "import_meshtastic",
+        sa_func.json_extract(MapMarker.data, literal_column("'$.unit_id'")).in_(unit_keys),
+    ).first()
     if marker:
-        marker_data = marker.data if marker.data else {}
+        # Copy so SQLAlchemy sees a new JSON value and persists the change
+        marker_data = dict(marker.data or {})
         marker_data["status"] = new_status
         marker_data["timestamp"] = ts
         marker.data = marker_data
@@ -3602,34 +4501,82 @@ def update_unit_status(unit_id: str = Path(...), new_status: str = Path(...), au
     return {"status": "success", "user_id": user.id, "new_status": new_status}
 
 # Missions: list, create
+_MISSION_LIST_COLUMNS = (Mission.id, Mission.name, Mission.description, Mission.status,
+                         Mission.created_at, Mission.data)
+
+def _mission_list_item(row) -> Dict[str, Any]:
+    # Mapping from DB to legacy format
+    mission_id, name, description, status, created_at, data = row
+    return {
+        "id": mission_id,
+        "objective": name or (data.get("objective") if data else None),
+        "description": description,
+        "status": status,
+        "created_at": created_at,
+        "data": data,
+        # Flatten some fields from data for legacy frontend if needed
+        "location": (data.get("location") if data else None),
+        "date": (data.get("date") if data else None),
+        "involved_units": (data.get("involved_units") if data else [])
+    }
+
 @app.get("/api/missions")
 def get_missions():
     # missions.read is available to all roles (guest+)
-    db = SessionLocal()
-    try:
-        missions = db.query(Mission).all()
-        # Convert to list for response, handling mapping from DB to legacy format
-        return [
-            {
-                "id": m.id,
-                "objective": m.name or (m.data.get("objective") if m.data else None),
-                "description": m.description,
-                "status": m.status,
-                "created_at": m.created_at.isoformat() if m.created_at else None,
-                "data": m.data,
-                # Flatten some fields from data for legacy frontend if needed
-                "location": (m.data.get("location") if m.data else None),
-                "date": (m.data.get("date") if m.data else None),
-                "involved_units": (m.data.get("involved_units") if m.data else [])
-            } for m in missions
-        ]
-    finally:
-        db.close()
+    # Column rows unpacked as tuples (no ORM instances), streamed like the
+    # marker/drawing/overlay lists
+    return _json_array_response(select(*_MISSION_LIST_COLUMNS), _mission_list_item)
+
+# add_mission snapshots every user into the mission.  The snapshot is cached and
+# rebuilt only after a committed User write bumps _USERS_VERSION.  Mission
+# details are cached the same way against _MISSIONS_VERSION.  The commit hooks
+# run on many request threads, so the bumps are taken under _VERSIONS_LOCK.
+_VERSIONS_LOCK = threading.Lock()
+_USERS_VERSION = 0
+_USERS_SNAPSHOT: Tuple[int, List[Dict]] = (-1, [])
+_MISSIONS_VERSION = 0
+_MISSION_DETAILS_CACHE: Dict[str, Tuple[int, Dict]] = {}
+_MISSION_DETAILS_CACHE_MAX = 2048
+
+@sa_event.listens_for(SessionLocal, "after_flush")
+def _collect_user_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            session.info["users_changed"] = True
+        elif isinstance(obj, Mission):
+            session.info["missions_changed"] = True
+
+@sa_event.listens_for(SessionLocal, "after_commit")
+def _bump_users_version(session):
+    global _USERS_VERSION, _MISSIONS_VERSION
+    users_changed = session.info.pop("users_changed", False)
+    missions_changed = session.info.pop("missions_changed", False)
+    if users_changed or missions_changed:
+        with _VERSIONS_LOCK:
+            if users_changed:
+                _USERS_VERSION += 1
+            if missions_changed:
+                _MISSIONS_VERSION += 1
+
+@sa_event.listens_for(SessionLocal, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("users_changed", None)
+    session.info.pop("missions_changed", None)
+
+def _involved_units_snapshot(db: Session) -> List[Dict]:
+    """[{name, role, is_active}] for every user, from cache while no user has changed."""
+    global _USERS_SNAPSHOT
+    version = _USERS_VERSION
+    cached_version, units = _USERS_SNAPSHOT
+    if cached_version != version:
+        rows = db.execute(select(User.username, User.role, User.is_active)).all()
+        units = [{"name": name, "role": role, "is_active": active} for name, role, active in rows]
+        _USERS_SNAPSHOT = (version, units)
+    return list(units)
 
 @app.post("/api/add_mission")
-def add_mission(data: dict = Body(...), authorization: Optional[str] = Header(None)):
+def add_mission(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     # Permission system removed - all authenticated users can create missions
-    db = SessionLocal()
     try:
         current_username = "system"
         try:
@@ -3639,41 +4586,33 @@ def add_mission(data: dict = Body(...), authorization: Optional[str] = Header(No
         except: pass
 
         # Snapshot units from database instead of JSON
-        users = db.query(User).all()
-        involved_units = []
-        for u in users:
-            # We don't have a status field in User model yet? Let's check.
-            # From models.py: User(id, username, password_hash, role, is_active, created_at)
-            # Legacy used: name, device, status, timestamp
-            involved_units.append({
-                "name": u.username,
-                "role": u.role,
-                "is_active": u.is_active
-            })
+        involved_units = _involved_units_snapshot(db)
         
-        # Merge all data into the JSON field
-        extra_data = dict(data)
-        extra_data["involved_units"] = involved_units
-        extra_data["created_by"] = current_username
+        # Merge all data into the JSON field; the request body is not shared,
+        # so it is stored as-is rather than copied
+        data["involved_units"] = involved_units
+        data["created_by"] = current_username
 
         new_mission = Mission(
             name=data.get("objective") or data.get("name") or "New Mission",
             description=data.get("description") or data.get("objective"),
             status="ONGOING",
-            data=extra_data
+            data=data
         )
         db.add(new_mission)
+        db.flush()
+        mission_id = new_mission.id
+        mission_name = new_mission.name
         db.commit()
-        db.refresh(new_mission)
 
-        log_audit("create_mission", current_username, {"mission_id": new_mission.id})
+        log_audit("create_mission", current_username, {"mission_id": mission_id})
         
         return {
             "status": "success", 
             "mission": {
-                "id": new_mission.id,
-                "objective": new_mission.name,
-                "status": new_mission.status,
+                "id": mission_id,
+                "objective": mission_name,
+                "status": "ONGOING",
                 "involved_units": involved_units
             }
         }
@@ -3681,37 +4620,38 @@ def add_mission(data: dict = Body(...), authorization: Optional[str] = Header(No
         db.rollback()
         logger.error(f"Error adding mission: {e}")
         raise HTTPException(status_code=500, detail="Failed to add mission")
-    finally:
-        db.close()
 
 @app.get("/api/mission_details/{mission_id}")
-def api_mission_details(mission_id: str = Path(...)):
-    db = SessionLocal()
-    try:
-        mission = db.query(Mission).filter(Mission.id == mission_id).first()
-        if not mission:
-            raise HTTPException(status_code=404, detail="Mission not found")
-        
-        # Map back to legacy format for frontend
-        m_dict = {
-            "id": mission.id,
-            "objective": mission.name or (mission.data.get("objective") if mission.data else None),
-            "description": mission.description,
-            "status": mission.status,
-            "created_at": mission.created_at.isoformat() if mission.created_at else None,
-            "data": mission.data
-        }
-        if mission.data:
-            m_dict.update(mission.data)
-            
-        return m_dict
-    finally:
-        db.close()
+def api_mission_details(mission_id: str = Path(...), db: Session = Depends(get_db)):
+    version = _MISSIONS_VERSION
+    cached = _MISSION_DETAILS_CACHE.get(mission_id)
+    if cached is not None and cached[0] == version:
+        return FastJSONResponse(cached[1])
+
+    mission = db.query(Mission).filter(Mission.id == mission_id).first()
+    if not mission:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    
+    # Map back to legacy format for frontend
+    m_dict = {
+        "id": mission.id,
+        "objective": mission.name or (mission.data.get("objective") if mission.data else None),
+        "description": mission.description,
+        "status": mission.status,
+        "created_at": mission.created_at.isoformat() if mission.created_at else None,
+        "data": mission.data
+    }
+    if mission.data:
+        m_dict.update(mission.data)
+
+    if len(_MISSION_DETAILS_CACHE) >= _MISSION_DETAILS_CACHE_MAX:
+        _MISSION_DETAILS_CACHE.clear()
+    _MISSION_DETAILS_CACHE[mission_id] = (version, m_dict)
+    return FastJSONResponse(m_dict)
 
 @app.post("/api/mission_complete/{mission_id}/{result}")
-def api_mission_complete(mission_id: str = Path(...), result: str = Path(...), authorization: Optional[str] = Header(None)):
+def api_mission_complete(mission_id: str = Path(...), result: str = Path(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     result_norm = (result or "").upper()
-    db = SessionLocal()
     try:
         mission = db.query(Mission).filter(Mission.id == mission_id).first()
         if not mission:
@@ -3720,9 +4660,7 @@ def api_mission_complete(mission_id: str = Path(...), result: str = Path(...), a
         mission.status = result_norm
         # Update extra data if it exists
         if mission.data:
-            new_data = dict(mission.data)
-            new_data["completed_at"] = datetime.now(timezone.utc).isoformat()
-            mission.data = new_data
+            mission.data["completed_at"] = datetime.now(timezone.utc).isoformat()
             flag_modified(mission, "data")
             
         db.commit()
@@ -3732,12 +4670,9 @@ def api_mission_complete(mission_id: str = Path(...), result: str = Path(...), a
         db.rollback()
         logger.error(f"Error completing mission: {e}")
         raise HTTPException(status_code=500, detail="Failed to update mission")
-    finally:
-        db.close()
 
 @app.delete("/api/missions/{mission_id}")
-def api_delete_mission(mission_id: str = Path(...), authorization: Optional[str] = Header(None)):
-    db = SessionLocal()
+def api_delete_mission(mission_id: str = Path(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     try:
         mission = db.query(Mission).filter(Mission.id == mission_id).first()
         if not mission:
@@ -3753,8 +4688,6 @@ def api_delete_mission(mission_id: str = Path(...), authorization: Optional[str]
         db.rollback()
         logger.error(f"Error deleting mission: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete mission")
-    finally:
-        db.close()
 
 @app.patch("/api/missions/{mission_id}")
 def api_update_mission(mission_id: str = Path(...), data: dict = Body(...), authorization: Optional[str] = Header(None)):
@@ -3865,6 +4798,38 @@ def api_get_mission_attachments(mission_id: str = Path(...)):
         db.close()
 
 
+# Unit stats of finished missions, keyed by (mission_id, status, completed_at).
+# The time window of a completed mission is closed, so its stats never change.
+_MISSION_STATS_CACHE: Dict[Tuple[str, str, str], List[Dict]] = {}
+_MISSION_STATS_CACHE_MAX = 256
+_MISSION_STATS_LOCK = threading.Lock()
+
+def _parse_history_time(t) -> Optional[datetime]:
+    """Timezone-aware datetime from a history/mission timestamp, or None."""
+    if not t: return None
+    # ISO strings are the common case (history entries are written with isoformat())
+    if isinstance(t, str):
+        try:
+            dt = datetime.fromisoformat(t[:-1] + "+00:00" if t.endswith("Z") else t)
+        except ValueError:
+            return None
+        return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+    if isinstance(t, datetime):
+        # Ensure timezone-aware
+        if t.tzinfo is None:
+            return t.replace(tzinfo=timezone.utc)
+        return t
+    if isinstance(t, (int, float)):
+        dt = datetime.fromtimestamp(t if t < 1e12 else t / 1000, tz=timezone.utc)
+        return dt
+    try:
+        dt = datetime.fromisoformat(str(t).replace('Z', '+00:00'))
+        # Ensure timezone-aware
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        return dt
+    except: return None
+
 @app.get("/api/mission_unit_stats/{mission_id}")
 def api_mission_unit_stats(mission_id: str = Path(...), db: Session = Depends(get_db)):
     """
@@ -3875,35 +4840,31 @@ def api_mission_unit_stats(mission_id: str = Path(...), db: Session = Depends(ge
     if not mission:
         return {"status": "error", "message": "Mission not found", "unit_stats": []}
     
+    parse_time = _parse_history_time
+
     # Get mission time window
-    def parse_time(t):
-        if not t: return None
-        if isinstance(t, datetime):
-            # Ensure timezone-aware
-            if t.tzinfo is None:
-                return t.replace(tzinfo=timezone.utc)
-            return t
-        if isinstance(t, (int, float)):
-            dt = datetime.fromtimestamp(t if t < 1e12 else t / 1000, tz=timezone.utc)
-            return dt
-        try:
-            dt = datetime.fromisoformat(str(t).replace('Z', '+00:00'))
-            # Ensure timezone-aware
-            if dt.tzinfo is None:
-                return dt.replace(tzinfo=timezone.utc)
-            return dt
-        except: return None
-    
+    completed_at = mission.data.get("completed_at") if mission.data else None
+    cache_key = None
+    if completed_at and mission.status != "ONGOING":
+        cache_key = (mission.id, mission.status, str(completed_at))
+        with _MISSION_STATS_LOCK:
+            cached = _MISSION_STATS_CACHE.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse({"status": "success", "mission_id": mission_id, "unit_stats": cached})
+
     start_dt = parse_time(mission.data.get("start_time") if mission.data else None) or parse_time(mission.created_at)
-    end_dt = parse_time(mission.data.get("completed_at") if mission.data else None) or datetime.now(timezone.utc)
+    end_dt = parse_time(completed_at) or datetime.now(timezone.utc)
     
-    # Load users from DB
-    users = db.query(User).all()
+    # One query over all users with a non-empty data.history array; only the
+    # history array is extracted, not the whole data blob
+    users = db.execute(
+        select(User.username, User.fullname, User.device, User.data["history"])
+        .where(sa_func.json_array_length(User.data, "$.history") > 0)
+    ).all()
     unit_stats = []
     
-    for user in users:
+    for username, fullname, device, history in users:
         # History is stored in user.data.history
-        history = (user.data or {}).get("history", [])
         if not isinstance(history, list) or len(history) == 0:
             continue
         
@@ -3918,7 +4879,7 @@ def api_mission_unit_stats(mission_id: str = Path(...), db: Session = Depends(ge
             continue
             
         # Sort by parsed timestamp (already parsed, no redundant parsing)
-        filtered_history.sort(key=lambda x: x[0])
+        filtered_history.sort(key=itemgetter(0))
         
         # Extract just the entry dictionaries after sorting
         sorted_entries = [entry for _, entry in filtered_history]
@@ -3930,87 +4891,90 @@ def api_mission_unit_stats(mission_id: str = Path(...), db: Session = Depends(ge
         # Calculate total_changes (count of status changes)
         total_changes = len(sorted_entries)
         
-        # Calculate durations for each status (time spent in each status in seconds)
-        # Use the filtered_history list which contains (timestamp, entry) tuples for efficiency
-        durations = {}
-        for i in range(len(filtered_history)):
-            current_time, current_entry = filtered_history[i]
+        # Calculate durations for each status (time spent in each status in seconds):
+        # each entry lasts until the next status change, the last one until mission end
+        durations = Counter()
+        next_times = [t for t, _ in filtered_history[1:]]
+        next_times.append(end_dt)
+        for (current_time, current_entry), next_time in zip(filtered_history, next_times):
             current_status = current_entry.get("status")
-            
-            if not current_status:
-                continue
-                
-            # Calculate duration until next status change or end of mission
-            if i < len(filtered_history) - 1:
-                next_time, _ = filtered_history[i + 1]
-                duration = (next_time - current_time).total_seconds()
-            else:
-                # Last entry - calculate duration until mission end
-                duration = (end_dt - current_time).total_seconds()
-            
-            # Add duration to the status
-            if current_status in durations:
-                durations[current_status] += duration
-            else:
-                durations[current_status] = duration
+            if current_status:
+                durations[current_status] += (next_time - current_time).total_seconds()
         
         # Build the unit stats object with the expected structure
         unit_stats.append({
-            "name": user.fullname or user.username,
-            "device": user.device or user.username,
+            "name": fullname or username,
+            "device": device or username,
             "first_status": first_status,
             "last_status": last_status,
             "total_changes": total_changes,
-            "durations": durations,
+            "durations": dict(durations),
             "history": sorted_entries
         })
             
-    return {"status": "success", "mission_id": mission_id, "unit_stats": unit_stats}
+    if cache_key is not None:
+        with _MISSION_STATS_LOCK:
+            if len(_MISSION_STATS_CACHE) >= _MISSION_STATS_CACHE_MAX:
+                _MISSION_STATS_CACHE.pop(next(iter(_MISSION_STATS_CACHE)))
+            _MISSION_STATS_CACHE[cache_key] = unit_stats
+    return FastJSONResponse({"status": "success", "mission_id": mission_id, "unit_stats": unit_stats})
 
 # Map markers
+def _merge_json_field(obj, attr: str, updates: Dict[str, Any]) -> bool:
+    """Merge *updates* into the JSON dict column *attr* of *obj* in place.
+
+    The column is flagged only when a value actually changes, so re-saving
+    identical state leaves the instance unmodified.  Returns True on change.
+    """
+    current = getattr(obj, attr)
+    if not isinstance(current, dict):
+        setattr(obj, attr, dict(updates))
+        return True
+    if all(key in current and current[key] == value for key, value in updates.items()):
+        return False
+    current.update(updates)
+    flag_modified(obj, attr)
+    return True
+
+# List endpoints select plain columns (no ORM instances or identity-map
+# bookkeeping) and zip each row with a precomputed key tuple.
+_MARKER_LIST_KEYS = ("id", "lat", "lng", "name", "description", "type", "color",
+                     "icon", "created_by", "created_at", "data")
+_MARKER_LIST_COLUMNS = tuple(getattr(MapMarker, key) for key in _MARKER_LIST_KEYS)
+_SHORT_NAME_MARKER_TYPES = frozenset({"meshtastic_node", "node", "gateway", "gps_position"})
+
+def _marker_list_item(row) -> Dict[str, Any]:
+    item = dict(zip(_MARKER_LIST_KEYS, row))
+    m_type, m_name = item["type"], item["name"]
+    item["shortName"] = (
+        (item["data"] or {}).get("shortName")
+        or (m_name[:4] if m_name else None)
+        if m_type in _SHORT_NAME_MARKER_TYPES
+        else None
+    )
+    item["symbolLink"] = (
+        CoTProtocolHandler.get_symbol_link(m_type)
+        if AUTONOMOUS_MODULES_AVAILABLE else None
+    )
+    return item
+
 @app.get("/api/map_markers")
 def get_map_markers():
     # markers.read is available to all roles (guest+)
-    db = SessionLocal()
-    try:
-        markers = db.query(MapMarker).all()
-        # Convert to dict list for JSON response, excluding meshtastic-synced markers
-        # (those are rendered exclusively via /api/meshtastic/nodes → updateMeshtasticNodes).
-        # Mesh nodes imported via ATAK/WinTAK CoT (type "node", created_by tak_server/
-        # cot_ingest) are included here with their correct "node" type so that admin_map
-        # and other API consumers can display them; the tactical web UI skips them in
-        # loadMarkers() (isMeshtasticMarker) and renders them via updateMeshtasticNodes().
-        return [
-            {
-                "id": m.id,
-                "lat": m.lat,
-                "lng": m.lng,
-                "name": m.name,
-                "description": m.description,
-                "type": m.type,
-                "color": m.color,
-                "icon": m.icon,
-                "created_by": m.created_by,
-                "created_at": m.created_at.isoformat() if m.created_at else None,
-                "data": m.data,
-                "shortName": (
-                    (m.data or {}).get("shortName")
-                    or (m.name[:4] if m.name else None)
-                    if m.type in {"meshtastic_node", "node", "gateway", "gps_position"}
-                    else None
-                ),
-                "symbolLink": (
-                    CoTProtocolHandler.get_symbol_link(m.type)
-                    if AUTONOMOUS_MODULES_AVAILABLE else None
-                ),
-            } for m in markers
-            if not m.created_by or m.created_by not in _MESHTASTIC_CREATED_BY
-        ]
-    finally:
-        db.close()
+    # Streamed as a JSON array, excluding meshtastic-synced markers in SQL
+    # (those are rendered exclusively via /api/meshtastic/nodes → updateMeshtasticNodes).
+    # Mesh nodes imported via ATAK/WinTAK CoT (type "node", created_by tak_server/
+    # cot_ingest) are included here with their correct "node" type so that admin_map
+    # and other API consumers can display them; the tactical web UI skips them in
+    # loadMarkers() (isMeshtasticMarker) and renders them via updateMeshtasticNodes().
+    stmt = select(*_MARKER_LIST_COLUMNS).where(
+        MapMarker.created_by.is_(None)
+        | MapMarker.created_by.notin_(_MESHTASTIC_CREATED_BY)
+    )
+    return _json_array_response(stmt, _marker_list_item)
 
 @app.post("/api/map_markers")
-def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Header(None)):
+def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     # Permission system removed - all authenticated users can create markers
     # Get current user for audit logging
     current_username = "system"
@@ -4024,7 +4988,6 @@ def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Hea
     if lat is None or lng is None or not name:
         raise HTTPException(status_code=400, detail="Latitude, longitude, and name required")
         
-    db = SessionLocal()
     try:
         new_marker = MapMarker(
             lat=float(lat),
@@ -4038,10 +5001,10 @@ def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Hea
             data=data  # Store full data payload in JSON field as well
         )
         db.add(new_marker)
-        db.commit()
-        db.refresh(new_marker)
-        
-        log_audit("create_marker", current_username, {"marker_id": new_marker.id})
+        # The flush fills id and created_at (Python-side defaults), so the dict
+        # is built before commit and the expired instance is never reloaded.
+        db.flush()
+        marker_id = new_marker.id
         
         # Format for broadcast
         marker_dict = {
@@ -4058,9 +5021,14 @@ def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Hea
             "timestamp": new_marker.created_at.isoformat() if new_marker.created_at else datetime.now(timezone.utc).isoformat(),
             "data": new_marker.data
         }
+        db.commit()
+
+        log_audit("create_marker", current_username, {"marker_id": marker_id})
         
         # Broadcast marker update to all connected clients
-        broadcast_websocket_update("markers", "marker_created", marker_dict)
+        # Encoded once for both the broadcast frame and the HTTP response
+        marker_json = _json_dumps(marker_dict)
+        broadcast_websocket_update("markers", "marker_created", marker_dict, encoded_data=marker_json)
 
         # Forward to ATAK/TAK server if enabled
         if AUTONOMOUS_MODULES_AVAILABLE:
@@ -4070,29 +5038,27 @@ def create_map_marker(data: dict = Body(...), authorization: Optional[str] = Hea
                     cot_xml = cot_event.to_xml()
                     ok = forward_cot_to_tak(cot_xml)
                     if ok:
-                        logger.info("CoT forward on marker_created succeeded: marker_id=%s", new_marker.id)
+                        logger.info("CoT forward on marker_created succeeded: marker_id=%s", marker_id)
                     else:
-                        logger.debug("CoT forward on marker_created skipped (TAK forwarding disabled or not configured): marker_id=%s", new_marker.id)
+                        logger.debug("CoT forward on marker_created skipped (TAK forwarding disabled or not configured): marker_id=%s", marker_id)
                     mcast_ok = _forward_cot_multicast(cot_xml)
                     if mcast_ok:
-                        logger.debug("CoT SA Multicast send on marker_created succeeded: marker_id=%s", new_marker.id)
+                        logger.debug("CoT SA Multicast send on marker_created succeeded: marker_id=%s", marker_id)
                     tcp_ok = _forward_cot_to_tcp_clients(cot_xml)
                     if tcp_ok:
-                        logger.debug("CoT TCP push on marker_created reached %d client(s): marker_id=%s", tcp_ok, new_marker.id)
+                        logger.debug("CoT TCP push on marker_created reached %d client(s): marker_id=%s", tcp_ok, marker_id)
                     _forward_cot_to_itak_bridge(cot_xml)
             except Exception as _fwd_err:
                 logger.warning("CoT forward on marker_created failed: %s", _fwd_err)
 
-        return {"status": "success", "marker": marker_dict}
+        return _success_response("marker", marker_json)
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating marker: {e}")
         raise HTTPException(status_code=500, detail="Failed to create marker")
-    finally:
-        db.close()
 
 @app.put("/api/map_markers/{marker_id}")
-def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Optional[str] = Header(None)):
+def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     current_username = "system"
     try:
         payload = verify_token(authorization)
@@ -4100,7 +5066,6 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
             current_username = payload.get("username")
     except: pass
     
-    db = SessionLocal()
     try:
         marker = db.query(MapMarker).filter(MapMarker.id == marker_id).first()
         if not marker:
@@ -4115,9 +5080,7 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
         if "icon" in data: marker.icon = data["icon"]
         
         if "data" in data and isinstance(data["data"], dict):
-            current_extra = marker.data if marker.data else {}
-            current_extra.update(data["data"])
-            marker.data = current_extra
+            _merge_json_field(marker, "data", data["data"])
         elif "data" in data:
             marker.data = data["data"]
 
@@ -4125,10 +5088,14 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
         # that GET /api/map/symbols (which merges data into the response)
         # never returns a stale label after a rename.
         if "name" in data and isinstance(marker.data, dict):
-            marker.data = {**marker.data, "label": marker.name}
-            
-        db.commit()
-        db.refresh(marker)
+            _merge_json_field(marker, "data", {"label": marker.name})
+
+        # Clients re-save identical state; then there is nothing to write,
+        # audit, broadcast or forward to TAK.
+        changed = db.is_modified(marker)
+        if changed:
+            db.commit()
+            db.refresh(marker)
         
         marker_dict = {
             "id": marker.id,
@@ -4144,9 +5111,13 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
             "timestamp": marker.created_at.isoformat() if marker.created_at else datetime.now(timezone.utc).isoformat(),
             "data": marker.data
         }
+        if not changed:
+            return {"status": "success", "marker": marker_dict}
         
         log_audit("update_marker", current_username, {"marker_id": marker_id})
-        broadcast_websocket_update("markers", "marker_updated", marker_dict)
+        # Encoded once for both the broadcast frame and the HTTP response
+        marker_json = _json_dumps(marker_dict)
+        broadcast_websocket_update("markers", "marker_updated", marker_dict, encoded_data=marker_json)
 
         # Forward to ATAK/TAK server if enabled
         if AUTONOMOUS_MODULES_AVAILABLE:
@@ -4169,7 +5140,7 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
             except Exception as _fwd_err:
                 logger.warning("CoT forward on marker_updated failed: %s", _fwd_err)
 
-        return {"status": "success", "marker": marker_dict}
+        return _success_response("marker", marker_json)
 
     except HTTPException:
         raise
@@ -4177,11 +5148,9 @@ def update_map_marker(marker_id: str, data: dict = Body(...), authorization: Opt
         db.rollback()
         logger.error(f"Error updating marker: {e}")
         raise HTTPException(status_code=500, detail="Failed to update marker")
-    finally:
-        db.close()
 
 @app.delete("/api/map_markers/{marker_id}")
-def delete_map_marker(marker_id: str, authorization: Optional[str] = Header(None)):
+def delete_map_marker(marker_id: str, authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     current_username = "system"
     try:
         payload = verify_token(authorization)
@@ -4189,7 +5158,6 @@ def delete_map_marker(marker_id: str, authorization: Optional[str] = Header(None
             current_username = payload.get("username")
     except: pass
     
-    db = SessionLocal()
     try:
         marker = db.query(MapMarker).filter(MapMarker.id == marker_id).first()
         if not marker:
@@ -4249,39 +5217,27 @@ def delete_map_marker(marker_id: str, authorization: Optional[str] = Header(None
         db.rollback()
         logger.error(f"Error deleting marker: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete marker")
-    finally:
-        db.close()
 
 
 # -------------------------
 # Drawings API (for line/polygon drawings)
 # -------------------------
+_DRAWING_LIST_KEYS = ("id", "name", "type", "coordinates", "color", "weight",
+                      "created_by", "timestamp", "data")
+_DRAWING_LIST_COLUMNS = (Drawing.id, Drawing.name, Drawing.type, Drawing.coordinates, Drawing.color,
+                         Drawing.weight, Drawing.created_by, Drawing.created_at, Drawing.data)
+
+def _drawing_list_item(row) -> Dict[str, Any]:
+    return dict(zip(_DRAWING_LIST_KEYS, row))
+
 @app.get("/api/drawings")
 def get_drawings():
-    """Get all drawings (DB-backed)"""
-    db = SessionLocal()
-    try:
-        drawings = db.query(Drawing).all()
-        return [
-            {
-                "id": d.id,
-                "name": d.name,
-                "type": d.type,
-                "coordinates": d.coordinates,
-                "color": d.color,
-                "weight": d.weight,
-                "created_by": d.created_by,
-                "timestamp": d.created_at.isoformat() if d.created_at else None,
-                "data": d.data
-            } for d in drawings
-        ]
-    finally:
-        db.close()
+    """Get all drawings (DB-backed), streamed as a JSON array"""
+    return _json_array_response(select(*_DRAWING_LIST_COLUMNS), _drawing_list_item)
 
 @app.post("/api/drawings")
-def create_drawing(data: dict = Body(...)):
+def create_drawing(data: dict = Body(...), db: Session = Depends(get_db)):
     """Create a new drawing (DB-backed)"""
-    db = SessionLocal()
     try:
         drawing = Drawing(
             name=data.get("name", "Drawing"),
@@ -4293,9 +5249,8 @@ def create_drawing(data: dict = Body(...)):
             data=data
         )
         db.add(drawing)
-        db.commit()
-        db.refresh(drawing)
-        
+        # Build the response from the flushed instance before commit expires it
+        db.flush()
         drawing_dict = {
             "id": drawing.id,
             "name": drawing.name,
@@ -4306,21 +5261,20 @@ def create_drawing(data: dict = Body(...)):
             "created_by": drawing.created_by,
             "timestamp": drawing.created_at.isoformat()
         }
+        db.commit()
         
         # Broadcast to all clients
-        broadcast_websocket_update("drawings", "drawing_created", drawing_dict)
-        return {"status": "success", "drawing": drawing_dict}
+        drawing_json = _json_dumps(drawing_dict)
+        broadcast_websocket_update("drawings", "drawing_created", drawing_dict, encoded_data=drawing_json)
+        return _success_response("drawing", drawing_json)
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating drawing: {e}")
         raise HTTPException(status_code=500, detail="Failed to create drawing")
-    finally:
-        db.close()
 
 @app.put("/api/drawings/{drawing_id}")
-def update_drawing(drawing_id: str, data: dict = Body(...)):
+def update_drawing(drawing_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
     """Update an existing drawing (DB-backed)"""
-    db = SessionLocal()
     try:
         drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
         if not drawing:
@@ -4332,15 +5286,13 @@ def update_drawing(drawing_id: str, data: dict = Body(...)):
         if "name" in data: drawing.name = data["name"]
         if "type" in data: drawing.type = data["type"]
         
-        if drawing.data:
-            new_data = dict(drawing.data)
-            new_data.update(data)
-            drawing.data = new_data
-        else:
-            drawing.data = data
-            
-        db.commit()
-        db.refresh(drawing)
+        _merge_json_field(drawing, "data", data)
+
+        # Skip the write and broadcast when the client re-saved identical state
+        changed = db.is_modified(drawing)
+        if changed:
+            db.commit()
+            db.refresh(drawing)
         
         drawing_dict = {
             "id": drawing.id,
@@ -4354,19 +5306,18 @@ def update_drawing(drawing_id: str, data: dict = Body(...)):
         }
         
         # Broadcast to all clients
-        broadcast_websocket_update("drawings", "drawing_updated", drawing_dict)
-        return {"status": "success", "drawing": drawing_dict}
+        drawing_json = _json_dumps(drawing_dict)
+        if changed:
+            broadcast_websocket_update("drawings", "drawing_updated", drawing_dict, encoded_data=drawing_json)
+        return _success_response("drawing", drawing_json)
     except Exception as e:
         db.rollback()
         logger.error(f"Error updating drawing: {e}")
         raise HTTPException(status_code=500, detail="Failed to update drawing")
-    finally:
-        db.close()
 
 @app.delete("/api/drawings/{drawing_id}")
-def delete_drawing(drawing_id: str):
+def delete_drawing(drawing_id: str, db: Session = Depends(get_db)):
     """Delete a drawing (DB-backed)"""
-    db = SessionLocal()
     try:
         drawing = db.query(Drawing).filter(Drawing.id == drawing_id).first()
         if not drawing:
@@ -4379,38 +5330,26 @@ def delete_drawing(drawing_id: str):
         db.rollback()
         logger.error(f"Error deleting drawing: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete drawing")
-    finally:
-        db.close()
 
 # -------------------------
 # Overlays API (for image overlays)
 # -------------------------
+_OVERLAY_LIST_KEYS = ("id", "name", "imageUrl", "bounds", "opacity", "rotation",
+                      "created_by", "timestamp", "data")
+_OVERLAY_LIST_COLUMNS = (Overlay.id, Overlay.name, Overlay.image_url, Overlay.bounds, Overlay.opacity,
+                         Overlay.rotation, Overlay.created_by, Overlay.created_at, Overlay.data)
+
+def _overlay_list_item(row) -> Dict[str, Any]:
+    return dict(zip(_OVERLAY_LIST_KEYS, row))
+
 @app.get("/api/overlays")
 def get_overlays():
-    """Get all overlays (DB-backed)"""
-    db = SessionLocal()
-    try:
-        overlays = db.query(Overlay).all()
-        return [
-            {
-                "id": o.id,
-                "name": o.name,
-                "imageUrl": o.image_url,
-                "bounds": o.bounds,
-                "opacity": o.opacity,
-                "rotation": o.rotation,
-                "created_by": o.created_by,
-                "timestamp": o.created_at.isoformat() if o.created_at else None,
-                "data": o.data
-            } for o in overlays
-        ]
-    finally:
-        db.close()
+    """Get all overlays (DB-backed), streamed as a JSON array"""
+    return _json_array_response(select(*_OVERLAY_LIST_COLUMNS), _overlay_list_item)
 
 @app.post("/api/overlays")
-def create_overlay(data: dict = Body(...)):
+def create_overlay(data: dict = Body(...), db: Session = Depends(get_db)):
     """Create a new overlay (DB-backed)"""
-    db = SessionLocal()
     try:
         overlay = Overlay(
             name=data.get("name", "Overlay"),
@@ -4422,9 +5361,8 @@ def create_overlay(data: dict = Body(...)):
             data=data
         )
         db.add(overlay)
-        db.commit()
-        db.refresh(overlay)
-        
+        # Build the response from the flushed instance before commit expires it
+        db.flush()
         overlay_dict = {
             "id": overlay.id,
             "name": overlay.name,
@@ -4435,21 +5373,20 @@ def create_overlay(data: dict = Body(...)):
             "created_by": overlay.created_by,
             "timestamp": overlay.created_at.isoformat()
         }
+        db.commit()
         
-        broadcast_websocket_update("overlays", "overlay_created", overlay_dict)
-        logger.info("Overlay created: id=%s name=%r created_by=%r (TAK CoT sync not applicable for image overlays)", overlay.id, overlay.name, overlay.created_by)
-        return {"status": "success", "overlay": overlay_dict}
+        overlay_json = _json_dumps(overlay_dict)
+        broadcast_websocket_update("overlays", "overlay_created", overlay_dict, encoded_data=overlay_json)
+        logger.info("Overlay created: id=%s name=%r created_by=%r (TAK CoT sync not applicable for image overlays)", overlay_dict["id"], overlay_dict["name"], overlay_dict["created_by"])
+        return _success_response("overlay", overlay_json)
     except Exception as e:
         db.rollback()
         logger.error(f"Error creating overlay: {e}")
         raise HTTPException(status_code=500, detail="Failed to create overlay")
-    finally:
-        db.close()
 
 @app.put("/api/overlays/{overlay_id}")
-def update_overlay(overlay_id: str, data: dict = Body(...)):
+def update_overlay(overlay_id: str, data: dict = Body(...), db: Session = Depends(get_db)):
     """Update an existing overlay (DB-backed)"""
-    db = SessionLocal()
     try:
         overlay = db.query(Overlay).filter(Overlay.id == overlay_id).first()
         if not overlay:
@@ -4461,15 +5398,13 @@ def update_overlay(overlay_id: str, data: dict = Body(...)):
         if "opacity" in data: overlay.opacity = float(data["opacity"])
         if "rotation" in data: overlay.rotation = float(data["rotation"])
         
-        if overlay.data:
-            new_data = dict(overlay.data)
-            new_data.update(data)
-            overlay.data = new_data
-        else:
-            overlay.data = data
-            
-        db.commit()
-        db.refresh(overlay)
+        _merge_json_field(overlay, "data", data)
+
+        # Skip the write and broadcast when the client re-saved identical state
+        changed = db.is_modified(overlay)
+        if changed:
+            db.commit()
+            db.refresh(overlay)
         
         overlay_dict = {
             "id": overlay.id,
@@ -4482,20 +5417,19 @@ def update_overlay(overlay_id: str, data: dict = Body(...)):
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
         
-        broadcast_websocket_update("overlays", "overlay_updated", overlay_dict)
-        logger.info("Overlay updated: id=%s name=%r (TAK CoT sync not applicable for image overlays)", overlay_id, overlay_dict.get("name"))
-        return {"status": "success", "overlay": overlay_dict}
+        overlay_json = _json_dumps(overlay_dict)
+        if changed:
+            broadcast_websocket_update("overlays", "overlay_updated", overlay_dict, encoded_data=overlay_json)
+            logger.info("Overlay updated: id=%s name=%r (TAK CoT sync not applicable for image overlays)", overlay_id, overlay_dict.get("name"))
+        return _success_response("overlay", overlay_json)
     except Exception as e:
         db.rollback()
         logger.error(f"Error updating overlay: {e}")
         raise HTTPException(status_code=500, detail="Failed to update overlay")
-    finally:
-        db.close()
 
 @app.delete("/api/overlays/{overlay_id}")
-def delete_overlay(overlay_id: str):
+def delete_overlay(overlay_id: str, db: Session = Depends(get_db)):
     """Delete an overlay (DB-backed)"""
-    db = SessionLocal()
     try:
         overlay = db.query(Overlay).filter(Overlay.id == overlay_id).first()
         if not overlay:
@@ -4509,8 +5443,6 @@ def delete_overlay(overlay_id: str):
         db.rollback()
         logger.error(f"Error deleting overlay: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete overlay")
-    finally:
-        db.close()
 
 # -------------------------
 # Symbols API (for map symbols/icons)
@@ -4519,7 +5451,7 @@ def delete_overlay(overlay_id: str):
 def get_symbols(db: Session = Depends(get_db)):
     """Get all symbols (from unified MapMarker table)"""
     markers = db.query(MapMarker).filter(MapMarker.type == "legacy_symbol").all()
-    return [
+    return FastJSONResponse([
         {
             "id": m.id,
             "lat": m.lat,
@@ -4527,9 +5459,9 @@ def get_symbols(db: Session = Depends(get_db)):
             "symbolType": (m.data or {}).get("symbolType", "circle"),
             "name": m.name,
             "created_by": m.created_by,
-            "timestamp": m.created_at.isoformat()
+            "timestamp": m.created_at
         } for m in markers
-    ]
+    ])
 
 @app.post("/api/symbols")
 def create_symbol(data: dict = Body(...), db: Session = Depends(get_db)):
@@ -4605,14 +5537,77 @@ def delete_symbol(symbol_id: str, db: Session = Depends(get_db)):
 # -------------------------
 # Sync API (for cross-page synchronization)
 # -------------------------
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def _marker_sync_row(item: Dict[str, Any], now: datetime, created_by: str) -> Optional[Dict[str, Any]]:
+    # Items without an id cannot be matched on re-sync; they would insert a new row every time
+    if not item.get("id"):
+        return None
+    lat, lng = _float_or_none(item.get("lat")), _float_or_none(item.get("lng"))
+    if lat is None or lng is None:
+        return None
+    return {
+        "id": str(item["id"]),
+        "lat": lat,
+        "lng": lng,
+        "name": item.get("name") or item.get("callsign") or item.get("type", "marker"),
+        "description": item.get("description"),
+        "type": item.get("type", "friendly"),
+        "color": item.get("color", "#ff0000"),
+        "icon": item.get("icon", "default"),
+        "created_by": created_by,
+        "created_at": now,
+        "data": item,
+    }
+
+def _upsert_synced_markers(markers: List[Any], created_by: str) -> List[str]:
+    """Write client-synced markers to map_markers with one batched UPSERT.
+
+    Rows are matched on id; existing rows keep created_by/created_at.
+    Returns the ids written.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [row for row in (_marker_sync_row(m, now, created_by) for m in markers if isinstance(m, dict)) if row]
+    if not rows:
+        return []
+    table = MapMarker.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={key: stmt.excluded[key] for key in rows[0] if key not in ("id", "created_by", "created_at")},
+    )
+    db = SessionLocal()
+    try:
+        db.execute(stmt, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return [row["id"] for row in rows]
+
 @app.post("/api/sync/markers")
-async def sync_markers(data: dict = Body(...)):
+def sync_markers(data: dict = Body(...), authorization: Optional[str] = Header(None)):
     """Broadcast marker changes to all clients"""
     markers = data.get("markers", [])
     
-    # Save to database
+    # Save to database: the legacy JSON file, plus one batched UPSERT into
+    # map_markers for authenticated callers (created_by is the token's user)
     if markers:
         save_json("map_markers", markers)
+        payload = None
+        if authorization:
+            try:
+                payload = get_current_user(authorization)
+            except HTTPException:
+                payload = None
+        if payload and payload.get("username"):
+            _mark_broadcast_dirty("marker", _upsert_synced_markers(markers, payload["username"]))
     
     # Broadcast to all connected clients
     broadcast_websocket_update("markers", "markers_update", {"markers": markers})
@@ -4650,6 +5645,32 @@ async def sync_drawings(data: dict = Body(...)):
 # -------------------------
 # Unified Sync API for Auto-Synchronization
 # -------------------------
+# sync/upload list fields: (body field, JSON DB key, WebSocket channel)
+_SYNC_UPLOAD_LISTS = (
+    ("markers", "map_markers", "markers"),
+    ("drawings", "drawings", "drawings"),
+    ("overlays", "overlays", "overlays"),
+    ("symbols", "symbols", "symbols"),
+    ("messages", "meshtastic_messages", "messages"),
+)
+
+def _forward_sync_cot_events(cot_events: List[Any]) -> None:
+    """Forward the raw CoT XML of uploaded events to the TAK server (blocking)."""
+    for cot_event in cot_events:
+        # Forward raw CoT XML to TAK server if present
+        cot_xml = cot_event.get("xml") if isinstance(cot_event, dict) else None
+        if not cot_xml:
+            continue
+        cot_uid = cot_event.get("uid", "<unknown>")
+        try:
+            ok = forward_cot_to_tak(cot_xml)
+            if ok:
+                logger.info("CoT event forwarded to TAK server via sync_upload: uid=%s", cot_uid)
+            else:
+                logger.debug("CoT event forward skipped via sync_upload (TAK forwarding disabled or not configured): uid=%s", cot_uid)
+        except Exception as _fwd_err:
+            logger.warning("CoT event forward via sync_upload failed: uid=%s err=%s", cot_uid, _fwd_err)
+
 @app.post("/api/sync/upload")
 async def sync_upload(data: dict = Body(...), authorization: Optional[str] = Header(None)):
     """
@@ -4675,97 +5696,58 @@ async def sync_upload(data: dict = Body(...), authorization: Optional[str] = Hea
     try:
         timestamp = data.get("timestamp", datetime.now(timezone.utc).isoformat())
         
-        # Process and save each data type
+        # Process and save each data type.  The file writes are blocking, so
+        # they run in worker threads (in parallel, one file each) and the
+        # WebSocket broadcasts go out once everything is on disk.
+        loop = asyncio.get_running_loop()
         updates = {}
+        writes = []
+        broadcasts = []
+        for field, db_key, channel in _SYNC_UPLOAD_LISTS:
+            items = data.get(field)
+            if not isinstance(items, list):
+                continue
+            # Messages are added to the stored ones (keeping the newest
+            # MAX_STORED_MESSAGES); the other lists replace their file
+            if db_key == "meshtastic_messages":
+                writes.append(loop.run_in_executor(
+                    None, functools.partial(extend_json, db_key, items, MAX_STORED_MESSAGES)))
+            else:
+                writes.append(loop.run_in_executor(None, functools.partial(save_json, db_key, items)))
+            updates[field] = len(items)
+            broadcasts.append((channel, {
+                'type': f'{field}_update',
+                field: items,
+                'timestamp': timestamp
+            }))
         
-        # Markers
-        if "markers" in data and isinstance(data["markers"], list):
-            save_json("map_markers", data["markers"])
-            updates["markers"] = len(data["markers"])
-            # Broadcast to WebSocket clients
-            if websocket_manager:
-                await websocket_manager.publish_to_channel('markers', {
-                    'type': 'markers_update',
-                    'markers': data["markers"],
-                    'timestamp': timestamp
-                })
-        
-        # Drawings
-        if "drawings" in data and isinstance(data["drawings"], list):
-            save_json("drawings", data["drawings"])
-            updates["drawings"] = len(data["drawings"])
-            if websocket_manager:
-                await websocket_manager.publish_to_channel('drawings', {
-                    'type': 'drawings_update',
-                    'drawings': data["drawings"],
-                    'timestamp': timestamp
-                })
-        
-        # Overlays
-        if "overlays" in data and isinstance(data["overlays"], list):
-            save_json("overlays", data["overlays"])
-            updates["overlays"] = len(data["overlays"])
-            if websocket_manager:
-                await websocket_manager.publish_to_channel('overlays', {
-                    'type': 'overlays_update',
-                    'overlays': data["overlays"],
-                    'timestamp': timestamp
-                })
-        
-        # Symbols
-        if "symbols" in data and isinstance(data["symbols"], list):
-            save_json("symbols", data["symbols"])
-            updates["symbols"] = len(data["symbols"])
-            if websocket_manager:
-                await websocket_manager.publish_to_channel('symbols', {
-                    'type': 'symbols_update',
-                    'symbols': data["symbols"],
+        # CoT Events
+        cot_events = data.get("cot_events")
+        if isinstance(cot_events, list):
+            updates["cot_events"] = len(cot_events)
+            # Broadcast CoT events to subscribed clients in one frame; a single
+            # event keeps the per-event 'cot_event' message shape
+            if len(cot_events) == 1:
+                broadcasts.append(('cot', {
+                    'type': 'cot_event',
+                    'event': cot_events[0],
                     'timestamp': timestamp
-                })
-        
-        # Messages
-        if "messages" in data and isinstance(data["messages"], list):
-            # Append to messages log
-            existing_messages = load_json("meshtastic_messages")
-            if not isinstance(existing_messages, list):
-                existing_messages = []
-            existing_messages.extend(data["messages"])
-            # Keep only last MAX_STORED_MESSAGES messages
-            if len(existing_messages) > MAX_STORED_MESSAGES:
-                existing_messages = existing_messages[-MAX_STORED_MESSAGES:]
-            save_json("meshtastic_messages", existing_messages)
-            updates["messages"] = len(data["messages"])
-            if websocket_manager:
-                await websocket_manager.publish_to_channel('messages', {
-                    'type': 'messages_update',
-                    'messages': data["messages"],
+                }))
+            elif cot_events:
+                broadcasts.append(('cot', {
+                    'type': 'cot_events_batch',
+                    'events': cot_events,
                     'timestamp': timestamp
-                })
+                }))
+            # Forward to TAK server (blocking socket sends) alongside the file writes
+            if AUTONOMOUS_MODULES_AVAILABLE and cot_events:
+                writes.append(loop.run_in_executor(None, _forward_sync_cot_events, cot_events))
         
-        # CoT Events
-        if "cot_events" in data and isinstance(data["cot_events"], list):
-            updates["cot_events"] = len(data["cot_events"])
-            # Broadcast CoT events to subscribed clients and forward to TAK server
-            for cot_event in data["cot_events"]:
-                if websocket_manager:
-                    await websocket_manager.publish_to_channel('cot', {
-                        'type': 'cot_event',
-                        'event': cot_event,
-                        'timestamp': timestamp
-                    })
-                # Forward raw CoT XML to TAK server if present
-                if AUTONOMOUS_MODULES_AVAILABLE:
-                    cot_xml = cot_event.get("xml") if isinstance(cot_event, dict) else None
-                    if cot_xml:
-                        cot_uid = cot_event.get("uid", "<unknown>") if isinstance(cot_event, dict) else "<unknown>"
-                        try:
-                            ok = forward_cot_to_tak(cot_xml)
-                            if ok:
-                                logger.info("CoT event forwarded to TAK server via sync_upload: uid=%s", cot_uid)
-                            else:
-                                logger.debug("CoT event forward skipped via sync_upload (TAK forwarding disabled or not configured): uid=%s", cot_uid)
-                        except Exception as _fwd_err:
-                            logger.warning("CoT event forward via sync_upload failed: uid=%s err=%s", cot_uid, _fwd_err)
+        if writes:
+            await asyncio.gather(*writes)
+        if websocket_manager and broadcasts:
+            await asyncio.gather(*(websocket_manager.publish_to_channel(channel, message)
+                                   for channel, message in broadcasts))
         
         logger.info(f"Sync upload processed: {updates}")
         
@@ -4780,8 +5762,90 @@ async def sync_upload(data: dict = Body(...), authorization: Optional[str] = Hea
         logger.exception("sync_upload failed: %s", e)
         raise HTTPException(status_code=500, detail=f"Sync upload failed: {str(e)}")
 
+_SYNC_DOWNLOAD_KEYS = ("map_markers", "drawings", "overlays", "symbols", "meshtastic_messages")
+# (validity stamps of the JSON DBs above, ETag, encoded sync/download body without "timestamp")
+_SYNC_DOWNLOAD_CACHE: Tuple[Any, str, bytes] = (None, "", b"")
+
+# JSON DBs that only this process writes (through save_json), so their write
+# version can replace a stat() per poll.  The gateway service writes
+# meshtastic_messages_db.json directly, so that file is always stat'ed.
+_SYNC_VERSIONED_KEYS = frozenset({"map_markers", "drawings", "overlays", "symbols"})
+# Worker processes do not see each other's versions, so they are only used
+# when this process is known to be the only one serving: set by the __main__
+# block for a single-worker run.  Any other runner (uvicorn --workers,
+# gunicorn, ...) keeps the file stamps.
+_SINGLE_PROCESS_SERVER = False
+
+def _sync_download_stamps() -> Tuple[Any, ...]:
+    versioned = _SYNC_VERSIONED_KEYS if _SINGLE_PROCESS_SERVER else frozenset()
+    return tuple(
+        ("v", _json_write_versions.get(key, _json_write_epoch)) if key in versioned
+        else _json_db_stamp(key, DB_PATHS[key]) if DB_PATHS.get(key) else None
+        for key in _SYNC_DOWNLOAD_KEYS
+    )
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value names *etag* (weak or strong)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):  # str.removeprefix needs Python 3.9
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def _encode_sync_state() -> bytes:
+    """Encode the current sync/download state (everything but the server timestamp)."""
+    # Load all current state
+    markers = load_json("map_markers")
+    drawings = load_json("drawings")
+    overlays = load_json("overlays")
+    symbols = load_json("symbols")
+    messages = load_json("meshtastic_messages")
+    
+    # Ensure all are lists
+    if not isinstance(markers, list):
+        markers = []
+    if not isinstance(drawings, list):
+        drawings = []
+    if not isinstance(overlays, list):
+        overlays = []
+    if not isinstance(symbols, list):
+        symbols = []
+    if not isinstance(messages, list):
+        messages = []
+    
+    # Return only recent messages (last MAX_RETURNED_MESSAGES)
+    recent_messages = messages[-MAX_RETURNED_MESSAGES:] if len(messages) > MAX_RETURNED_MESSAGES else messages
+    
+    # Get last modification time from the marker database file
+    # This provides a real timestamp of when data was last changed
+    data_modified = datetime.now(timezone.utc).isoformat()
+    try:
+        markers_path = DB_PATHS.get("map_markers")
+        if markers_path and os.path.exists(markers_path):
+            mtime = os.path.getmtime(markers_path)
+            data_modified = datetime.fromtimestamp(mtime).isoformat()
+    except Exception:
+        pass  # Use current time as fallback
+    
+    return _json_dumps({
+        "status": "success",
+        "markers": markers,
+        "drawings": drawings,
+        "overlays": overlays,
+        "symbols": symbols,
+        "messages": recent_messages,
+        "data_modified": data_modified
+    })
+
 @app.get("/api/sync/download")
-def sync_download(authorization: Optional[str] = Header(None)):
+def sync_download(authorization: Optional[str] = Header(None),
+                  if_none_match: Optional[str] = Header(None)):
     """
     Download current map/message/COT state for client synchronization.
     Called every 2 seconds from all client pages to get latest state.
@@ -4797,55 +5861,31 @@ def sync_download(authorization: Optional[str] = Header(None)):
             "timestamp": "...",     # Server timestamp
             "data_modified": "..."  # Last modification time of data
         }
+
+    The response carries an ETag derived from the DB file stamps; a poll
+    sending it back in If-None-Match gets an empty 304 while nothing changed.
     """
+    global _SYNC_DOWNLOAD_CACHE
     # Verify authentication
     if not authorization or not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Authentication required")
     
     try:
-        # Load all current state
-        markers = load_json("map_markers")
-        drawings = load_json("drawings")
-        overlays = load_json("overlays")
-        symbols = load_json("symbols")
-        messages = load_json("meshtastic_messages")
-        
-        # Ensure all are lists
-        if not isinstance(markers, list):
-            markers = []
-        if not isinstance(drawings, list):
-            drawings = []
-        if not isinstance(overlays, list):
-            overlays = []
-        if not isinstance(symbols, list):
-            symbols = []
-        if not isinstance(messages, list):
-            messages = []
-        
-        # Return only recent messages (last MAX_RETURNED_MESSAGES)
-        recent_messages = messages[-MAX_RETURNED_MESSAGES:] if len(messages) > MAX_RETURNED_MESSAGES else messages
-        
-        # Get last modification time from the marker database file
-        # This provides a real timestamp of when data was last changed
-        data_modified = datetime.now(timezone.utc).isoformat()
-        try:
-            markers_path = DB_PATHS.get("map_markers")
-            if markers_path and os.path.exists(markers_path):
-                mtime = os.path.getmtime(markers_path)
-                data_modified = datetime.fromtimestamp(mtime).isoformat()
-        except Exception:
-            pass  # Use current time as fallback
-        
-        return {
-            "status": "success",
-            "markers": markers,
-            "drawings": drawings,
-            "overlays": overlays,
-            "symbols": symbols,
-            "messages": recent_messages,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "data_modified": data_modified
-        }
+        # Polled every 2 s by every client: the encoded state is reused until
+        # one of the JSON DBs behind it changes on disk
+        stamps = _sync_download_stamps()
+        cached_stamps, etag, payload = _SYNC_DOWNLOAD_CACHE
+        if cached_stamps != stamps:
+            etag = '"%s"' % hashlib.blake2b(repr(stamps).encode(), digest_size=8).hexdigest()
+            payload = _encode_sync_state()
+            _SYNC_DOWNLOAD_CACHE = (stamps, etag, payload)
+
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        # Each poll still gets a fresh server timestamp, appended to the cached body
+        return Response(payload[:-1] + b',"timestamp":' + _json_dumps(now_iso()) + b"}",
+                        media_type="application/json", headers={"ETag": etag})
         
     except Exception as e:
         logger.exception("sync_download failed: %s", e)
@@ -4854,6 +5894,18 @@ def sync_download(authorization: Optional[str] = Header(None)):
 # -------------------------
 # Meshtastic: nodes/messages (simple endpoints)
 # -------------------------
+def _node_coords(lat: Any, lng: Any) -> Tuple[float, float]:
+    """Coerce a node's lat/lng to floats; both become 0.0 if either is missing or invalid."""
+    # Fast path: JSON numbers already decode as float, no exception frame needed
+    if lat.__class__ is float and lng.__class__ is float:
+        return lat, lng
+    if lat is None or lng is None:
+        return 0.0, 0.0
+    try:
+        return float(lat), float(lng)
+    except (TypeError, ValueError, OverflowError):
+        return 0.0, 0.0
+
 @app.get("/api/meshtastic/nodes")
 def meshtastic_nodes():
     # Return meshtastic_nodes ensuring lat/lng are numeric and default to 0.0 when missing
@@ -4930,23 +5982,12 @@ def meshtastic_nodes():
     normalized = []
     for n in nodes:
         nn = dict(n)
-        try:
-            lat = nn.get("lat")
-            lng = nn.get("lng")
-            if lat is None or lng is None:
-                nn["lat"] = 0.0
-                nn["lng"] = 0.0
-            else:
-                nn["lat"] = float(lat)
-                nn["lng"] = float(lng)
-        except Exception:
-            nn["lat"] = 0.0
-            nn["lng"] = 0.0
+        nn["lat"], nn["lng"] = _node_coords(nn.get("lat"), nn.get("lng"))
         normalized.append(nn)
     return normalized
 
 @app.get("/api/meshtastic/my_nodes")
-def meshtastic_my_nodes(authorization: Optional[str] = Header(None)):
+def meshtastic_my_nodes(authorization: Optional[str] = Header(None), db: Session = Depends(get_db)):
     """
     Returns meshtastic nodes that belong to the current user.
     Filters nodes by matching the user's device field with the node's name field.
@@ -4963,38 +6004,25 @@ def meshtastic_my_nodes(authorization: Optional[str] = Header(None)):
     payload = verify_token(token)
     if not payload:
         raise HTTPException(status_code=401, detail="Invalid token")
-    users = load_json("users")
-    user = next((u for u in users if u.get("id") == payload.get("user_id") or u.get("username") == payload.get("username")), None)
-    if not user:
+    # Users live in the database (there is no "users" JSON DB); only the device
+    # column is needed, looked up through the primary key / username index
+    row = None
+    if payload.get("user_id"):
+        row = db.execute(select(User.device).where(User.id == payload["user_id"])).first()
+    if row is None and payload.get("username"):
+        row = db.execute(select(User.device).where(User.username == payload["username"])).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Get user's device name
-    user_device = user.get("device", "")
-    
-    # Load and filter nodes
-    nodes = load_json("meshtastic_nodes")
-    if not isinstance(nodes, list):
-        return []
+    user_device = row.device or ""
     
-    # Filter nodes that match user's device name
+    # Nodes whose name matches the user's device, from the per-name index
     filtered_nodes = []
-    for n in nodes:
+    for n in _json_index("meshtastic_nodes", "name", _index_all_by("name")).get(user_device, ()):
         nn = dict(n)
-        # Match node's name with user's device
-        if nn.get("name") == user_device:
-            try:
-                lat = nn.get("lat")
-                lng = nn.get("lng")
-                if lat is None or lng is None:
-                    nn["lat"] = 0.0
-                    nn["lng"] = 0.0
-                else:
-                    nn["lat"] = float(lat)
-                    nn["lng"] = float(lng)
-            except Exception:
-                nn["lat"] = 0.0
-                nn["lng"] = 0.0
-            filtered_nodes.append(nn)
+        nn["lat"], nn["lng"] = _node_coords(nn.get("lat"), nn.get("lng"))
+        filtered_nodes.append(nn)
     
     return filtered_nodes
 
@@ -5003,16 +6031,13 @@ def meshtastic_messages(limit: int = 100):
     msgs = load_json("meshtastic_messages")
     if not isinstance(msgs, list):
         return []
-    return msgs[-limit:]
+    # Tail of the capped list; msgs[-limit:] would return everything for limit=0
+    return msgs[max(0, len(msgs) - limit):]
 
 @app.post("/api/meshtastic/send")
 def meshtastic_send(data: dict = Body(...)):
     message = {"id": str(uuid.uuid4()), "from": data.get("from"), "text": data.get("text"), "ts": int(datetime.now(timezone.utc).timestamp())}
-    msgs = load_json("meshtastic_messages")
-    if not isinstance(msgs, list):
-        msgs = []
-    msgs.append(message)
-    save_json("meshtastic_messages", msgs)
+    extend_json("meshtastic_messages", [message], MAX_STORED_MESSAGES)
     log_audit("send_message", "system", {"to": data.get("from")})
     return {"status": "success", "message": message}
 
@@ -5326,7 +6351,7 @@ def api_scan_ports():
     
     try:
         ports = []
-        comports = list(serial_list_ports.comports())
+        comports = cached_comports()
         logger.info(f"[PortScan] Found {len(comports)} serial port(s)")
         
         for p in comports:
@@ -5570,6 +6595,8 @@ def _build_nodes_from_serial(port: str, friendly_map: Dict[str, str], default_pa
                     logger.warning(f"[Port:{port}] Failed to iterate nodes_obj: {e}")
                     items = []
 
+            # Fallback last_heard for nodes that never reported one
+            read_epoch = int(datetime.now(timezone.utc).timestamp())
             for key, raw in items:
                 try:
                     # Convert node object to dict if needed
@@ -5663,7 +6690,7 @@ def _build_nodes_from_serial(port: str, friendly_map: Dict[str, str], default_pa
                         "battery": raw.get("battery") or (raw.get("deviceMetrics") and raw.get("deviceMetrics").get("batteryLevel")),
                         "snr": raw.get("snr"),
                         "rssi": raw.get("rssi"),
-                        "last_heard": raw.get("last_heard") or raw.get("lastHeard") or int(datetime.now(timezone.utc).timestamp()),
+                        "last_heard": raw.get("last_heard") or raw.get("lastHeard") or read_epoch,
                         "lat": latf,
                         "lng": lngf,
                         "callsign": raw.get("callsign") or None,
@@ -5921,6 +6948,10 @@ def api_import_meshtastic(data: dict = Body(...)):
                         nodes_to_import.append(_normalize_node(_n))
                     logger.info(f"[Port:{_port}] Read {len(raw_nodes)} nodes from port")
 
+        # One set of timestamps for the whole import batch
+        import_time = datetime.now(timezone.utc)
+        import_local_iso = datetime.now().isoformat()
+
         for node_rec in nodes_to_import:
             mesh = node_rec.get("mesh_id")
             existing_node = None
@@ -5973,7 +7004,7 @@ def api_import_meshtastic(data: dict = Body(...)):
                 marker_matched["lat"] = float(existing_node["lat"])
                 marker_matched["lng"] = float(existing_node["lng"])
                 marker_matched["name"] = existing_node.get("name") or ""
-                marker_matched["timestamp"] = datetime.now().isoformat()
+                marker_matched["timestamp"] = import_local_iso
                 marker_matched["created_by"] = marker_matched.get("created_by", "import_meshtastic")
                 marker_matched["unit_id"] = mesh
             else:
@@ -5984,7 +7015,7 @@ def api_import_meshtastic(data: dict = Body(...)):
                     "name": existing_node.get("name") or "",
                     "unit_id": mesh,
                     "status": "BASE",
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": import_local_iso,
                     "created_by": "import_meshtastic"
                 }
                 markers_db.append(new_marker)
@@ -6011,7 +7042,7 @@ def api_import_meshtastic(data: dict = Body(...)):
                     existing_db.short_name = node_rec.get("shortName") or node_rec.get("name")
                     existing_db.lat = safe_lat
                     existing_db.lng = safe_lng
-                    existing_db.last_heard = datetime.now(timezone.utc)
+                    existing_db.last_heard = import_time
                     existing_db.is_online = True
                     existing_db.raw_data = node_rec
                 else:
@@ -6021,7 +7052,7 @@ def api_import_meshtastic(data: dict = Body(...)):
                         short_name=node_rec.get("shortName") or node_rec.get("name"),
                         lat=safe_lat,
                         lng=safe_lng,
-                        last_heard=datetime.now(timezone.utc),
+                        last_heard=import_time,
                         is_online=True,
                         raw_data=node_rec
                     )
@@ -6116,6 +7147,11 @@ async def import_meshtastic_nodes(
         nodes_db = load_json("meshtastic_nodes")
         if not isinstance(nodes_db, list):
             nodes_db = []
+
+        # One set of timestamps for the whole import batch
+        import_time = datetime.now(timezone.utc)
+        import_epoch = int(import_time.timestamp())
+        import_local_iso = datetime.now().isoformat()
         
         for raw_node in nodes_data:
             try:
@@ -6144,7 +7180,7 @@ async def import_meshtastic_nodes(
                         'lng': lng_val,
                         'altitude': parsed.get('altitude', 0),
                         'has_gps': parsed['has_gps'],
-                        'last_heard': int(datetime.now(timezone.utc).timestamp()),
+                        'last_heard': import_epoch,
                         'imported_from': 'gateway_import',
                         'source': 'meshtastic_gateway'
                     }
@@ -6157,7 +7193,7 @@ async def import_meshtastic_nodes(
                         for k, v in node_rec.items():
                             if v is not None:
                                 existing[k] = v
-                        existing['updated_at'] = datetime.now().isoformat()
+                        existing['updated_at'] = import_local_iso
                         imported.append({
                             'id': parsed['id'],
                             'name': parsed['callsign'],
@@ -6167,7 +7203,7 @@ async def import_meshtastic_nodes(
                         })
                     else:
                         # Add new node
-                        node_rec['created_at'] = datetime.now().isoformat()
+                        node_rec['created_at'] = import_local_iso
                         nodes_db.append(node_rec)
                         imported.append({
                             'id': parsed['id'],
@@ -6223,7 +7259,7 @@ async def import_meshtastic_nodes(
                         existing_db.lat = safe_lat
                         existing_db.lng = safe_lng
                         existing_db.altitude = full_rec.get('altitude')
-                        existing_db.last_heard = datetime.now(timezone.utc)
+                        existing_db.last_heard = import_time
                         existing_db.is_online = True
                         existing_db.raw_data = full_rec
                     else:
@@ -6234,7 +7270,7 @@ async def import_meshtastic_nodes(
                             lat=safe_lat,
                             lng=safe_lng,
                             altitude=full_rec.get('altitude'),
-                            last_heard=datetime.now(timezone.utc),
+                            last_heard=import_time,
                             is_online=True,
                             raw_data=full_rec
                         )
@@ -6377,7 +7413,8 @@ def api_ingest_node(data: dict = Body(...)):
                 lng=lngf,
                 type="node",
                 created_by="ingest_node",
-                data={"unit_id": existing_node.id, "hardware": existing_node.hardware_model}
+                data={"unit_id": existing_node.id, "hardware": existing_node.hardware_model},
+                external_id=str(existing_node.id)
             )
             db.add(marker)
         
@@ -6417,15 +7454,18 @@ def health():
     return {"status": "ok", "timestamp": datetime.now().isoformat()}
 
 @app.get("/api/server_info")
-def get_server_info():
-    """Get server information including local IP address."""
+def get_server_info(refresh: bool = False):
+    """Get server information including local IP address.
+
+    Pass ``refresh=true`` to re-detect the local IPs instead of using the cached result
+    (e.g. after switching networks).
+    """
+    if refresh:
+        get_local_ip.cache_clear()
     local_ip, all_ips = get_local_ip()
     
-    # Detect protocol based on SSL certificate presence
-    cert_file = os.path.join(base_path, "cert.pem")
-    key_file = os.path.join(base_path, "key.pem")
-    use_ssl = os.path.exists(cert_file) and os.path.exists(key_file)
-    protocol = "https" if use_ssl else "http"
+    protocol = _server_protocol()
+    use_ssl = protocol == "https"
 
     # Read COT listener ports from config
     cfg = load_json("config") or {}
@@ -6442,6 +7482,11 @@ def get_server_info():
         "cot_tcp_port": cot_tcp_port,
         "cot_udp_port": cot_udp_port,
         "base_url": f"{protocol}://{local_ip}:8101",
+        # Same landing URLs the startup banner prints (banner may be silenced via LPU5_QUIET=1)
+        "access_urls": [
+            f"{protocol}://{ip}:8101/landing.html"
+            for ip in dict.fromkeys(["127.0.0.1", local_ip, *all_ips])
+        ],
         "timestamp": datetime.now().isoformat()
     }
 
@@ -6534,9 +7579,7 @@ def api_qr_create(data: dict = Body(...), request: Request = None, db: Session =
         qr_url = f"{caller_base}/qr/{token}"
     else:
         local_ip, _ = get_local_ip()
-        cert_file = os.path.join(base_path, "cert.pem")
-        key_file = os.path.join(base_path, "key.pem")
-        protocol = "https" if (os.path.exists(cert_file) and os.path.exists(key_file)) else "http"
+        protocol = _server_protocol()
         qr_url = f"{protocol}://{local_ip}:8101/qr/{token}"
 
     png_b64 = None
@@ -6598,10 +7641,8 @@ def api_qr_cot_mesh(data: dict = Body(...), request: Request = None, db: Session
     max_uses = int(data.get("max_uses", 999))
 
     local_ip, all_ips = get_local_ip()
-    cert_file = os.path.join(base_path, "cert.pem")
-    key_file = os.path.join(base_path, "key.pem")
-    use_ssl = os.path.exists(cert_file) and os.path.exists(key_file)
-    protocol = "https" if use_ssl else "http"
+    protocol = _server_protocol()
+    use_ssl = protocol == "https"
     server_port = 8101
 
     # Read COT listener ports from config
@@ -6704,10 +7745,8 @@ def api_qr_join_create(request: Request = None):
     is called again.
     """
     local_ip, all_ips = get_local_ip()
-    cert_file = os.path.join(base_path, "cert.pem")
-    key_file = os.path.join(base_path, "key.pem")
-    use_ssl = os.path.exists(cert_file) and os.path.exists(key_file)
-    protocol = "https" if use_ssl else "http"
+    protocol = _server_protocol()
+    use_ssl = protocol == "https"
     server_port = 8101
 
     qr_payload = {
@@ -6865,6 +7904,7 @@ def api_create_registration_qr(data: dict = Body(...)):
         expires_days = int(data.get("expires_days", 365))
         label = data.get("label", "registration")
         token = str(uuid.uuid4())
+        created_at = datetime.now(timezone.utc)
         entry = {
             "id": str(uuid.uuid4()),
             "token": token,
@@ -6872,8 +7912,8 @@ def api_create_registration_qr(data: dict = Body(...)):
             "type": "registration",  # Added type field for consolidated database
             "max_uses": max_uses,
             "uses": 0,
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "expires_at": (datetime.now(timezone.utc) + timedelta(days=expires_days)).isoformat()
+            "created_at": created_at.isoformat(),
+            "expires_at": (created_at + timedelta(days=expires_days)).isoformat()
         }
         # Now using qr_codes (consolidated database) instead of registration_qr_codes
         qr_list = load_json("qr_codes")
@@ -7076,6 +8116,7 @@ def _add_tak_login_entry(
         save_json("tak_logins", logins)
         return existing
 
+    assigned_at = datetime.now(timezone.utc).isoformat()
     entry = {
         "id": str(uuid.uuid4()),
         "username": username,
@@ -7084,8 +8125,8 @@ def _add_tak_login_entry(
         "assigned_to_ip": None,
         "assigned_to_callsign": callsign,
         "assigned_to_unit": unit,
-        "assigned_at": datetime.now(timezone.utc).isoformat(),
-        "created_at": datetime.now(timezone.utc).isoformat(),
+        "assigned_at": assigned_at,
+        "created_at": assigned_at,
         "source": "registered",
     }
     logins.append(entry)
@@ -7327,7 +8368,7 @@ def api_tak_mgmt_test():
 
 
 @app.post("/api/tak_logins/auth_claim")
-async def api_tak_logins_auth_claim(data: dict = Body(...), db: Session = Depends(get_db)):
+def api_tak_logins_auth_claim(data: dict = Body(...), db: Session = Depends(get_db)):
     """Authenticate with personal credentials and receive TAK server connection info.
 
     A registered and admin-approved user may call this endpoint with their
@@ -7345,7 +8386,7 @@ async def api_tak_logins_auth_claim(data: dict = Body(...), db: Session = Depend
         raise HTTPException(status_code=400, detail="username and password required")
 
     # Look up active user first
-    user = db.query(User).filter(User.username == username).first()
+    user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
     if user:
         if not verify_password(password, user.password_hash):
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -7379,7 +8420,7 @@ async def api_tak_logins_auth_claim(data: dict = Body(...), db: Session = Depend
         }
 
     # Check pending registrations
-    reg = db.query(PendingRegistration).filter(PendingRegistration.username == username).first()
+    reg = db.execute(_STMT_PENDING_BY_USERNAME, {"username": username}).scalars().first()
     if reg:
         if not verify_password(password, reg.password_hash):
             raise HTTPException(status_code=401, detail="Invalid credentials")
@@ -7732,6 +8773,8 @@ def api_tak_logins_add(data: dict = Body(...), db: Session = Depends(get_db)):
 
     added = []
     users_created = []
+    now = datetime.now(timezone.utc)
+    now_str = now.isoformat()
     for item in items:
         u = (item.get("username") or "").strip()
         p = (item.get("password") or "").strip()
@@ -7746,7 +8789,7 @@ def api_tak_logins_add(data: dict = Body(...), db: Session = Depends(get_db)):
             "assigned_to_callsign": None,
             "assigned_to_unit": None,
             "assigned_at": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": now_str,
         }
         logins.append(entry)
         added.append(entry)
@@ -7769,7 +8812,7 @@ def api_tak_logins_add(data: dict = Body(...), db: Session = Depends(get_db)):
                 role="user",
                 group_id="users",
                 is_active=True,
-                created_at=datetime.now(timezone.utc),
+                created_at=now,
                 tak_team="Cyan",
                 tak_role="Team Member",
                 tak_display_type="General Ground Unit",
@@ -7834,9 +8877,7 @@ def api_tak_logins_qr(data: dict = Body(default={}), request: Request = None):
     caller_base = (data.get("base_url") or "").strip().rstrip("/")
     if not caller_base:
         local_ip, _ = get_local_ip()
-        cert_file = os.path.join(base_path, "cert.pem")
-        key_file = os.path.join(base_path, "key.pem")
-        protocol = "https" if (os.path.exists(cert_file) and os.path.exists(key_file)) else "http"
+        protocol = _server_protocol()
         caller_base = f"{protocol}://{local_ip}:8101"
     tak_token = _get_tak_qr_token()
     claim_url = f"{caller_base}/tak_login.html?tak_token={tak_token}"
@@ -7872,7 +8913,7 @@ def api_tak_regenerate_token(authorization: Optional[str] = Header(None)):
 
 
 @app.post("/api/tak_logins/trusted_register")
-async def api_tak_logins_trusted_register(data: dict = Body(...), db: Session = Depends(get_db)):
+def api_tak_logins_trusted_register(data: dict = Body(...), db: Session = Depends(get_db)):
     """Self-register using the TAK QR trust token — no admin approval required.
 
     A user who possesses the ``tak_token`` (embedded in the QR code URL) is
@@ -7910,12 +8951,12 @@ async def api_tak_logins_trusted_register(data: dict = Body(...), db: Session =
         raise HTTPException(status_code=401, detail="Invalid or expired TAK QR token")
 
     # Check existing active user
-    existing_user = db.query(User).filter(User.username == username).first()
+    existing_user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
     if existing_user:
         return {"status": "exists", "message": "Username already registered. Please use the login form."}
 
     # Check pending registration
-    pending = db.query(PendingRegistration).filter(PendingRegistration.username == username).first()
+    pending = db.execute(_STMT_PENDING_BY_USERNAME, {"username": username}).scalars().first()
     if pending:
         return {"status": "pending", "message": "A registration for this username is already pending admin approval."}
 
@@ -8135,7 +9176,8 @@ def sync_meshtastic_nodes_to_map_markers_db():
                     lng=node.lng or 0.0,
                     type="node",
                     created_by="meshtastic_sync",
-                    data={"unit_id": node.id, "hardware": node.hardware_model}
+                    data={"unit_id": node.id, "hardware": node.hardware_model},
+                    external_id=str(node.id)
                 )
                 db.add(marker)
             else:
@@ -8144,6 +9186,7 @@ def sync_meshtastic_nodes_to_map_markers_db():
                 marker.lng = node.lng or 0.0
                 marker.type = "node"
                 marker.data = {"unit_id": node.id, "hardware": node.hardware_model}
+                marker.external_id = str(node.id)
                 
             synced_count += 1
             
@@ -8389,7 +9432,7 @@ async def gateway_start(data: dict = Body(...)):
                     # Broadcast status update
                     if websocket_manager:
                         try:
-                            asyncio.create_task(websocket_manager.broadcast({
+                            _spawn_broadcast(websocket_manager.broadcast({
                                 "type": "gateway_status",
                                 "status": "started",
                                 "port": port,
@@ -8469,7 +9512,7 @@ async def gateway_stop(data: Optional[dict] = Body(None)):
 
         if stopped_ports and websocket_manager:
             try:
-                asyncio.create_task(websocket_manager.broadcast({
+                _spawn_broadcast(websocket_manager.broadcast({
                     "type": "gateway_status",
                     "status": "stopped",
                     "ports": stopped_ports,
@@ -8506,12 +9549,13 @@ def gateway_status():
             }
 
         all_status: dict = {}
+        now = datetime.now(timezone.utc)
         for port, svc in _gateway_services.items():
             s = svc.get_status()
             if s.get("uptime_start"):
                 try:
                     start_time = datetime.fromisoformat(s["uptime_start"].replace('Z', '+00:00'))
-                    s["uptime_seconds"] = int((datetime.now(timezone.utc) - start_time).total_seconds())
+                    s["uptime_seconds"] = int((now - start_time).total_seconds())
                 except Exception:
                     s["uptime_seconds"] = 0
             all_status[port] = s
@@ -8562,7 +9606,10 @@ def gateway_ports():
         raise HTTPException(status_code=501, detail="Gateway service not available")
     
     try:
-        ports = gateway_list_ports() if gateway_list_ports else []
+        ports = [
+            {"device": p.device, "description": p.description, "hwid": p.hwid}
+            for p in cached_comports()
+        ]
         return {
             "status": "success",
             "ports": ports
@@ -8616,13 +9663,9 @@ async def gateway_test_port(data: dict = Body(...)):
 def gateway_nodes():
     """Get nodes imported by gateway service"""
     try:
-        nodes_db_path = os.path.join(base_path, "meshtastic_nodes_db.json")
-        
-        if not os.path.exists(nodes_db_path):
-            return {"status": "success", "nodes": []}
-        
-        with open(nodes_db_path, 'r', encoding='utf-8') as f:
-            nodes = json.load(f)
+        nodes = load_json("meshtastic_nodes")
+        if not isinstance(nodes, list):
+            nodes = []
         
         # Filter only gateway-imported nodes
         gateway_nodes = [n for n in nodes if n.get("imported_from") == "gateway_service"]
@@ -8641,13 +9684,9 @@ def gateway_nodes():
 def gateway_messages(limit: int = 100):
     """Get messages received by gateway service"""
     try:
-        messages_db_path = os.path.join(base_path, "meshtastic_messages_db.json")
-        
-        if not os.path.exists(messages_db_path):
-            return {"status": "success", "messages": []}
-        
-        with open(messages_db_path, 'r', encoding='utf-8') as f:
-            messages = json.load(f)
+        messages = load_json("meshtastic_messages")
+        if not isinstance(messages, list):
+            messages = []
         
         # Return last N messages
         recent_messages = messages[-limit:] if len(messages) > limit else messages
@@ -8679,7 +9718,7 @@ def _schedule_gateway_websocket_broadcast(payload: Dict[str, Any], label: str) -
     if not websocket_manager:
         return
     try:
-        task = asyncio.create_task(websocket_manager.broadcast(payload))
+        task = _spawn_broadcast(websocket_manager.broadcast(payload))
         task.add_done_callback(
             lambda t: logger.warning("Failed to broadcast %s: %s", label, t.exception())
             if t.exception() else None
@@ -9565,7 +10604,7 @@ async def cot_monitor_stream(request: Request):
     q = _cot_monitor_store.subscribe_sse()
 
     async def _event_generator():
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         try:
             while True:
                 if await request.is_disconnected():
@@ -10359,7 +11398,7 @@ def push_missing_to_tak(authorization: Optional[str] = Header(None), db: Session
 
     lpu5_only = db.query(MapMarker).filter(
         ~MapMarker.created_by.in_(list(_TAK_INGEST_SOURCES)),
-        ~MapMarker.created_by.in_(list(_MESHTASTIC_CREATED_BY)),
+        ~MapMarker.created_by.in_(_MESHTASTIC_CREATED_BY),
     ).all()
     lpu5_only = [m for m in lpu5_only if m.id not in forwarded_ids]
 
@@ -10711,7 +11750,7 @@ def get_chat_channels(authorization: Optional[str] = Header(None)):
                 user_payload = verify_token(authorization.split(" ", 1)[1].strip())
                 username = (user_payload or {}).get("username") or (user_payload or {}).get("sub")
                 if username:
-                    user = db.query(User).filter(User.username == username).first()
+                    user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
                     if user:
                         # Admin and operator roles see all channels
                         if user.role not in ("admin", "operator"):
@@ -10865,7 +11904,7 @@ def get_chat_messages(channel_id: str, limit: int = 100, authorization: Optional
                 user_payload = verify_token(authorization.split(" ", 1)[1].strip())
                 username = (user_payload or {}).get("username") or (user_payload or {}).get("sub")
                 if username:
-                    user = db.query(User).filter(User.username == username).first()
+                    user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
                     if user and user.role not in ("admin", "operator"):
                         user_chat_channels = user.chat_channels or []
                         allowed = set(user_chat_channels) | {"all"}
@@ -10911,7 +11950,7 @@ async def send_chat_message(message: Dict = Body(...), authorization: str = Head
             raise HTTPException(status_code=404, detail="Channel not found")
 
         # Enforce that the sender is allowed to post to this channel
-        sender_user = db.query(User).filter(User.username == username).first()
+        sender_user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
         if sender_user and sender_user.role not in ("admin", "operator"):
             user_chat_channels = sender_user.chat_channels or []
             allowed = set(user_chat_channels) | {"all"}
@@ -11024,7 +12063,7 @@ async def send_chat_image(
             raise HTTPException(status_code=404, detail="Channel not found")
 
         # Enforce channel access
-        sender_user = db.query(User).filter(User.username == username).first()
+        sender_user = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
         if sender_user and sender_user.role not in ("admin", "operator"):
             user_chat_channels = sender_user.chat_channels or []
             allowed = set(user_chat_channels) | {"all"}
@@ -11272,7 +12311,8 @@ async def place_map_symbol(symbol: Dict = Body(...), authorization: str = Header
         if lat is None or lng is None:
             raise HTTPException(status_code=400, detail="lat and lng are required")
         
-        timestamp = datetime.now(timezone.utc).isoformat()
+        created_at = datetime.now(timezone.utc)
+        timestamp = created_at.isoformat()
         
         with SessionLocal() as db:
             # For gps_position type, use a stable UID derived from the username
@@ -11309,7 +12349,7 @@ async def place_map_symbol(symbol: Dict = Body(...), authorization: str = Header
                         color=symbol.get("color", "#3498db"),
                         icon=symbol.get("icon", "fa-location-arrow"),
                         created_by=username,
-                        created_at=datetime.now(timezone.utc),
+                        created_at=created_at,
                         data={
                             "source_page": source_page,
                             "timestamp": timestamp,
@@ -11342,7 +12382,7 @@ async def place_map_symbol(symbol: Dict = Body(...), authorization: str = Header
                     color=symbol.get("color", "#3498db"),
                     icon=symbol.get("icon", "fa-map-marker"),
                     created_by=username,
-                    created_at=datetime.now(timezone.utc),
+                    created_at=created_at,
                     data={
                         "source_page": source_page,
                         "timestamp": timestamp,
@@ -11362,7 +12402,7 @@ async def place_map_symbol(symbol: Dict = Body(...), authorization: str = Header
             user_tak_team = None
             user_tak_role = None
             if symbol_type == "gps_position" and username != "anonymous":
-                user_record = db.query(User).filter(User.username == username).first()
+                user_record = db.execute(_STMT_USER_BY_USERNAME, {"username": username}).scalars().first()
                 if user_record:
                     user_callsign = user_record.callsign or None
                     user_tak_team = user_record.tak_team or None
@@ -11864,6 +12904,8 @@ def system_health():
     
     if websocket_manager:
         health_status["websocket_connections"] = websocket_manager.get_connection_count()
+
+    health_status["audit"] = dict(_audit_stats_snapshot(), pending=_AUDIT_QUEUE.qsize())
     
     # Add data server status
     if DATA_SERVER_AVAILABLE and data_server_manager:
@@ -11915,6 +12957,7 @@ import shutil as _shutil
 import math as _math
 import struct as _struct
 import socket as _socket
+import functools as _functools
 
 # Optional: pyrtlsdr — install with `pip install pyrtlsdr` on the deployment host
 try:
@@ -11932,14 +12975,49 @@ except ImportError:
     _np = None
     _NUMPY_LIB = False
 
+# Optional: scipy.fft — faster pocketfft build with multithreading; install with `pip install scipy`
+try:
+    from scipy import fft as _sfft  # type: ignore
+    _SCIPY_FFT = True
+except ImportError:
+    _sfft = None
+    _SCIPY_FFT = False
+
 # RTL-SDR USB identifiers (Realtek chipset, common dongles)
 _RTL_SDR_VID = 0x0bda
 _RTL_SDR_PIDS = {0x2832, 0x2838, 0x2888}
 _SDR_DEFAULT_NFFT = 1024
 
+# pyrtlsdr path: number of consecutive nfft-sized segments read per measurement
+# and averaged into one spectrum.
+_SDR_AVG_SEGMENTS = 8
+
 # -6.0 dB: empirical reference-level calibration offset (full-scale IQ → approx dBm into 50 Ω)
 _SDR_POWER_OFFSET_DB = -6.0
 
+# |b - 128| / 256 for every unsigned IQ byte: half the normalised magnitude of
+# one component, so (|I| + |Q|) / 2 in the numpy-free spectrum path is a sum
+# of two table lookups instead of per-sample float arithmetic.
+_IQ_HALF_ABS_LUT = tuple(abs(b - 128) / 256.0 for b in range(256))
+
+# Longest moving-average FIR used as a crude anti-alias filter before the
+# pyrtlsdr FM audio path decimates down to the audio rate.
+_SDR_AUDIO_FIR_MAX_TAPS = 8
+
+
+@_functools.lru_cache(maxsize=8)
+def _sdr_hann_window(nfft: int):
+    """Return a cached, read-only float32 Hann window of length *nfft*.
+
+    Equivalent to ``np.hanning(nfft)`` but the cosine table is computed once per
+    FFT size instead of on every measurement, and float32 keeps the windowed
+    IQ buffer complex64 rather than silently promoting it to complex128.
+    """
+    n = _np.arange(nfft, dtype=_np.float32)
+    window = (0.5 - 0.5 * _np.cos(2.0 * _np.pi * n / (nfft - 1))).astype(_np.float32)
+    window.setflags(write=False)
+    return window
+
 # rtl_tcp defaults — rtl_tcp ships with the rtl-sdr package.
 # Start with: rtl_tcp -a 0.0.0.0   (Linux/Raspberry Pi)
 #         or: rtl_tcp.exe           (Windows)
@@ -11966,6 +13044,35 @@ _RTL_TCP_PROC: Optional[_subprocess.Popen] = None
 _RTL_TCP_LAST_ERROR: Optional[str] = None
 
 
+# Rate-limit for acquisition-failure warnings in _get_spectrum_data_locked.
+# The SDR page polls /api/sdr/measure several times per second, so a missing
+# or flaky backend would otherwise log on every request.
+# Key: acquisition path ("pyrtlsdr", "rtl_power", "rtl_tcp"), Value: last warning timestamp.
+_SDR_WARN_TIMES: Dict[str, float] = {}
+_SDR_WARN_INTERVAL = 1.0  # seconds between repeated warnings per path
+
+
+def _throttled_sdr_warn(path: str, msg: str, *args) -> None:
+    """Emit an SDR acquisition WARNING at most once per _SDR_WARN_INTERVAL seconds per *path*."""
+    if not logger.isEnabledFor(logging.WARNING):
+        return
+    now = time.monotonic()
+    if now - _SDR_WARN_TIMES.get(path, 0.0) < _SDR_WARN_INTERVAL:
+        return
+    _SDR_WARN_TIMES[path] = now
+    logger.warning(msg, *args)
+
+
+def _sdr_fft(x, nfft: int):
+    """FFT of the windowed IQ buffer *x*, using scipy.fft when installed.
+
+    *x* is always a freshly computed temporary, so scipy may overwrite it.
+    """
+    if _SCIPY_FFT:
+        return _sfft.fft(x, nfft, overwrite_x=True, workers=-1)
+    return _np.fft.fft(x, nfft)
+
+
 def _find_rtl_tool(name: str) -> Optional[str]:
     """Find an RTL-SDR executable by *name* (e.g. ``"rtl_tcp"``).
 
@@ -12107,11 +13214,46 @@ def _stop_rtl_tcp_proc():
         _RTL_TCP_PROC = None
 
 
+_SYSFS_USB_DEVICES = "/sys/bus/usb/devices"
+
+
+def _detect_rtlsdr_sysfs() -> list:
+    """Return RTL-SDR dongles listed under ``/sys/bus/usb/devices`` (Linux only).
+
+    Reads the ``idVendor`` / ``idProduct`` files directly, which avoids
+    forking ``lsusb`` and parsing its human-readable output.
+    """
+    devices = []
+    try:
+        entries = sorted(os.listdir(_SYSFS_USB_DEVICES))
+    except OSError:
+        return devices
+    for entry in entries:
+        dev_path = os.path.join(_SYSFS_USB_DEVICES, entry)
+        try:
+            with open(os.path.join(dev_path, "idVendor")) as f:
+                vid = int(f.read().strip(), 16)
+            with open(os.path.join(dev_path, "idProduct")) as f:
+                pid = int(f.read().strip(), 16)
+        except (OSError, ValueError):
+            continue
+        if vid != _RTL_SDR_VID or pid not in _RTL_SDR_PIDS:
+            continue
+        name = f"RTL-SDR {vid:04x}:{pid:04x}"
+        try:
+            with open(os.path.join(dev_path, "product")) as f:
+                name = f"{f.read().strip()} ({vid:04x}:{pid:04x})"
+        except OSError:
+            pass
+        devices.append({"index": len(devices), "name": name, "source": "sysfs", "available": True})
+    return devices
+
+
 def _detect_rtlsdr_devices() -> list:
     """
     Detect RTL-SDR USB sticks using multiple methods:
     1. pyrtlsdr device enumeration (most reliable)
-    2. lsusb output parsing (Linux/macOS)
+    2. sysfs VID/PID scan (Linux), falling back to lsusb output parsing (Linux/macOS)
     3. pyserial VID/PID scan (cross-platform)
     4. Presence of rtl_test CLI tool
     """
@@ -12132,8 +13274,10 @@ def _detect_rtlsdr_devices() -> list:
         except Exception:
             pass
 
-    # Method 2: lsusb (Linux/macOS)
-    if _shutil.which("lsusb"):
+    # Method 2: sysfs (Linux), then lsusb (Linux/macOS) as a last resort
+    if sys.platform.startswith("linux"):
+        devices.extend(_detect_rtlsdr_sysfs())
+    if not devices and _shutil.which("lsusb"):
         try:
             out = _subprocess.run(["lsusb"], capture_output=True, text=True, timeout=5)
             for line in out.stdout.splitlines():
@@ -12146,7 +13290,7 @@ def _detect_rtlsdr_devices() -> list:
     # Method 3: pyserial VID/PID
     if serial_list_ports:
         try:
-            for p in serial_list_ports.comports():
+            for p in cached_comports():
                 vid = getattr(p, "vid", None)
                 pid = getattr(p, "pid", None)
                 if vid == _RTL_SDR_VID and pid in _RTL_SDR_PIDS:
@@ -12167,6 +13311,24 @@ def _detect_rtlsdr_devices() -> list:
     return devices
 
 
+# MSG_WAITALL lets the kernel assemble a full read in one recv() call.  It is
+# unreliable on Windows, where _recv_exact falls back to plain short reads.
+_RECV_WAITALL = getattr(_socket, "MSG_WAITALL", 0) if sys.platform != "win32" else 0
+
+
+def _recv_exact(sock: _socket.socket, n: int) -> bytes:
+    """Read exactly *n* bytes from *sock*; returns fewer only if the peer closes."""
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        chunk = sock.recv_into(view[got:], n - got, _RECV_WAITALL)
+        if not chunk:
+            break
+        got += chunk
+    return bytes(view[:got])
+
+
 def _check_rtl_tcp(host: str = _RTL_TCP_DEFAULT_HOST, port: int = _RTL_TCP_DEFAULT_PORT) -> bool:
     """Return True if an rtl_tcp server is reachable and responds with the expected magic header."""
     try:
@@ -12206,12 +13368,9 @@ def _get_spectrum_rtl_tcp(
     sock = _socket.create_connection((host, port), timeout=5)
     try:
         # Handshake: read dongle info header sent by rtl_tcp on connection
-        header = b""
-        while len(header) < DONGLE_INFO_SIZE:
-            chunk = sock.recv(DONGLE_INFO_SIZE - len(header))
-            if not chunk:
-                raise OSError("rtl_tcp disconnected during handshake")
-            header += chunk
+        header = _recv_exact(sock, DONGLE_INFO_SIZE)
+        if len(header) < DONGLE_INFO_SIZE:
+            raise OSError("rtl_tcp disconnected during handshake")
         if not header.startswith(b"RTL0"):
             raise OSError("Not an rtl_tcp server (unexpected magic bytes)")
 
@@ -12224,12 +13383,7 @@ def _get_spectrum_rtl_tcp(
         )
 
         # Read raw IQ bytes: I=uint8, Q=uint8, both biased at 128
-        raw = b""
-        while len(raw) < n_bytes:
-            chunk = sock.recv(min(4096, n_bytes - len(raw)))
-            if not chunk:
-                break
-            raw += chunk
+        raw = _recv_exact(sock, n_bytes)
     finally:
         sock.close()
 
@@ -12241,17 +13395,17 @@ def _get_spectrum_rtl_tcp(
         i_f   = (iq[0::2].astype(_np.float32) - 128.0) / 128.0
         q_f   = (iq[1::2].astype(_np.float32) - 128.0) / 128.0
         samples = i_f[:nfft] + 1j * q_f[:nfft]
-        window  = _np.hanning(nfft)
-        fft_out = _np.fft.fftshift(_np.fft.fft(samples * window, nfft))
-        power   = (20.0 * _np.log10(_np.abs(fft_out) / nfft + 1e-10) + _SDR_POWER_OFFSET_DB).tolist()
+        window  = _sdr_hann_window(nfft)
+        fft_out = _np.fft.fftshift(_sdr_fft(samples * window, nfft))
+        power   = (20.0 * _np.log10(_np.abs(fft_out) / nfft + 1e-10) + _SDR_POWER_OFFSET_DB).astype(_np.float32)
     else:
         # Pure-Python fallback (no numpy): approximate magnitude via |I|+|Q|
-        power = []
-        for k in range(nfft):
-            i_val = (raw[k * 2]     - 128) / 128.0
-            q_val = (raw[k * 2 + 1] - 128) / 128.0
-            mag   = (abs(i_val) + abs(q_val)) / 2.0 + 1e-10
-            power.append(round(20.0 * _math.log10(mag) + _SDR_POWER_OFFSET_DB, 2))
+        lut   = _IQ_HALF_ABS_LUT
+        log10 = _math.log10
+        power = [
+            round(20.0 * log10(lut[i_b] + lut[q_b] + 1e-10) + _SDR_POWER_OFFSET_DB, 2)
+            for i_b, q_b in zip(raw[0:n_bytes:2], raw[1:n_bytes:2])
+        ]
 
     return {"spectrum": power, "source": "rtl_tcp", "nfft": nfft}
 
@@ -12306,18 +13460,24 @@ def _get_spectrum_data_locked(
                 sdr.sample_rate = sample_rate_hz
                 sdr.center_freq = center_freq_hz
                 sdr.gain = gain
-                samples = sdr.read_samples(nfft * 8)
+                samples = sdr.read_samples(nfft * _SDR_AVG_SEGMENTS)
             finally:
                 sdr.close()
 
-            window = _np.hanning(nfft)
-            fft_data = _np.fft.fftshift(_np.fft.fft(samples[:nfft] * window, nfft))
-            # Normalize to approx dBm (relative to 1 mW into 50 Ω)
-            # -6.0 dB: empirical reference-level offset (full-scale IQ → ~dBm into 50 Ω)
-            power = (20.0 * _np.log10(_np.abs(fft_data) / nfft + 1e-10) - 6.0).tolist()
+            # Average the power of every nfft-sized segment in the buffer
+            # (one batched FFT over the rows) instead of discarding all but
+            # the first segment — same bandwidth, lower noise floor.
+            samples  = _np.asarray(samples)
+            n_seg    = max(1, len(samples) // nfft)
+            segments = samples[: n_seg * nfft].reshape(n_seg, nfft) * _sdr_hann_window(nfft)
+            spectra  = _sdr_fft(segments, nfft)
+            avg_pow  = _np.fft.fftshift(_np.mean(spectra.real ** 2 + spectra.imag ** 2, axis=0))
+            # Normalize to approx dBm (relative to 1 mW into 50 Ω); 1e-20 in the
+            # power domain matches the previous 1e-10 magnitude floor.
+            power = (10.0 * _np.log10(avg_pow / (nfft * nfft) + 1e-20) + _SDR_POWER_OFFSET_DB).astype(_np.float32)
             return {"spectrum": power, "source": "rtlsdr_hardware", "nfft": nfft}
         except Exception as exc:
-            logger.warning("RTL-SDR hardware read failed: %s", exc)
+            _throttled_sdr_warn("pyrtlsdr", "RTL-SDR hardware read failed: %s", exc)
 
     # 2. rtl_power subprocess
     _rtl_power_exe = _find_rtl_tool("rtl_power")
@@ -12345,7 +13505,7 @@ def _get_spectrum_data_locked(
                 resampled = [powers[int(i * src_len / nfft)] for i in range(nfft)]
                 return {"spectrum": resampled, "source": "rtl_power", "nfft": nfft}
         except Exception as exc:
-            logger.warning("rtl_power subprocess failed: %s", exc)
+            _throttled_sdr_warn("rtl_power", "rtl_power subprocess failed: %s", exc)
 
     # 3. rtl_tcp server — real hardware accessed via TCP (no local driver required)
     # Auto-start rtl_tcp if the executable exists locally but is not yet running.
@@ -12360,7 +13520,7 @@ def _get_spectrum_data_locked(
         time.sleep(0.15)
         return result
     except Exception as exc:
-        logger.warning("rtl_tcp acquisition failed (%s:%s): %s", rtl_tcp_host, rtl_tcp_port, exc)
+        _throttled_sdr_warn("rtl_tcp", "rtl_tcp acquisition failed (%s:%s): %s", rtl_tcp_host, rtl_tcp_port, exc)
 
     raise HTTPException(
         status_code=503,
@@ -12376,7 +13536,7 @@ def _get_spectrum_data_locked(
 @app.get("/api/sdr/devices", summary="Detect RTL-SDR USB devices")
 def sdr_get_devices():
     """
-    Detect connected RTL-SDR dongles using pyrtlsdr, lsusb, pyserial VID/PID,
+    Detect connected RTL-SDR dongles using pyrtlsdr, sysfs/lsusb, pyserial VID/PID,
     and CLI tool presence.  Returns device list and backend capability flags.
     """
     devices = _detect_rtlsdr_devices()
@@ -12529,12 +13689,7 @@ def sdr_scan_rtl_tcp(data: dict = Body(default={})):
             try:
                 with _socket.create_connection((host, port), timeout=timeout) as sock:
                     entry["reachable"] = True
-                    header = b""
-                    while len(header) < 12:
-                        chunk = sock.recv(12 - len(header))
-                        if not chunk:
-                            break
-                        header += chunk
+                    header = _recv_exact(sock, 12)
                     if len(header) >= 4 and header.startswith(b"RTL0"):
                         entry["magic_ok"] = True
                         found.append({"host": host, "port": port})
@@ -12571,18 +13726,17 @@ def sdr_measure(data: dict = Body(...)):
     tcp_host        = str(data.get("rtl_tcp_host", _RTL_TCP_DEFAULT_HOST))
     tcp_port        = int(data.get("rtl_tcp_port", _RTL_TCP_DEFAULT_PORT))
 
-    # Clamp nfft to nearest power-of-2 in [64, 2048]
-    # Use `nfft * 2 <= min(nfft_req, 2048)` so we can actually reach 2048.
-    nfft = 64
-    while nfft * 2 <= min(nfft_req, 2048):
-        nfft *= 2
+    # Clamp nfft to the largest power-of-2 <= nfft_req within [64, 2048]
+    nfft = 1 << (min(max(nfft_req, 64), 2048).bit_length() - 1)
 
     center_freq_hz  = freq_mhz * 1e6
     sample_rate_hz  = sample_rate_mhz * 1e6
 
     result = _get_spectrum_data(center_freq_hz, sample_rate_hz, gain, nfft, tcp_host, tcp_port)
 
-    return {
+    # The numpy paths hand back a float32 ndarray; FastJSONResponse writes it
+    # directly via orjson instead of boxing every bin into a Python float.
+    return FastJSONResponse({
         "spectrum":        result["spectrum"],
         "source":          result["source"],
         "nfft":            nfft,
@@ -12592,7 +13746,7 @@ def sdr_measure(data: dict = Body(...)):
         "sample_rate_mhz": sample_rate_mhz,
         "bw_per_bin_hz":   sample_rate_hz / nfft,
         "timestamp":       datetime.now(timezone.utc).isoformat(),
-    }
+    })
 
 
 @app.get("/api/dependencies/check", summary="Check hardware and software dependencies")
@@ -12660,6 +13814,13 @@ def check_dependencies():
             "install": "pip install numpy",
             "description": "Fast FFT for SDR spectrum analysis",
         },
+        {
+            "name": "scipy",
+            "required": False,
+            "present": _SCIPY_FFT,
+            "install": "pip install scipy",
+            "description": "Multithreaded FFT for SDR spectrum analysis (optional, numpy is the fallback)",
+        },
     ]
 
     # --- System tool checks ---
@@ -12793,7 +13954,7 @@ async def sdr_audio_stream(
         async def _rtl_fm_stream():
             yield wav_hdr
             try:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 while True:
                     chunk = await loop.run_in_executor(None, proc.stdout.read, 4096)
                     if not chunk:
@@ -12815,6 +13976,9 @@ async def sdr_audio_stream(
         N_SAMPLES = SDR_RATE * 2
         dec       = max(1, SDR_RATE // audio_rate)
         wav_hdr   = _make_wav_header(audio_rate, 1, 16)
+        # Moving-average anti-alias kernel applied before decimating to audio_rate
+        taps      = min(dec, _SDR_AUDIO_FIR_MAX_TAPS)
+        fir       = _np.full(taps, 1.0 / taps, dtype=_np.float32) if taps > 1 else None
 
         async def _numpy_fm_stream():
             yield wav_hdr
@@ -12823,12 +13987,15 @@ async def sdr_audio_stream(
                 sdr.sample_rate = SDR_RATE
                 sdr.center_freq = frequency_mhz * 1e6
                 sdr.gain        = gain
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 while True:
                     samples = await loop.run_in_executor(None, sdr.read_samples, N_SAMPLES)
                     iq    = _np.array(samples)
-                    phase = _np.angle(iq[1:] * _np.conj(iq[:-1]))
-                    audio = phase[::dec]
+                    phase = _np.angle(iq[1:] * _np.conj(iq[:-1])).astype(_np.float32)
+                    if fir is not None:
+                        phase = _np.convolve(phase, fir, mode="same")
+                    # Contiguous copy so clip + int16 cast run over a dense buffer
+                    audio = _np.ascontiguousarray(phase[::dec])
                     pcm   = _np.clip(audio * (32767.0 / _np.pi), -32768, 32767).astype(_np.int16)
                     yield pcm.tobytes()
             except Exception as exc:
@@ -13850,9 +15017,91 @@ def catch_all(full_path: str, request: Request):
 # -------------------------
 # Run (development)
 # -------------------------
+def _select_uvicorn_impls() -> Tuple[str, str]:
+    """Return the (loop, http) implementations to hand to uvicorn.
+
+    Prefers uvloop (libuv event loop) and httptools (C HTTP parser), both
+    shipped with ``uvicorn[standard]``.  uvloop does not support Windows, and
+    either package may be missing on minimal installs — in that case fall back
+    to asyncio / h11 and tell the operator.
+    """
+    import importlib.util as _iutil
+
+    loop_impl = "asyncio"
+    if sys.platform != "win32":
+        if _iutil.find_spec("uvloop") is not None:
+            loop_impl = "uvloop"
+        else:
+            logger.warning("uvloop not installed - using the asyncio event loop (pip install uvicorn[standard])")
+    http_impl = "h11"
+    if _iutil.find_spec("httptools") is not None:
+        http_impl = "httptools"
+    else:
+        logger.warning("httptools not installed - using the pure-Python h11 parser (pip install uvicorn[standard])")
+    return loop_impl, http_impl
+
+
+def _create_server_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Create the listening TCP socket for the single-process server.
+
+    SO_REUSEADDR lets a relaunched server bind immediately while connections
+    of the previous process are still in TIME_WAIT.  Windows has no such
+    TIME_WAIT bind problem, and its SO_REUSEADDR would let a second process
+    bind the port while this one listens, so it gets SO_EXCLUSIVEADDRUSE
+    instead.  SO_REUSEPORT is not set: a second (or stale) instance must fail
+    to bind rather than silently split connections with this one.
+    SO_KEEPALIVE lets the kernel reap connections of mobile clients that
+    dropped off the network, and TCP_NODELAY (inherited by accepted sockets on
+    Linux; asyncio/uvloop also set it per connection) keeps small JSON
+    responses from waiting on Nagle's algorithm.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        if os.name == "nt":
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+        else:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.bind((host, port))
+        sock.listen(backlog)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+# Horizontal rule framing the startup banner, and the pre-joined banner header
+_BANNER_RULE = "=" * 60
+_STARTUP_BANNER_HEADER = "\n".join((_BANNER_RULE, "  LPU5 TACTICAL TRACKER - Server Starting", _BANNER_RULE))
+
+# TLS 1.3 session tickets handed out per full handshake (OpenSSL default: 2);
+# one per parallel connection a mobile browser typically opens.
+_TLS_SESSION_TICKETS = 4
+
+
+def _build_server_ssl_context(cert_file: str, key_file: str) -> ssl.SSLContext:
+    """Build the HTTPS server context once, reusing TLS sessions across reconnects.
+
+    TLS 1.3 only: a full handshake costs one round trip, and the session
+    tickets issued after it let returning clients (phones re-opening
+    landing.html / the camera page) resume without asymmetric crypto.
+    OpenSSL also keeps its default server-side session cache.
+    """
+    ctx = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    ctx.minimum_version = ssl.TLSVersion.TLSv1_3
+    ctx.options |= ssl.OP_NO_COMPRESSION
+    ctx.num_tickets = _TLS_SESSION_TICKETS
+    ctx.load_cert_chain(cert_file, key_file)
+    ctx.set_alpn_protocols(["http/1.1"])
+    return ctx
+
+
 if __name__ == "__main__":
     import uvicorn
     
+    loop_impl, http_impl = _select_uvicorn_impls()
+    
     # Detect local network IP
     local_ip, all_detected_ips = get_local_ip()
     
@@ -13863,9 +15112,9 @@ if __name__ == "__main__":
     
     # AUTO-GENERATE SSL CERTIFICATES IF NOT PRESENT (HTTPS by default)
     if not use_ssl:
-        logger.info("="*60)
+        logger.info(_BANNER_RULE)
         logger.info("  SSL certificates not found - Generating automatically...")
-        logger.info("="*60)
+        logger.info(_BANNER_RULE)
         try:
             # Try to import generate_cert module
             from generate_cert import generate_self_signed_cert
@@ -13877,73 +15126,129 @@ if __name__ == "__main__":
             else:
                 logger.warning("  Certificate generation failed - falling back to HTTP")
         except Exception as e:
-            logger.warning(f"  Could not generate SSL certificates: {e}")
+            logger.warning("  Could not generate SSL certificates: %s", e)
             logger.warning("  Server will start in HTTP mode")
             logger.info("  To enable HTTPS manually, run: python generate_cert.py")
-        logger.info("="*60)
-    
-    protocol = "https" if use_ssl else "http"
-    
-    logger.info("="*60)
-    logger.info("  LPU5 TACTICAL TRACKER - Server Starting")
-    logger.info("="*60)
-    logger.info(f"  Primary Network IP: {local_ip}")
+        logger.info(_BANNER_RULE)
     
-    # Display all detected IPs for transparency
-    if all_detected_ips and len(all_detected_ips) > 1:
-        logger.info(f"  All Detected IPs: {', '.join(all_detected_ips)}")
-    
-    # Highlight if the WLAN IP (192.168.8.x) is detected
-    # Check if primary_ip is already the WLAN IP (most efficient)
-    if local_ip.startswith("192.168.8."):
-        logger.info(f"  *** WLAN IP (192.168.8.x) DETECTED: {local_ip} ***")
-        logger.info(f"  *** Use this IP to access from your mobile device! ***")
-    
-    logger.info(f"  Server will bind to: 0.0.0.0:8101 (all interfaces)")
-    
-    # SSL/HTTPS Status
+    # Parse the PEM chain exactly once, in this process, before announcing
+    # HTTPS — a corrupt or mismatched key/cert falls back to HTTP here instead
+    # of crashing inside uvicorn after the banner.
+    ssl_context = None
     if use_ssl:
-        logger.info("  *** HTTPS ENABLED with SSL certificates ***")
-        logger.info("  *** Camera access will work on all devices! ***")
-        logger.info("  Note: You may need to accept the self-signed certificate in your browser")
-    else:
-        logger.info("  HTTP Mode (no SSL certificates found)")
-        logger.info("  Camera access requires localhost or HTTPS")
-        logger.info("  To enable HTTPS: Generate cert.pem and key.pem in the project root")
-    
-    logger.info(f"  Access URLs:")
-    logger.info(f"    - From this device: {protocol}://127.0.0.1:8101/landing.html")
-    logger.info(f"    - From network:     {protocol}://{local_ip}:8101/landing.html")
-    
-    # Additional access URLs for each detected IP (avoid duplicates)
-    if all_detected_ips:
-        alternative_ips = [ip for ip in all_detected_ips if ip != local_ip]
-        if alternative_ips:
-            logger.info(f"  Alternative Network URLs:")
-            for ip in alternative_ips:
-                logger.info(f"    - {protocol}://{ip}:8101/landing.html")
+        try:
+            ssl_context = _build_server_ssl_context(cert_file, key_file)
+        except (OSError, ssl.SSLError) as e:
+            logger.warning("  Could not load SSL certificates (%s) - falling back to HTTP", e)
+            use_ssl = False
     
-    logger.info("="*60)
+    protocol = "https" if use_ssl else "http"
+    # What /api/server_info and the QR endpoints report, here and in workers
+    _SERVER_SSL = use_ssl
+    os.environ["LPU5_SERVER_SSL"] = "1" if use_ssl else "0"
     
-    # Run with or without SSL
-    if use_ssl:
-        uvicorn.run(
-            app, 
-            host="0.0.0.0", 
-            port=8101, 
-            log_level="warning",
-            ssl_certfile=cert_file,
-            ssl_keyfile=key_file,
-            timeout_keep_alive=300,
-            timeout_graceful_shutdown=60,
-            limit_concurrency=1000
-        )
+    # Worker processes (config.json "server_workers", default 1).  Every worker
+    # imports api.py and runs the lifespan on its own, so WebSocket clients,
+    # in-memory caches and the singleton services (CoT listener, TAK receiver,
+    # data server, sync threads) are duplicated per worker.  Keep the default
+    # single process unless those features are disabled.
+    try:
+        workers = max(1, int((load_json("config") or {}).get("server_workers", 1)))
+    except (TypeError, ValueError):
+        workers = 1
+    # uvicorn needs an import string (not the app object) to spawn workers
+    app_target = "api:app" if workers > 1 else app
+    # A single worker serves this very module: the sync/download write
+    # versions are authoritative
+    _SINGLE_PROCESS_SERVER = workers == 1
+    
+    # Startup banner.  Writing ~25 lines to a slow serial console (Pi UART)
+    # delays the first accepted request; LPU5_QUIET=1 skips it — the same
+    # access URLs are available on demand from GET /api/server_info.
+    if os.environ.get("LPU5_QUIET") != "1":
+        logger.info(_STARTUP_BANNER_HEADER)
+        logger.info("  Primary Network IP: %s", local_ip)
+
+        # Display all detected IPs for transparency
+        if all_detected_ips and len(all_detected_ips) > 1:
+            logger.info("  All Detected IPs: %s", ", ".join(all_detected_ips))
+
+        # Highlight if the WLAN IP (192.168.8.x) is detected
+        # Check if primary_ip is already the WLAN IP (most efficient)
+        if local_ip.startswith("192.168.8."):
+            logger.info("  *** WLAN IP (192.168.8.x) DETECTED: %s ***", local_ip)
+            logger.info("  *** Use this IP to access from your mobile device! ***")
+
+        logger.info("  Server will bind to: 0.0.0.0:8101 (all interfaces)")
+
+        # SSL/HTTPS Status
+        if use_ssl:
+            logger.info("  *** HTTPS ENABLED with SSL certificates ***")
+            logger.info("  *** Camera access will work on all devices! ***")
+            logger.info("  Note: You may need to accept the self-signed certificate in your browser")
+        else:
+            logger.info("  HTTP Mode (no SSL certificates found)")
+            logger.info("  Camera access requires localhost or HTTPS")
+            logger.info("  To enable HTTPS: Generate cert.pem and key.pem in the project root")
+
+        # Access URLs are emitted as one multi-line record (one handler pass);
+        # skip building them entirely when INFO is filtered out.
+        if logger.isEnabledFor(logging.INFO):
+            access_lines = [
+                "  Access URLs:",
+                "    - From this device: %s://127.0.0.1:8101/landing.html" % protocol,
+                "    - From network:     %s://%s:8101/landing.html" % (protocol, local_ip),
+            ]
+
+            # Additional access URLs for each detected IP (avoid duplicates)
+            alternative_ips = tuple(ip for ip in (all_detected_ips or ()) if ip != local_ip)
+            if alternative_ips:
+                access_lines.append("  Alternative Network URLs:")
+                access_lines.extend("    - %s://%s:8101/landing.html" % (protocol, ip) for ip in alternative_ips)
+
+            logger.info("%s", "\n".join(access_lines))
+        logger.info(_BANNER_RULE)
+    
+    if workers > 1:
+        logger.warning("  Running %d worker processes - WebSocket broadcasts and "
+                       "background services are per-worker", workers)
+    
+    server_kwargs = dict(
+        host="0.0.0.0",
+        port=8101,
+        log_level="warning",
+        loop=loop_impl,
+        http=http_impl,
+        timeout_keep_alive=75,
+        timeout_graceful_shutdown=60,
+        limit_concurrency=1000,
+        backlog=2048,
+        # Per-connection memory caps.  h11 buffers at most 16 KiB of an
+        # unfinished request head (httptools bounds its parser state itself);
+        # 1 MiB per WebSocket message leaves ample headroom for the 720p
+        # JPEG camera_frame messages, the largest frames clients send.
+        h11_max_incomplete_event_size=16 * 1024,
+        ws_max_size=1024 * 1024,
+        # Negotiate permessage-deflate with browsers: the repetitive marker /
+        # overlay sync JSON shrinks several-fold on the wire.  Kept explicit so
+        # it is not lost if uvicorn's default changes.
+        ws_per_message_deflate=True,
+    )
+    if workers > 1:
+        # uvicorn's supervisor binds the socket.  Config (including any SSL
+        # context) is pickled to the spawned workers and SSLContext objects
+        # cannot be pickled, so workers load the certificate files themselves.
+        if use_ssl:
+            server_kwargs.update(ssl_certfile=cert_file, ssl_keyfile=key_file)
+        uvicorn.run(app_target, workers=workers, **server_kwargs)
     else:
-        uvicorn.run(
-            app,
-            host="0.0.0.0",
-            port=8101,
-            log_level="warning",
-            timeout_keep_alive=300,
-            timeout_graceful_shutdown=60
-        )
\ No newline at end of file
+        # Drive Config + Server directly (what uvicorn.run() wraps) so the
+        # pre-built SSL context and listening socket can be injected.  No
+        # reloader: both objects belong to this process.  Server.run() creates
+        # the uvloop/asyncio loop selected above and installs the SIGINT/SIGTERM
+        # handlers for graceful shutdown.
+        server_config = uvicorn.Config(app, reload=False, **server_kwargs)
+        server_config.load()
+        server_config.ssl = ssl_context
+        server = uvicorn.Server(server_config)
+        server.run(sockets=[_create_server_socket("0.0.0.0", 8101)])
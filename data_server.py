@@ -165,6 +165,8 @@ class DataServerConnectionManager:
     # Per-message send timeout (seconds). Prevents a dead or slow WebSocket from
     # blocking the event loop while iterating over all channel subscribers.
     _SEND_TIMEOUT = 5.0
+    # Clients per gather() in a broadcast before yielding to the event loop.
+    _FANOUT_BATCH = 50
 
     async def send_to_connection(self, connection_id: str, message: dict):
         """Send a message to a specific connection.
@@ -208,36 +210,12 @@ class DataServerConnectionManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.now(timezone.utc).isoformat()
 
-        # Build list of (connection_id, send-coroutine) for active subscribers only.
-        targets = []
-        for connection_id in subscribers:
-            if exclude and connection_id == exclude:
-                continue
-            if connection_id in self.active_connections:
-                targets.append((
-                    connection_id,
-                    asyncio.wait_for(
-                        self.active_connections[connection_id].send_json(message),
-                        timeout=self._SEND_TIMEOUT,
-                    ),
-                ))
-
-        if not targets:
-            return
-
-        # Send to all targets in parallel; collect exceptions rather than raising.
-        results = await asyncio.gather(
-            *[coro for _, coro in targets],
-            return_exceptions=True,
-        )
-
-        for (connection_id, _), result in zip(targets, results):
-            if isinstance(result, Exception):
-                logger.error(f"Failed to broadcast to {connection_id}: {result}")
-                self.disconnect(connection_id)
-            elif connection_id in self.connection_metadata:
-                self.connection_metadata[connection_id]["messages_sent"] += 1
-                self.connection_metadata[connection_id]["last_activity"] = datetime.now(timezone.utc).isoformat()
+        targets = [
+            connection_id for connection_id in subscribers
+            if connection_id in self.active_connections
+            and not (exclude and connection_id == exclude)
+        ]
+        await self._fan_out(targets, message)
 
     async def broadcast_to_all(self, message: dict):
         """Broadcast a message to all connected clients.
@@ -250,34 +228,47 @@ class DataServerConnectionManager:
         if "timestamp" not in message:
             message["timestamp"] = datetime.now(timezone.utc).isoformat()
 
-        # Build (connection_id, coroutine) pairs so the zip stays aligned.
-        targets = [
-            (
-                cid,
-                asyncio.wait_for(
-                    self.active_connections[cid].send_json(message),
-                    timeout=self._SEND_TIMEOUT,
-                ),
-            )
-            for cid in list(self.active_connections.keys())
-            if cid in self.active_connections
-        ]
+        await self._fan_out(list(self.active_connections.keys()), message)
 
-        if not targets:
-            return
+    async def _send_text(self, connection_id: str, text: str) -> bool:
+        websocket = self.active_connections.get(connection_id)
+        if websocket is None:
+            return False
+        await asyncio.wait_for(websocket.send_text(text), timeout=self._SEND_TIMEOUT)
+        return True
 
-        results = await asyncio.gather(
-            *[coro for _, coro in targets],
-            return_exceptions=True,
-        )
+    async def _fan_out(self, connection_ids: list, message: dict):
+        """Send *message* to *connection_ids* in parallel batches.
 
-        for (connection_id, _), result in zip(targets, results):
+        The message is JSON-encoded once and the same text frame is sent to
+        every client.  Sends go out in batches of ``_FANOUT_BATCH`` with a
+        yield to the event loop in between, and failed connections are
+        disconnected in one sweep afterwards.
+        """
+        if not connection_ids:
+            return
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+        results = []
+        for i in range(0, len(connection_ids), self._FANOUT_BATCH):
+            batch = connection_ids[i:i + self._FANOUT_BATCH]
+            results.extend(await asyncio.gather(
+                *[self._send_text(cid, text) for cid in batch],
+                return_exceptions=True,
+            ))
+            if i + self._FANOUT_BATCH < len(connection_ids):
+                await asyncio.sleep(0)
+
+        sent_at = datetime.now(timezone.utc).isoformat()
+        for connection_id, result in zip(connection_ids, results):
+            if result is False:
+                continue  # disconnected while an earlier batch was sending
             if isinstance(result, Exception):
                 logger.error(f"Failed to broadcast to {connection_id}: {result}")
                 self.disconnect(connection_id)
             elif connection_id in self.connection_metadata:
                 self.connection_metadata[connection_id]["messages_sent"] += 1
-                self.connection_metadata[connection_id]["last_activity"] = datetime.now(timezone.utc).isoformat()
+                self.connection_metadata[connection_id]["last_activity"] = sent_at
     
     async def join_group(self, connection_id: str, group_name: str):
         """
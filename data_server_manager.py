@@ -200,7 +200,8 @@ class DataServerManager:
             logger.error(f"Failed to get data server status: {e}")
             return None
     
-    def broadcast(self, channel: str, message_type: str, data: dict) -> bool:
+    def broadcast(self, channel: str, message_type: str, data: dict,
+                  encoded: Optional[bytes] = None) -> bool:
         """
         Broadcast data to clients via the data server (non-blocking).
         
@@ -211,6 +212,9 @@ class DataServerManager:
             channel: Channel to broadcast on (e.g., 'markers', 'drawings')
             message_type: Type of message (e.g., 'marker_created', 'marker_updated')
             data: Data to broadcast
+            encoded: Optional JSON body the caller already encoded (an object
+                with at least channel/type/data); posted as-is instead of
+                serialising the payload again
             
         Returns:
             True if broadcast was submitted, False otherwise
@@ -221,7 +225,7 @@ class DataServerManager:
                 "type": message_type,
                 "data": data
             }
-            self._broadcast_executor.submit(self._do_broadcast, payload)
+            self._broadcast_executor.submit(self._do_broadcast, payload, encoded=encoded)
             return True
         except RuntimeError as e:
             # Executor was shut down (e.g. during application shutdown) – not an error
@@ -231,14 +235,18 @@ class DataServerManager:
             logger.error(f"Failed to submit broadcast: {e}")
             return False
 
-    def _do_broadcast(self, payload: dict, _retries: int = 1) -> None:
+    def _do_broadcast(self, payload: dict, _retries: int = 1, encoded: Optional[bytes] = None) -> None:
         """Execute the actual HTTP broadcast in a background thread."""
+        if encoded is not None:
+            body = {"data": encoded, "headers": {"Content-Type": "application/json"}}
+        else:
+            body = {"json": payload}
         for attempt in range(_retries + 1):
             try:
                 response = self._broadcast_session.post(
                     f"{self.base_url}/api/broadcast",
-                    json=payload,
-                    timeout=3
+                    timeout=3,
+                    **body
                 )
                 if response.status_code == 200:
                     logger.debug(f"Broadcast to channel '{payload.get('channel')}' successful")
@@ -6,9 +6,19 @@ import os
 # Use SQLite for simplicity and portability
 DATABASE_URL = "sqlite:///./tactical.db"
 
+# Sized for FastAPI's threadpool (40 workers by default) so sync endpoints do
+# not queue on the default 5+10 pool; override via env on busier deployments.
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "40"))
+
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
+    # timeout: wait up to 30 s on a locked database instead of failing fast
+    connect_args={"check_same_thread": False, "timeout": 30},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_recycle=1800,
     pool_pre_ping=True,
 )
 
@@ -23,6 +33,8 @@ def _set_sqlite_pragmas(dbapi_connection, connection_record):
     * cache_size -64000 – ~64 MB page cache keeps hot data in memory.
     * mmap_size 268435456 – 256 MB memory-mapped I/O reduces syscalls.
     * temp_store MEMORY – temp tables / indices live in RAM.
+    * journal_size_limit 64 MB – truncates the -wal file after checkpoints so
+      write bursts (audit batches, meshtastic upserts) do not leave it large.
     """
     cursor = dbapi_connection.cursor()
     cursor.execute("PRAGMA journal_mode=WAL")
@@ -30,6 +42,7 @@ def _set_sqlite_pragmas(dbapi_connection, connection_record):
     cursor.execute("PRAGMA cache_size=-64000")
     cursor.execute("PRAGMA mmap_size=268435456")
     cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA journal_size_limit=67108864")
     cursor.close()
 
 
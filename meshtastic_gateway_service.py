@@ -72,6 +72,7 @@ class MeshtasticGatewayService:
         self.base_path = base_path or os.path.dirname(os.path.abspath(__file__))
         self.interface: Optional[object] = None
         self.running = False
+        self._stop_event = threading.Event()  # wakes sync_loop immediately on stop()
         self.sync_thread: Optional[threading.Thread] = None
         self.broadcast_callback = broadcast_callback  # Optional callback for WebSocket broadcasts
         self._send_data_port_kwarg: Optional[str] = None
@@ -524,11 +525,9 @@ class MeshtasticGatewayService:
             except Exception as e:
                 logger.error(f"Error in sync loop: {e}")
             
-            # Sleep in small intervals for clean shutdown
-            for _ in range(interval):
-                if not self.running:
-                    break
-                time.sleep(1)
+            # Event.wait returns True as soon as stop() sets the event
+            if self._stop_event.wait(max(1, interval)):
+                break
         
         logger.info("Sync loop stopped")
     
@@ -539,6 +538,7 @@ class MeshtasticGatewayService:
             return False
         
         self.running = True
+        self._stop_event.clear()
         
         # Initial full sync
         time.sleep(2)  # Wait for device initialization
@@ -563,6 +563,7 @@ class MeshtasticGatewayService:
         """Stop the gateway service"""
         logger.info("Stopping gateway service...")
         self.running = False
+        self._stop_event.set()
         
         # Wait for sync thread to finish
         if self.sync_thread and self.sync_thread.is_alive():
@@ -96,7 +96,8 @@ def migrate():
                 color=m.get("color", "#ffffff"),
                 icon=m.get("icon", "default"),
                 created_by=m.get("created_by") or m.get("username"),
-                data=m # Store full object as JSON payload for flexibility
+                data=m, # Store full object as JSON payload for flexibility
+                external_id=m.get("unit_id") if m.get("created_by") in ("import_meshtastic", "meshtastic_sync", "ingest_node") else None
             )
             db.add(marker)
     print(f"Migrated {len(markers_data)} markers.")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, JSON, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime, timezone
@@ -24,7 +24,7 @@ class User(Base):
     group_id = Column(String, default="users")
     unit = Column(String, nullable=True)
     unit_id = Column(String, ForeignKey("units.id"), nullable=True)
-    device = Column(String, nullable=True)
+    device = Column(String, nullable=True, index=True)
     rank = Column(String, nullable=True)
     fullname = Column(String, nullable=True)
     callsign = Column(String, nullable=True)
@@ -47,9 +47,15 @@ class MapMarker(Base):
     type = Column(String)  # friendly, hostile, neutral, unknown
     color = Column(String, default="#ffffff")
     icon = Column(String, default="default")
-    created_by = Column(String, ForeignKey("users.username"), nullable=True)
+    created_by = Column(String, ForeignKey("users.username"), nullable=True, index=True)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     data = Column(JSON, nullable=True)  # Extra properties
+    external_id = Column(String, nullable=True, index=True)  # Source-system ID (e.g. Meshtastic node ID)
+
+    __table_args__ = (
+        # Lookups by marker type, optionally narrowed by creator (symbols, GPS, mesh nodes)
+        Index("ix_map_markers_type_created_by", "type", "created_by"),
+    )
 
 class Mission(Base):
     __tablename__ = "missions"
@@ -166,7 +172,7 @@ class APISession(Base):
     id = Column(String, primary_key=True, default=generate_uuid)
     token = Column(String, index=True)
     user_id = Column(String, ForeignKey("users.id"))
-    username = Column(String)
+    username = Column(String, unique=True, index=True)  # one session per user (save_session upserts on it)
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     expires_at = Column(DateTime)
     ip = Column(String, nullable=True)
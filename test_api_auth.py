@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for api.py's JWT helpers (generate_token / verify_token).
+
+Tokens with the server's own HS256 header are checked by a hand-rolled HMAC
+fast path; everything else goes through PyJWT.  Both paths must reject the
+same forged, expired and malformed tokens.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import tempfile
+import time
+import unittest
+
+_IMPORT_DIR = tempfile.TemporaryDirectory()
+_cwd = os.getcwd()
+try:
+    # database.py opens ./tactical.db relative to the working directory
+    os.chdir(_IMPORT_DIR.name)
+    import api
+    import jwt
+except ImportError:  # FastAPI/SQLAlchemy/PyJWT stack not installed
+    api = None
+finally:
+    os.chdir(_cwd)
+
+
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _sign(payload, header=None, secret=None):
+    """Build an HS256 token by hand, with the server's header unless *header* is given."""
+    header_b64 = _b64(json.dumps(header).encode()) if header else api._JWT_HEADER_B64.decode()
+    signing_input = header_b64 + "." + _b64(json.dumps(payload).encode())
+    key = (secret or api.JWT_SECRET).encode()
+    return signing_input + "." + _b64(hmac.new(key, signing_input.encode(), hashlib.sha256).digest())
+
+
+@unittest.skipIf(api is None, "api dependencies are not installed")
+class TestVerifyToken(unittest.TestCase):
+    def test_round_trip(self):
+        payload = api.verify_token(api.generate_token("u1", "alice"))
+        self.assertEqual((payload["user_id"], payload["username"]), ("u1", "alice"))
+        self.assertGreater(payload["exp"], time.time())
+
+    def test_interoperates_with_pyjwt(self):
+        token = api.generate_token("u1", "alice")
+        self.assertEqual(jwt.decode(token, api.JWT_SECRET, algorithms=["HS256"])["username"], "alice")
+        # PyJWT's header differs from ours, so this takes the jwt.decode path
+        other = jwt.encode({"user_id": "u2", "username": "bob", "exp": int(time.time()) + 60},
+                           api.JWT_SECRET, algorithm="HS256")
+        self.assertEqual(api.verify_token(other)["username"], "bob")
+
+    def test_tampered_signature(self):
+        token = api.generate_token("u1", "alice")
+        head, _, sig = token.rpartition(".")
+        flipped = ("A" if sig[0] != "A" else "B") + sig[1:]
+        self.assertIsNone(api.verify_token(head + "." + flipped))
+        self.assertIsNone(api.verify_token(token + "!"))
+        self.assertIsNone(api.verify_token(token + "A"))
+        self.assertIsNone(api.verify_token(head + "."))
+
+    def test_tampered_payload(self):
+        header, _, sig = api.generate_token("u1", "alice").split(".")
+        forged = _b64(json.dumps({"user_id": "u1", "username": "administrator"}).encode())
+        self.assertIsNone(api.verify_token(header + "." + forged + "." + sig))
+
+    def test_wrong_secret(self):
+        self.assertIsNone(api.verify_token(_sign({"user_id": "u1"}, secret="not-the-secret")))
+
+    def test_tampered_header_and_alg(self):
+        claims = {"user_id": "u1", "username": "alice"}
+        # alg "none" with an empty signature
+        unsigned = _b64(b'{"alg":"none","typ":"JWT"}') + "." + _b64(json.dumps(claims).encode()) + "."
+        self.assertIsNone(api.verify_token(unsigned))
+        # correctly keyed, but an algorithm other than the pinned HS256
+        hs512 = jwt.encode(claims, api.JWT_SECRET, algorithm="HS512")
+        self.assertIsNone(api.verify_token(hs512))
+        # our signature, re-labelled with a different header
+        _, payload_b64, sig = api.generate_token("u1", "alice").split(".")
+        relabelled = _b64(b'{"alg":"HS384","typ":"JWT"}') + "." + payload_b64 + "." + sig
+        self.assertIsNone(api.verify_token(relabelled))
+
+    def test_expired(self):
+        now = int(time.time())
+        self.assertIsNone(api.verify_token(_sign({"user_id": "u1", "exp": now - 1})))
+        self.assertIsNone(api.verify_token(_sign({"user_id": "u1", "exp": "never"})))
+
+    def test_not_yet_valid(self):
+        now = int(time.time())
+        self.assertIsNone(api.verify_token(_sign({"user_id": "u1", "nbf": now + 3600})))
+        self.assertIsNone(api.verify_token(_sign({"user_id": "u1", "iat": now + 3600})))
+        self.assertIsNotNone(api.verify_token(_sign({"user_id": "u1", "nbf": now - 1, "exp": now + 60})))
+
+    def test_non_object_payload(self):
+        self.assertIsNone(api.verify_token(_sign(["u1"])))
+
+    def test_malformed_segment_count(self):
+        token = api.generate_token("u1", "alice")
+        for bad in ("", "abc", token.rsplit(".", 1)[0], token + ".extra", "a.b.c.d", "é.é.é"):
+            self.assertIsNone(api.verify_token(bad), bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
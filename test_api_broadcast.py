@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the coalescing of WebSocket update broadcasts in api.py."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+_IMPORT_DIR = tempfile.TemporaryDirectory()
+_cwd = os.getcwd()
+try:
+    # database.py opens ./tactical.db relative to the working directory
+    os.chdir(_IMPORT_DIR.name)
+    import api
+except ImportError:  # FastAPI/SQLAlchemy stack not installed
+    api = None
+finally:
+    os.chdir(_cwd)
+
+
+@unittest.skipIf(api is None, "api dependencies are not installed")
+class TestBroadcastCoalescing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sent = []
+        for patcher in (
+            mock.patch.object(api, "_dispatch_broadcast",
+                              side_effect=lambda channel, event, data, frame: self.sent.append((event, data))),
+            mock.patch.object(api, "_PENDING_BROADCASTS", {}),
+            mock.patch.object(api, "_BROADCAST_FLUSH_SCHEDULED", False),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def wait_window(self):
+        await asyncio.sleep(api._BROADCAST_COALESCE_SECONDS * 3)
+
+    async def test_burst_is_sent_once_with_newest_state(self):
+        for lat in (1, 2, 3):
+            api.broadcast_websocket_update("markers", "marker_updated", {"id": "m1", "lat": lat})
+        api.broadcast_websocket_update("markers", "marker_updated", {"id": "m2", "lat": 9})
+        self.assertEqual(self.sent, [])
+        await self.wait_window()
+        self.assertEqual(self.sent, [("marker_updated", {"id": "m1", "lat": 3}),
+                                     ("marker_updated", {"id": "m2", "lat": 9})])
+
+    async def test_one_flush_task_per_window(self):
+        with mock.patch.object(api, "_spawn_broadcast", wraps=api._spawn_broadcast) as spawn:
+            for lat in range(5):
+                api.broadcast_websocket_update("markers", "marker_updated", {"id": f"m{lat}", "lat": lat})
+            self.assertEqual(spawn.call_count, 1)
+            await self.wait_window()
+            api.broadcast_websocket_update("markers", "marker_updated", {"id": "m1", "lat": 7})
+            self.assertEqual(spawn.call_count, 2)
+        await self.wait_window()
+        self.assertEqual(len(self.sent), 6)
+
+    async def test_updates_from_worker_threads_flush_on_the_loop(self):
+        with mock.patch.object(api, "_MAIN_EVENT_LOOP", asyncio.get_running_loop()):
+            await asyncio.get_running_loop().run_in_executor(
+                None, api.broadcast_websocket_update, "markers", "marker_updated", {"id": "m1"})
+            await self.wait_window()
+        self.assertEqual(self.sent, [("marker_updated", {"id": "m1"})])
+
+    async def test_delete_drops_held_update(self):
+        api.broadcast_websocket_update("markers", "marker_updated", {"id": "m1", "lat": 1})
+        api.broadcast_websocket_update("markers", "marker_deleted", {"id": "m1"})
+        await self.wait_window()
+        self.assertEqual(self.sent, [("marker_deleted", {"id": "m1"})])
+
+    def test_without_event_loop_updates_are_sent_immediately(self):
+        with mock.patch.object(api, "_MAIN_EVENT_LOOP", None):
+            api.broadcast_websocket_update("markers", "marker_updated", {"id": "m1"})
+        self.assertEqual(self.sent, [("marker_updated", {"id": "m1"})])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""Tests for api.py storage paths: JSON DBs, sync endpoints and SQL upserts.
+
+Every test runs against a fresh temporary SQLite database and temporary JSON
+DB files; the repository's own data files are never touched.
+"""
+
+import json
+import os
+import queue
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+_IMPORT_DIR = tempfile.TemporaryDirectory()
+_cwd = os.getcwd()
+try:
+    # database.py opens ./tactical.db relative to the working directory
+    os.chdir(_IMPORT_DIR.name)
+    import api
+    import database
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, select
+    from models import APISession, AuditLog, Drawing, MapMarker, MeshtasticNode, Overlay, User
+    from sqlalchemy.exc import IntegrityError
+except ImportError:  # FastAPI/SQLAlchemy stack not installed
+    api = None
+finally:
+    os.chdir(_cwd)
+
+
+@unittest.skipIf(api is None, "api dependencies are not installed")
+class ApiStorageTestCase(unittest.TestCase):
+    """Points api's JSON DBs and SessionLocal at a per-test temporary directory."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        paths = {key: os.path.join(self.tmpdir.name, os.path.basename(path))
+                 for key, path in api.DB_PATHS.items()}
+        patcher = mock.patch.dict(api.DB_PATHS, paths)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for cache in (api._json_cache, api._json_index_cache):
+            cache.clear()
+            self.addCleanup(cache.clear)
+        patcher = mock.patch.object(api, "_SYNC_DOWNLOAD_CACHE", (None, "", b""))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.engine = create_engine(
+            "sqlite:///" + os.path.join(self.tmpdir.name, "tactical.db"),
+            connect_args={"check_same_thread": False},
+        )
+        database.Base.metadata.create_all(bind=self.engine)
+        api.SessionLocal.configure(bind=self.engine)
+        self.client = TestClient(api.app)
+
+    def tearDown(self):
+        api.SessionLocal.configure(bind=database.engine)
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def auth(self, username="alice", user_id="u-alice"):
+        return {"Authorization": "Bearer " + api.generate_token(user_id, username)}
+
+    def rows(self, model):
+        db = api.SessionLocal()
+        try:
+            return db.execute(select(model)).scalars().all()
+        finally:
+            db.close()
+
+
+class TestSyncMarkersUpsert(ApiStorageTestCase):
+    def test_authenticated_sync_upserts_by_id(self):
+        body = {"markers": [{"id": "m1", "lat": 1, "lng": 2, "name": "A"}]}
+        self.client.post("/api/sync/markers", json=body, headers=self.auth())
+        body["markers"][0]["name"] = "B"
+        self.client.post("/api/sync/markers", json=body, headers=self.auth("bob", "u-bob"))
+
+        markers = self.rows(MapMarker)
+        self.assertEqual([(m.id, m.name) for m in markers], [("m1", "B")])
+        # created_by comes from the first writer's token and survives updates
+        self.assertEqual(markers[0].created_by, "alice")
+
+    def test_items_without_id_are_not_persisted(self):
+        body = {"markers": [{"lat": 1, "lng": 2}, {"id": "", "lat": 3, "lng": 4}]}
+        for _ in range(2):
+            resp = self.client.post("/api/sync/markers", json=body, headers=self.auth())
+            self.assertEqual(resp.json()["synced"], 2)
+        self.assertEqual(self.rows(MapMarker), [])
+
+    def test_client_created_by_is_ignored(self):
+        body = {"markers": [{"id": "m1", "lat": 1, "lng": 2, "created_by": "administrator"}]}
+        self.client.post("/api/sync/markers", json=body, headers=self.auth())
+        self.assertEqual(self.rows(MapMarker)[0].created_by, "alice")
+
+    def test_unauthenticated_sync_does_not_write_table(self):
+        body = {"markers": [{"id": "m1", "lat": 1, "lng": 2}]}
+        for headers in ({}, {"Authorization": "Bearer not-a-token"}):
+            resp = self.client.post("/api/sync/markers", json=body, headers=headers)
+            self.assertEqual(resp.json(), {"status": "ok", "synced": 1})
+        self.assertEqual(self.rows(MapMarker), [])
+
+    def test_overlays_and_drawings_are_broadcast_only(self):
+        self.client.post("/api/sync/overlays", json={"overlays": [{"id": "o1"}]}, headers=self.auth())
+        self.client.post("/api/sync/drawings", json={"drawings": [{"id": "d1"}]}, headers=self.auth())
+        self.assertEqual(self.rows(Overlay), [])
+        self.assertEqual(self.rows(Drawing), [])
+
+
+class TestJsonCache(ApiStorageTestCase):
+    def test_save_does_not_cache_the_callers_object(self):
+        nodes = [{"id": "n1"}]
+        api.save_json("meshtastic_nodes", nodes)
+        nodes.append({"id": "n2"})
+        nodes[0]["id"] = "changed"
+        self.assertEqual(api.load_json("meshtastic_nodes"), [{"id": "n1"}])
+
+    def test_load_is_cached_until_the_file_changes(self):
+        api.save_json("meshtastic_nodes", [{"id": "n1"}])
+        first = api.load_json("meshtastic_nodes")
+        self.assertIs(api.load_json("meshtastic_nodes"), first)
+        api.save_json("meshtastic_nodes", [{"id": "n2"}])
+        self.assertEqual(api.load_json("meshtastic_nodes"), [{"id": "n2"}])
+
+
+class TestJsonAppendLog(ApiStorageTestCase):
+    # No shipped DB is log-backed; opt one in for the duration of each test
+    KEY = "meshtastic_messages"
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(api._JSON_LOG_KEYS, {self.KEY: None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def path(self):
+        return api.DB_PATHS[self.KEY]
+
+    def wait_for_compaction(self):
+        for thread in threading.enumerate():
+            if thread.name == "compact-" + self.KEY:
+                thread.join(5)
+
+    def test_append_replays_log_on_top_of_base(self):
+        api.save_json(self.KEY, [{"id": 1}])
+        api.append_json(self.KEY, [{"id": 2}, {"id": 3}])
+        self.assertTrue(os.path.exists(self.path() + ".log"))
+        api._json_cache.clear()
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+    def test_append_does_not_mutate_previously_loaded_list(self):
+        api.save_json(self.KEY, [{"id": 1}])
+        loaded = api.load_json(self.KEY)
+        api.append_json(self.KEY, [{"id": 2}])
+        self.assertEqual(loaded, [{"id": 1}])
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}, {"id": 2}])
+
+    def test_append_respects_cap(self):
+        with mock.patch.dict(api._JSON_LOG_KEYS, {self.KEY: 3}):
+            api.append_json(self.KEY, [{"id": i} for i in range(5)])
+            self.assertEqual(api.load_json(self.KEY), [{"id": 2}, {"id": 3}, {"id": 4}])
+            api._json_cache.clear()
+            self.assertEqual(api.load_json(self.KEY), [{"id": 2}, {"id": 3}, {"id": 4}])
+
+    def test_compact_folds_log_into_base(self):
+        api.append_json(self.KEY, [{"id": 1}, {"id": 2}])
+        api.compact_json(self.KEY)
+        self.assertFalse(os.path.exists(self.path() + ".log"))
+        api._json_cache.clear()
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}, {"id": 2}])
+
+    def test_compaction_runs_in_background_past_threshold(self):
+        with mock.patch.object(api, "_JSON_LOG_COMPACT_BYTES", 1):
+            api.append_json(self.KEY, [{"id": 1}])
+            self.wait_for_compaction()
+        self.assertFalse(os.path.exists(self.path() + ".log"))
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}])
+
+    def test_replay_after_interrupted_compaction_skips_folded_entries(self):
+        api.save_json(self.KEY, [{"id": 0}])
+        api.append_json(self.KEY, [{"id": 1}, {"id": 2}])
+        # Crash between os.replace(base) and os.remove(log): the base file
+        # already holds the log's entries
+        with open(self.path(), "wb") as f:
+            f.write(api._json_dumps([{"id": 0}, {"id": 1}, {"id": 2}]))
+        api._json_cache.clear()
+        self.assertEqual(api.load_json(self.KEY), [{"id": 0}, {"id": 1}, {"id": 2}])
+
+        api.append_json(self.KEY, [{"id": 3}])
+        api._json_cache.clear()
+        self.assertEqual(api.load_json(self.KEY), [{"id": i} for i in range(4)])
+
+    def test_save_folds_log_and_later_appends_survive(self):
+        api.append_json(self.KEY, [{"id": 1}])
+        api.save_json(self.KEY, api.load_json(self.KEY) + [{"id": 2}])
+        self.assertFalse(os.path.exists(self.path() + ".log"))
+        api.append_json(self.KEY, [{"id": 3}])
+        api._json_cache.clear()
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+
+class TestExtendJson(ApiStorageTestCase):
+    KEY = "meshtastic_messages"
+
+    def test_messages_are_not_log_backed(self):
+        # The gateway service rewrites this file directly, outside the log lock
+        self.assertNotIn(self.KEY, api._JSON_LOG_KEYS)
+        api.extend_json(self.KEY, [{"id": 1}])
+        self.assertFalse(os.path.exists(api.DB_PATHS[self.KEY] + ".log"))
+
+    def test_extend_keeps_writes_of_the_gateway_in_order(self):
+        api.extend_json(self.KEY, [{"id": 1}])
+        # The gateway service loads, appends to and rewrites the file itself
+        with open(api.DB_PATHS[self.KEY], "w", encoding="utf-8") as f:
+            json.dump([{"id": 1}, {"id": 2}], f)
+        api.extend_json(self.KEY, [{"id": 3}])
+        self.assertEqual(api.load_json(self.KEY), [{"id": 1}, {"id": 2}, {"id": 3}])
+
+    def test_extend_keeps_the_newest_items_and_the_loaded_list(self):
+        api.save_json(self.KEY, [{"id": 0}])
+        loaded = api.load_json(self.KEY)
+        api.extend_json(self.KEY, [{"id": i} for i in range(1, 5)], cap=3)
+        self.assertEqual(loaded, [{"id": 0}])
+        self.assertEqual(api.load_json(self.KEY), [{"id": 2}, {"id": 3}, {"id": 4}])
+
+
+class TestSyncDownloadETag(ApiStorageTestCase):
+    def download(self, etag=None):
+        headers = self.auth()
+        if etag:
+            headers["If-None-Match"] = etag
+        return self.client.get("/api/sync/download", headers=headers)
+
+    def test_requires_authentication(self):
+        self.assertEqual(self.client.get("/api/sync/download").status_code, 401)
+
+    def test_unchanged_state_answers_304(self):
+        api.save_json("map_markers", [{"id": "m1"}])
+        first = self.download()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json()["markers"], [{"id": "m1"}])
+        etag = first.headers["ETag"]
+
+        again = self.download(etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b"")
+        self.assertEqual(again.headers["ETag"], etag)
+        self.assertEqual(self.download("W/" + etag).status_code, 304)
+        self.assertEqual(self.download('"other", ' + etag).status_code, 304)
+        self.assertEqual(self.download('"other"').status_code, 200)
+
+    def test_write_changes_etag_and_body(self):
+        api.save_json("map_markers", [{"id": "m1"}])
+        etag = self.download().headers["ETag"]
+        api.save_json("map_markers", [{"id": "m1"}, {"id": "m2"}])
+        resp = self.download(etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp.headers["ETag"], etag)
+        self.assertEqual(len(resp.json()["markers"]), 2)
+
+    def test_added_message_changes_etag(self):
+        etag = self.download().headers["ETag"]
+        api.extend_json("meshtastic_messages", [{"id": "x", "text": "hi"}])
+        resp = self.download(etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["messages"], [{"id": "x", "text": "hi"}])
+
+    def test_each_response_gets_a_fresh_timestamp(self):
+        with mock.patch.object(api, "now_iso", side_effect=["t1", "t2"]):
+            self.assertEqual(self.download().json()["timestamp"], "t1")
+            self.assertEqual(self.download().json()["timestamp"], "t2")
+
+
+class TestSyncDownloadWriteVersions(TestSyncDownloadETag):
+    """The same ETag behaviour with in-process write versions instead of stat()."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(api, "_SINGLE_PROCESS_SERVER", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_versions_only_used_in_single_process_mode(self):
+        with mock.patch.object(api, "_SINGLE_PROCESS_SERVER", False):
+            stamps = api._sync_download_stamps()
+        self.assertNotIn("v", [s[0] for s in stamps if isinstance(s, tuple)])
+        self.assertIn(("v", api._json_write_epoch), api._sync_download_stamps())
+
+    def test_external_change_seen_after_restart(self):
+        api.save_json("map_markers", [{"id": "m1"}])
+        etag = self.download().headers["ETag"]
+        # A restarted process starts a new version epoch; the file may have
+        # been replaced while the server was down
+        with open(api.DB_PATHS["map_markers"], "wb") as f:
+            f.write(api._json_dumps([{"id": "restored"}]))
+        api._json_cache.clear()
+        with mock.patch.object(api, "_json_write_epoch", api._json_write_epoch + 1), \
+                mock.patch.dict(api._json_write_versions, clear=True):
+            resp = self.download(etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["markers"], [{"id": "restored"}])
+
+
+class TestMeshtasticMarkerSync(ApiStorageTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, value in (("_forward_meshtastic_node_to_tak", False),
+                            ("_get_cot_listener_endpoint", "10.0.0.1:4242:tcp")):
+            patcher = mock.patch.object(api, name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def add(self, *objects):
+        db = api.SessionLocal()
+        try:
+            for obj in objects:
+                db.merge(obj)
+            db.commit()
+        finally:
+            db.close()
+
+    def markers(self):
+        return {m.id: m for m in self.rows(MapMarker)}
+
+    def test_creates_markers_with_stable_ids(self):
+        self.add(MeshtasticNode(id="!aa", long_name="Alpha", lat=1.5, lng=2.5),
+                 MeshtasticNode(id="!bb", short_name="B",
+                                raw_data={"user": {"role": "router"}}))
+        result = api.sync_meshtastic_nodes_to_map_markers_once()
+        self.assertEqual((result["created"], result["updated"]), (2, 0))
+
+        markers = self.markers()
+        alpha, bravo = markers["mesh-!aa"], markers["mesh-!bb"]
+        self.assertEqual((alpha.name, alpha.lat, alpha.lng, alpha.type), ("Alpha", 1.5, 2.5, "node"))
+        self.assertEqual((bravo.name, bravo.lat, bravo.lng, bravo.type), ("B", 0.0, 0.0, "gateway"))
+        self.assertEqual(alpha.external_id, "!aa")
+        self.assertEqual(alpha.created_by, "import_meshtastic")
+        self.assertEqual(alpha.data["contact_endpoint"], "10.0.0.1:4242:tcp")
+
+    def test_update_merges_into_existing_marker(self):
+        self.add(MeshtasticNode(id="!aa", long_name="Alpha", lat=1.0, lng=1.0))
+        api.sync_meshtastic_nodes_to_map_markers_once()
+        db = api.SessionLocal()
+        try:
+            marker = db.get(MapMarker, "mesh-!aa")
+            marker.data = dict(marker.data, note="keep me")
+            marker.created_by = "ingest_node"
+            db.commit()
+        finally:
+            db.close()
+
+        self.add(MeshtasticNode(id="!aa", long_name="Alpha 2", lat=3.0, lng=4.0))
+        result = api.sync_meshtastic_nodes_to_map_markers_once()
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+
+        markers = self.markers()
+        self.assertEqual(list(markers), ["mesh-!aa"])
+        marker = markers["mesh-!aa"]
+        self.assertEqual((marker.name, marker.lat, marker.lng), ("Alpha 2", 3.0, 4.0))
+        self.assertEqual(marker.created_by, "ingest_node")
+        self.assertEqual(marker.data["note"], "keep me")
+        self.assertEqual(marker.data["unit_id"], "!aa")
+
+    def test_matches_existing_marker_by_external_id(self):
+        self.add(MeshtasticNode(id="!aa", long_name="Alpha", lat=1.0, lng=1.0),
+                 MapMarker(id="legacy-1", lat=0.0, lng=0.0, name="old", type="node",
+                           created_by="meshtastic_sync", external_id="!aa", data={"unit_id": "!aa"}))
+        result = api.sync_meshtastic_nodes_to_map_markers_once()
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+        self.assertEqual(list(self.markers()), ["legacy-1"])
+        self.assertEqual(self.markers()["legacy-1"].lat, 1.0)
+
+
+class TestUserLookup(ApiStorageTestCase):
+    def lookup(self, key):
+        db = api.SessionLocal()
+        try:
+            user = db.execute(api._STMT_USER_BY_ID_OR_USERNAME, {"key": key}).scalars().first()
+            return user and user.id
+        finally:
+            db.close()
+
+    def test_id_match_wins_over_username_match(self):
+        db = api.SessionLocal()
+        try:
+            # Inserted first, so an unordered scan would find it first
+            db.add(User(id="u-1", username="carol"))
+            db.add(User(id="carol", username="dave"))
+            db.commit()
+        finally:
+            db.close()
+        self.assertEqual(self.lookup("carol"), "carol")
+        self.assertEqual(self.lookup("dave"), "carol")
+        self.assertEqual(self.lookup("u-1"), "u-1")
+        self.assertIsNone(self.lookup("erin"))
+
+
+class TestUsersVersion(ApiStorageTestCase):
+    def test_concurrent_user_commits_each_bump_the_version(self):
+        before = api._USERS_VERSION
+
+        def commit_users(worker):
+            for i in range(10):
+                db = api.SessionLocal()
+                try:
+                    db.add(User(id=f"u-{worker}-{i}", username=f"user-{worker}-{i}"))
+                    db.commit()
+                finally:
+                    db.close()
+        threads = [threading.Thread(target=commit_users, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(api._USERS_VERSION - before, 40)
+
+    def test_rolled_back_changes_do_not_bump_the_version(self):
+        before = api._USERS_VERSION
+        db = api.SessionLocal()
+        try:
+            db.add(User(id="u-1", username="carol"))
+            db.flush()
+            db.rollback()
+        finally:
+            db.close()
+        self.assertEqual(api._USERS_VERSION, before)
+
+
+class TestSaveSession(ApiStorageTestCase):
+    def save(self, **fields):
+        db = api.SessionLocal()
+        try:
+            api.save_session(db, dict({"user_id": "u1", "username": "alice"}, **fields))
+        finally:
+            db.close()
+
+    def test_one_session_per_username(self):
+        self.save(token="t1", ip="10.0.0.1", language="en")
+        self.save(token="t2", ip="10.0.0.2",
+                  created_at="2026-01-01T10:00:00+00:00", expires_at="2026-01-02T10:00:00+00:00")
+        self.save(username="bob", user_id="u2", token="t3")
+
+        sessions = {s.username: s for s in self.rows(APISession)}
+        self.assertEqual(sorted(sessions), ["alice", "bob"])
+        alice = sessions["alice"]
+        # The second login replaced every column of the first
+        self.assertEqual((alice.token, alice.ip, alice.data), ("t2", "10.0.0.2", {"language": "de"}))
+        self.assertEqual(alice.created_at.replace(tzinfo=None).isoformat(), "2026-01-01T10:00:00")
+        self.assertEqual(alice.expires_at.replace(tzinfo=None).isoformat(), "2026-01-02T10:00:00")
+
+    def test_username_is_unique(self):
+        self.save(token="t1")
+        db = api.SessionLocal()
+        try:
+            db.add(APISession(token="t2", user_id="u1", username="alice"))
+            with self.assertRaises(IntegrityError):
+                db.commit()
+        finally:
+            db.close()
+
+
+class TestAuditLog(ApiStorageTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.dict(api._AUDIT_STATS, {name: 0 for name in api._AUDIT_STATS})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_direct_writes_from_many_threads_are_all_counted(self):
+        def log_many():
+            for i in range(25):
+                api.log_audit("test_event", "u1", {"i": i})
+
+        threads = [threading.Thread(target=log_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = api._audit_stats_snapshot()
+        self.assertEqual((stats["direct"], stats["written"], stats["failed"]), (200, 200, 0))
+        self.assertEqual(len(self.rows(AuditLog)), 200)
+
+    def start_flusher(self, maxsize=10_000):
+        """Run a real _audit_flush_worker on a private queue; returns its stop function."""
+        stop_event = threading.Event()
+        flusher = threading.Thread(target=api._audit_flush_worker, daemon=True)
+        for name, value in (("_AUDIT_QUEUE", queue.Queue(maxsize=maxsize)),
+                            ("_AUDIT_FLUSH_STOP_EVENT", stop_event),
+                            ("_AUDIT_FLUSH_THREAD", flusher)):
+            patcher = mock.patch.object(api, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        flusher.start()
+
+        def stop():
+            stop_event.set()
+            flusher.join(5)
+            self.assertFalse(flusher.is_alive())
+        self.addCleanup(stop_event.set)
+        return stop
+
+    def test_queued_events_are_written_in_batches(self):
+        stop = self.start_flusher()
+        with mock.patch.object(api, "_AUDIT_BATCH_SIZE", 50):
+            for i in range(120):
+                api.log_audit("test_event", "u1", {"i": i})
+            stop()
+
+        stats = api._audit_stats_snapshot()
+        self.assertEqual((stats["queued"], stats["direct"], stats["written"]), (120, 0, 120))
+        self.assertLess(stats["batches"], 120)
+        rows = self.rows(AuditLog)
+        self.assertEqual(sorted(json.loads(r.details)["i"] for r in rows), list(range(120)))
+        self.assertEqual({(r.event_type, r.user) for r in rows}, {("test_event", "u1")})
+
+    def test_stop_drains_the_queue(self):
+        stop = self.start_flusher()
+        api._AUDIT_FLUSH_STOP_EVENT.set()
+        for i in range(5):
+            # The flusher is still alive but stopping: events are written directly
+            api.log_audit("late_event", "u1", {"i": i})
+        stop()
+        self.assertEqual(len(self.rows(AuditLog)), 5)
+
+    def test_full_queue_falls_back_to_direct_write(self):
+        # An "alive" flusher that never drains, behind a queue of one slot
+        idle = mock.Mock(is_alive=mock.Mock(return_value=True))
+        with mock.patch.object(api, "_AUDIT_QUEUE", queue.Queue(maxsize=1)), \
+                mock.patch.object(api, "_AUDIT_FLUSH_THREAD", idle), \
+                mock.patch.object(api, "_AUDIT_FLUSH_STOP_EVENT", threading.Event()):
+            api.log_audit("first", "u1", {})
+            api.log_audit("second", "u1", {})
+            self.assertEqual(api._AUDIT_QUEUE.qsize(), 1)
+
+        stats = api._audit_stats_snapshot()
+        self.assertEqual((stats["queued"], stats["direct"]), (1, 1))
+        self.assertEqual([r.event_type for r in self.rows(AuditLog)], ["second"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,7 +13,7 @@ Implements WebSocket support for real-time tactical updates:
 
 import json
 import logging
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Union
 from datetime import datetime, timezone
 import asyncio
 from fastapi import WebSocket, WebSocketDisconnect
@@ -41,6 +41,10 @@ class ConnectionManager:
         self.connection_metadata: Dict[str, Dict[str, Any]] = {}  # connection_id -> metadata
         self.failed_send_attempts: Dict[str, int] = {}  # connection_id -> failed count
         self.max_failed_attempts = 3  # Max failed sends before disconnect
+        self.send_timeout = 5.0  # Seconds before a stalled client send is abandoned
+        self.max_concurrent_sends = 100  # Cap on in-flight sends during a fan-out
+        self.fanout_batch_size = 50  # Larger fan-outs are sent in batches, yielding between them
+        self._send_semaphore: Optional[asyncio.Semaphore] = None  # created lazily on the running loop
         
     async def connect(self, websocket: WebSocket, connection_id: str, user_id: Optional[str] = None):
         """
@@ -176,6 +180,50 @@ class ConnectionManager:
                 logger.warning(f"Connection {connection_id} exceeded max failed attempts, disconnecting")
                 self.disconnect(connection_id)
     
+    @staticmethod
+    def _encode(message: Dict[str, Any]) -> str:
+        """Encode a message the way WebSocket.send_json does, once per fan-out."""
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    
+    async def _send_bounded(self, websocket: WebSocket, text: str):
+        """
+        Send an encoded text frame to one client as part of a fan-out.
+
+        Bounded by ``send_timeout`` so one stalled client cannot hold up the
+        gather, and by ``max_concurrent_sends`` so a large fan-out does not
+        queue unbounded data into socket buffers at once.
+        """
+        if self._send_semaphore is None:
+            self._send_semaphore = asyncio.Semaphore(self.max_concurrent_sends)
+        async with self._send_semaphore:
+            await asyncio.wait_for(websocket.send_text(text), timeout=self.send_timeout)
+    
+    async def _fan_out(self, targets: List[tuple], text: str) -> List[Any]:
+        """
+        Send an encoded text frame to (connection_id, websocket) targets concurrently.
+
+        The payload is encoded once by the caller and the same string is
+        reused for every client.  Small fan-outs go out in a single gather. Larger ones are sent in
+        batches of ``fanout_batch_size`` with a yield to the event loop between
+        batches, so HTTP handlers are not starved while thousands of sends are
+        scheduled. Returns one result (None or the exception) per target.
+        """
+        batch = self.fanout_batch_size
+        if len(targets) <= batch:
+            return await asyncio.gather(
+                *[self._send_bounded(ws, text) for _, ws in targets],
+                return_exceptions=True
+            )
+        
+        results: List[Any] = []
+        for i in range(0, len(targets), batch):
+            results.extend(await asyncio.gather(
+                *[self._send_bounded(ws, text) for _, ws in targets[i:i + batch]],
+                return_exceptions=True
+            ))
+            await asyncio.sleep(0)
+        return results
+    
     async def send_to_user(self, user_id: str, message: Dict[str, Any]):
         """
         Send a message to a specific user
@@ -188,22 +236,32 @@ class ConnectionManager:
         if connection_id:
             await self.send_personal_message(connection_id, message)
     
-    async def broadcast(self, message: Dict[str, Any], exclude: Optional[List[str]] = None):
+    async def broadcast(self, message: Union[Dict[str, Any], str], exclude: Optional[List[str]] = None):
         """
         Broadcast a message to all connected clients
         
         Args:
-            message: Message dictionary to broadcast
+            message: Message dictionary to broadcast, or an already JSON-encoded
+                text frame (which must carry its own timestamp)
             exclude: Optional list of connection IDs to exclude
         """
         exclude = exclude or []
         
-        # Add timestamp if not present
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.now(timezone.utc).isoformat()
+        if isinstance(message, str):
+            text = message
+        else:
+            # Add timestamp if not present
+            if "timestamp" not in message:
+                message["timestamp"] = datetime.now(timezone.utc).isoformat()
+            try:
+                text = self._encode(message)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to encode broadcast message: {e}")
+                return
         
         disconnected = []
-        for connection_id, websocket in self.active_connections.items():
+        targets = []
+        for connection_id, websocket in list(self.active_connections.items()):
             if connection_id in exclude:
                 continue
             
@@ -215,16 +273,19 @@ class ConnectionManager:
                         logger.warning(f"WebSocket {connection_id} not in CONNECTED state during broadcast, marking for cleanup")
                         disconnected.append(connection_id)
                         continue
-                
-                await websocket.send_json(message)
-            except RuntimeError as e:
-                error_msg = str(e) if str(e) else "WebSocket connection closed"
-                logger.error(f"Failed to broadcast to {connection_id}: {error_msg}")
-                disconnected.append(connection_id)
             except Exception as e:
-                error_msg = str(e) if str(e) else f"{type(e).__name__}"
-                logger.error(f"Failed to broadcast to {connection_id}: {error_msg}")
-                disconnected.append(connection_id)
+                logger.debug(f"Could not check WebSocket state for {connection_id}: {e}")
+            
+            targets.append((connection_id, websocket))
+        
+        # Send to all clients concurrently instead of awaiting each in turn
+        if targets:
+            results = await self._fan_out(targets, text)
+            for (connection_id, _), result in zip(targets, results):
+                if isinstance(result, Exception):
+                    error_msg = str(result) if str(result) else type(result).__name__
+                    logger.error(f"Failed to broadcast to {connection_id}: {error_msg}")
+                    disconnected.append(connection_id)
         
         # Cleanup disconnected clients
         for connection_id in disconnected:
@@ -259,7 +320,7 @@ class ConnectionManager:
         
         logger.info(f"Connection {connection_id} unsubscribed from {channel}")
     
-    async def publish_to_channel(self, channel: str, message: Dict[str, Any]):
+    async def publish_to_channel(self, channel: str, message: Union[Dict[str, Any], str]):
         """
         Publish a message to all subscribers of a channel.
         Uses asyncio.gather to send to all subscribers in parallel, reducing
@@ -267,17 +328,26 @@ class ConnectionManager:
         
         Args:
             channel: Channel name
-            message: Message dictionary to publish
+            message: Message dictionary to publish, or an already JSON-encoded
+                text frame (which must carry its own channel and timestamp)
         """
         if channel not in self.subscriptions:
             return
         
-        # Add timestamp if not present
-        if "timestamp" not in message:
-            message["timestamp"] = datetime.now(timezone.utc).isoformat()
-        
-        # Add channel to message
-        message["channel"] = channel
+        if isinstance(message, str):
+            text = message
+        else:
+            # Add timestamp if not present
+            if "timestamp" not in message:
+                message["timestamp"] = datetime.now(timezone.utc).isoformat()
+            
+            # Add channel to message
+            message["channel"] = channel
+            try:
+                text = self._encode(message)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Failed to encode message for channel {channel}: {e}")
+                return
         
         disconnected = []
         targets = []
@@ -304,10 +374,8 @@ class ConnectionManager:
 
         # Send to all subscribers in parallel to reduce total relay time
         if targets:
-            results = await asyncio.gather(
-                *[ws.send_json(message) for _, ws in targets],
-                return_exceptions=True
-            )
+            results = await self._fan_out(targets, text)
+            sent_at = datetime.now(timezone.utc).isoformat()
             for (connection_id, _), result in zip(targets, results):
                 if isinstance(result, Exception):
                     error_msg = str(result) if str(result) else type(result).__name__
@@ -323,7 +391,7 @@ class ConnectionManager:
                     # Update metadata on successful send
                     if connection_id in self.connection_metadata:
                         self.connection_metadata[connection_id]["messages_sent"] += 1
-                        self.connection_metadata[connection_id]["last_activity"] = datetime.now(timezone.utc).isoformat()
+                        self.connection_metadata[connection_id]["last_activity"] = sent_at
                     self.failed_send_attempts[connection_id] = 0
         
         # Cleanup disconnected clients